@@ -256,6 +256,17 @@ symbolic link in renku commands as a normal file. To add an external file pass
 
     $ renku dataset add my-dataset -e /path/to/external/file
 
+Local files are copied to the dataset using copy-on-write clones (reflinks) if
+the filesystem supports them, so that adding large files doesn't duplicate
+their data on disk. Pass ``--link`` to create hard links to local files
+instead. In this case, the files in the dataset and their sources share the
+same content and modifying one modifies the other as well. Renku copies the
+files when hard links aren't possible, e.g. across filesystems:
+
+.. code-block:: console
+
+    $ renku dataset add my-dataset --link /path/to/local/file
+
 Updating a dataset:
 
 After adding files from a remote Git repository or importing a dataset from a
@@ -269,7 +280,9 @@ For datasets from providers like Dataverse or Zenodo, the whole dataset is
 updated to ensure consistency between the remote and local versions. Due to
 this limitation, the ``--include`` and ``--exclude`` flags are not compatible
 with those datasets. Modifying those datasets locally will prevent them from
-being updated.
+being updated. Only files that are new or changed in the provider's version of
+the dataset are downloaded; a file is unchanged if its URL or its checksum is
+the same as before.
 
 .. cheatsheet::
    :group: Datasets
@@ -389,6 +402,19 @@ dataset is automatically created.
                  URL or DOI.
    :extended:
 
+Files of a Zenodo, Dataverse, or OLOS dataset are downloaded in parallel. By
+default, four files are downloaded at a time and at most one download starts
+per second to avoid being rate limited by the provider. You can change these
+values for each provider:
+
+.. code-block:: console
+
+    $ renku config set zenodo.import_concurrency 8
+    $ renku config set zenodo.import_rate_limit 2
+
+Setting ``import_rate_limit`` to ``0`` disables rate limiting. Requests that
+are rate limited anyway are retried after the time that the provider asks for.
+
 Exporting data to an external provider:
 
 .. code-block:: console
@@ -715,7 +741,8 @@ def show(name):
     "-d", "--dst", "--destination", "destination", default="", help="Destination directory within the dataset path"
 )
 @click.option("--ref", default=None, help="Add files from a specific commit/tag/branch.")
-def add(name, urls, external, force, overwrite, create, sources, destination, ref):
+@click.option("--link", is_flag=True, help="Hard link local files instead of copying them, if possible.")
+def add(name, urls, external, force, overwrite, create, sources, destination, ref, link):
     """Add data to a dataset."""
     from renku.core.commands.dataset import add_to_dataset
 
@@ -730,6 +757,7 @@ def add(name, urls, external, force, overwrite, create, sources, destination, re
         sources=sources,
         destination=destination,
         ref=ref,
+        link=link,
     )
     click.secho("OK", fg=color.GREEN)
 
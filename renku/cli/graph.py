@@ -68,11 +68,42 @@ To run validation on the generated output, you can pass the ``--strict``
 option, which will check that all the nodes and properties in the graph are
 correct and that there isn't anything missing.
 
+``json-ld`` and ``nt`` outputs are written incrementally, one entity at a time,
+so that exporting large projects doesn't require keeping the whole graph in
+memory. Nodes that are shared between entities aren't merged in this case.
+Since validation requires the whole graph, passing ``--strict`` disables
+incremental output.
+
+To keep an external copy of the graph up to date, use ``--since-last``. It
+exports only the metadata that changed since the last export which used this
+flag and records the exported commit in the project's ``.renku/cache``
+directory. The first export, or an export after the history was rewritten,
+includes the whole graph.
+
+Since the cache isn't committed, the recorded commit is only known to the
+clone of the project that made the export; a fresh clone exports the whole
+graph again. If the exports are made from different clones, store the exported
+commit along with the external copy of the graph and pass it to ``--since``
+instead. It exports the metadata that changed between the given commit and
+``HEAD``:
+
+.. code-block:: console
+
+   $ renku graph export --since 556dc54 > changes.json
+
+Serializing the metadata of projects with a long history can take a while. Use
+``--jobs`` to serialize it in multiple processes. The output is the same
+regardless of the number of processes:
+
+.. code-block:: console
+
+   $ renku graph export --full --jobs 4 > graph.json
+
 """
 
 import click
 
-from renku.cli.utils.click import CaseInsensitiveChoice
+from renku.cli.utils.click import CaseInsensitiveChoice, MutuallyExclusiveOption
 from renku.core.commands.format.graph import GRAPH_FORMATS
 
 
@@ -90,8 +121,26 @@ def graph():
     help="Limit graph to changes done in revision (or range of revisions like 'A..B').",
 )
 @click.option("--full", is_flag=True, help="Generate full graph for project. Overrides --revision.")
+@click.option(
+    "--since-last",
+    is_flag=True,
+    cls=MutuallyExclusiveOption,
+    mutually_exclusive=[("since", "--since")],
+    help="Only export changes since the last export from this clone that used this flag. The last export isn't "
+    "shared between clones of a project. Overrides --revision and --full.",
+)
+@click.option(
+    "--since",
+    type=str,
+    cls=MutuallyExclusiveOption,
+    mutually_exclusive=[("since_last", "--since-last")],
+    help="Only export changes between this commit and HEAD. Overrides --revision and --full.",
+)
 @click.option("--strict", is_flag=True, default=False, help="Validate triples before output.")
-def export(format, revision, full, strict):
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), default=1, help="Number of processes to use for serializing the graph."
+)
+def export(format, revision, full, since_last, since, strict, jobs):
     r"""Export Renku graph metadata for project."""
     from renku.cli.utils.callback import ClickCallback
     from renku.core.commands.graph import export_graph_command
@@ -101,5 +150,5 @@ def export(format, revision, full, strict):
 
     communicator = ClickCallback()
     export_graph_command().with_communicator(communicator).build().execute(
-        format=format, strict=strict, revision_or_range=revision
+        format=format, strict=strict, revision_or_range=revision, jobs=jobs, since_last=since_last, since=since
     )
@@ -75,6 +75,26 @@ like:
 .. code-block:: console
 
     $ renku storage migrate big_file other_big_file
+
+Packing project's metadata
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Renku stores each metadata object in its own file under ``.renku/metadata``.
+Projects with a long history can have tens of thousands of such files which
+slows down cloning and git operations. You can store the metadata in a single
+pack file instead:
+
+.. code-block:: console
+
+    $ renku storage metadata --format packed
+
+Objects that are created after packing are stored as separate files until the
+command is run again, which adds them to the pack. To go back to one file per
+object, run:
+
+.. code-block:: console
+
+    $ renku storage metadata --format loose
 """
 import os
 
@@ -160,3 +180,21 @@ def migrate(migrate_all, paths):
             exit(0)
 
     fix_lfs_command().build().execute(paths)
+
+
+@storage.command()
+@click.option(
+    "--format",
+    "metadata_format",
+    type=click.Choice(["packed", "loose"]),
+    required=True,
+    help="Store metadata in a pack file or as one file per object.",
+)
+def metadata(metadata_format):
+    """Change the storage format of project's metadata."""
+    from renku.core.commands.storage import set_metadata_format_command
+
+    communicator = ClickCallback()
+    set_metadata_format_command().with_communicator(communicator).build().execute(packed=metadata_format == "packed")
+
+    click.secho("OK", fg=color.GREEN)
@@ -38,6 +38,7 @@ def _project_clone(
     raise_git_except=False,
     checkout_revision=None,
     use_renku_credentials=False,
+    clone_options=None,
 ):
     """Clone Renku project repo, install Git hooks and LFS."""
     from renku.core.management.migrate import is_renku_project
@@ -57,6 +58,7 @@ def _project_clone(
         raise_git_except=raise_git_except,
         checkout_revision=checkout_revision,
         use_renku_credentials=use_renku_credentials,
+        clone_options=clone_options,
     )
 
     client_dispatcher.push_client_to_stack(path=repository.path, external_storage_requested=install_lfs)
@@ -17,12 +17,13 @@
 # limitations under the License.
 """Repository datasets management."""
 
+import hashlib
 import re
 import shutil
 import urllib
 from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import click
 import patoolib
@@ -45,6 +46,7 @@ from renku.core.metadata.immutable import DynamicProxy
 from renku.core.models.dataset import (
     Dataset,
     DatasetDetailsJson,
+    DatasetFile,
     DatasetTag,
     Url,
     generate_default_name,
@@ -225,12 +227,16 @@ def _add_to_dataset(
     total_size=None,
     repository=None,
     clear_files_before=False,
+    link=False,
+    concurrency=None,
+    rate_limit=None,
+    keep_files=None,
 ):
     """Add data to a dataset."""
     from renku.core.utils import requests
 
     client = client_dispatcher.current_client
-    if len(urls) == 0:
+    if len(urls) == 0 and not keep_files:
         raise UsageError("No URL is specified")
     if sources and len(urls) > 1:
         raise UsageError('Cannot use "--source" with multiple URLs.')
@@ -268,6 +274,10 @@ def _add_to_dataset(
                 destination_names=destination_names,
                 repository=repository,
                 clear_files_before=clear_files_before,
+                link=link,
+                concurrency=concurrency,
+                rate_limit=rate_limit,
+                keep_files=keep_files,
             )
             if with_metadata:
                 dataset.update_metadata_from(with_metadata)
@@ -535,7 +545,17 @@ def _import_dataset(
         if is_doi(dataset.identifier):
             dataset.same_as = Url(url_str=urllib.parse.urljoin("https://doi.org", dataset.identifier))
 
-        urls, names = zip(*[(f.source, f.filename) for f in files])
+        unchanged_files = _get_unchanged_files(client, previous_dataset, files, extract) if previous_dataset else {}
+        if unchanged_files:
+            communication.echo(f"Skipping {len(unchanged_files)} unchanged files")
+
+        urls, names = [], []
+        for file in files:
+            if file.source not in unchanged_files:
+                urls.append(file.source)
+                names.append(file.filename)
+
+        concurrency, rate_limit = provider.get_import_settings(client)
         dataset = _add_to_dataset(
             urls=urls,
             name=name,
@@ -548,6 +568,9 @@ def _import_dataset(
             total_size=total_size,
             overwrite=True,
             clear_files_before=True,
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            keep_files=list(unchanged_files.values()),
         )
 
         if previous_dataset:
@@ -601,6 +624,62 @@ def import_dataset():
     return command.require_migration().with_commit(commit_only=DATASET_METADATA_PATHS)
 
 
+def _get_unchanged_files(client, previous_dataset: Dataset, files: List[DynamicProxy], extract: bool) -> Dict:
+    """Return files of a previously imported dataset that are the same in the provider's record, keyed by their source.
+
+    A file is unchanged if it has the same URL since providers don't change content of published files, or if the
+    provider's checksum matches its local content.
+    """
+    data_dir = Path(get_dataset_data_dir(client, previous_dataset))
+    unchanged_files = {}
+
+    for file in files:
+        if extract and _is_archive(file.filename):
+            continue
+
+        previous_file = previous_dataset.find_file(data_dir / file.filename)
+        if not previous_file or previous_file.is_external or not (client.path / previous_file.entity.path).exists():
+            continue
+
+        if previous_file.source == file.source:
+            unchanged_files[file.source] = previous_file
+        elif _has_checksum(client.path / previous_file.entity.path, file.checksum):
+            # NOTE: The content is the same but it's now published under the new record's URL
+            unchanged_file = DatasetFile.from_dataset_file(previous_file)
+            unchanged_file.source = file.source
+            unchanged_files[file.source] = unchanged_file
+
+    return unchanged_files
+
+
+def _is_archive(path) -> bool:
+    """Return if a file is an archive that can be extracted."""
+    try:
+        patoolib.get_archive_format(str(path))
+    except patoolib.util.PatoolError:
+        return False
+    else:
+        return True
+
+
+def _has_checksum(path: Path, checksum: Optional[str]) -> bool:
+    """Return if a file's content matches a provider's checksum in ``<algorithm>:<hex digest>`` format."""
+    if not checksum or ":" not in checksum:
+        return False
+
+    algorithm, digest = checksum.split(":", maxsplit=1)
+    try:
+        file_hash = hashlib.new(algorithm.lower())
+    except ValueError:
+        return False
+
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest() == digest.lower()
+
+
 @inject.autoparams()
 def _update_metadata(new_dataset: Dataset, previous_dataset, delete, same_as, client_dispatcher: IClientDispatcher):
     """Update metadata and remove files that exists in ``previous_dataset`` but not in ``new_dataset``."""
@@ -800,7 +879,8 @@ def _filter(
             if unused_names:
                 unused_names.remove(dataset.name)
             for file in dataset.files:
-                record = DynamicProxy(file)
+                # NOTE: Dataset versions share their files, so, mutable records need their own copy
+                record = DynamicProxy(file if immutable else file.copy())
                 record.dataset = dataset
                 record.client = client
                 path = Path(record.entity.path)
@@ -18,6 +18,9 @@
 """Serializers for graph data."""
 
 import functools
+import hashlib
+import json
+from typing import Dict, Generator, Iterable, List
 
 import click
 
@@ -356,6 +359,82 @@ def nt(graph, strict=False):
     click.echo(nt)
 
 
+def _echo_chunks(chunks: Iterable[str], buffer_size: int = 1024 * 1024):
+    """Write chunks of output to stdout without keeping the whole output in memory."""
+    buffer = []
+    size = 0
+
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+
+        if size >= buffer_size:
+            click.echo("".join(buffer), nl=False)
+            buffer = []
+            size = 0
+
+    click.echo("".join(buffer))
+
+
+def _unique_nodes(graph: Iterable[List[Dict]]) -> Generator[Dict, None, None]:
+    """Flatten nodes of each entity and skip nodes that were already output.
+
+    Entities share nodes (e.g. agents and generated entities); only a digest of each output node is kept in memory.
+    """
+    import pyld
+
+    seen = set()
+
+    for nodes in graph:
+        for node in pyld.jsonld.flatten(nodes):
+            digest = hashlib.sha256(json.dumps(node, sort_keys=True).encode("utf-8")).digest()
+            if digest in seen:
+                continue
+
+            seen.add(digest)
+            yield node
+
+
+def jsonld_stream(graph: Iterable[List[Dict]]):
+    """Format graph as JSON-LD and write it incrementally; ``graph`` yields the JSON-LD nodes of each entity.
+
+    Unlike ``jsonld``, nodes with the same ``@id`` are not merged. This is valid JSON-LD and gives the same RDF graph.
+    """
+    import textwrap
+
+    def generate_chunks():
+        separator = "[\n"
+        for node in _unique_nodes(graph):
+            yield separator
+            yield textwrap.indent(json.dumps(node, indent=2), "  ")
+            separator = ",\n"
+
+        yield "[]" if separator == "[\n" else "\n]"
+
+    _echo_chunks(generate_chunks())
+
+
+def nt_stream(graph: Iterable[List[Dict]], batch_size: int = 1000):
+    """Format graph as n-tuples and write it incrementally; ``graph`` yields the JSON-LD nodes of each entity."""
+    from rdflib import ConjunctiveGraph
+
+    def convert(nodes):
+        return ConjunctiveGraph().parse(data=json.dumps(nodes), format="json-ld").serialize(format="nt")
+
+    def generate_chunks():
+        batch = []
+        for node in _unique_nodes(graph):
+            batch.append(node)
+            if len(batch) >= batch_size:
+                yield convert(batch)
+                batch = []
+
+        if batch:
+            yield convert(batch)
+
+    _echo_chunks(generate_chunks())
+
+
 def rdf(graph, strict=False):
     """Output the graph as RDF."""
     from renku.core.utils.shacl import validate_graph
@@ -388,3 +467,10 @@ GRAPH_FORMATS = {
     "dot-debug": dot_debug,
 }
 """Valid graph formatting options."""
+
+STREAMING_GRAPH_FORMATS = {
+    "jsonld": jsonld_stream,
+    "json-ld": jsonld_stream,
+    "nt": nt_stream,
+}
+"""Graph formatting options that write their output incrementally."""
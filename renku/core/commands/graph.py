@@ -17,11 +17,15 @@
 # limitations under the License.
 """Knowledge graph building."""
 
+import collections
+import concurrent.futures
 import json
-from typing import Dict, List, Set, Union
+import os
+from pathlib import Path
+from typing import Dict, Generator, Iterable, List, Optional, Set, Union
 
 from renku.core import errors
-from renku.core.commands.format.graph import GRAPH_FORMATS
+from renku.core.commands.format.graph import GRAPH_FORMATS, STREAMING_GRAPH_FORMATS
 from renku.core.commands.schema.activity import ActivitySchema
 from renku.core.commands.schema.composite_plan import CompositePlanSchema
 from renku.core.commands.schema.dataset import DatasetSchema, DatasetTagSchema
@@ -30,10 +34,12 @@ from renku.core.commands.schema.project import ProjectSchema
 from renku.core.management.command_builder.command import Command, inject
 from renku.core.management.interface.activity_gateway import IActivityGateway
 from renku.core.management.interface.client_dispatcher import IClientDispatcher
+from renku.core.management.interface.database_dispatcher import IDatabaseDispatcher
 from renku.core.management.interface.database_gateway import IDatabaseGateway
 from renku.core.management.interface.dataset_gateway import IDatasetGateway
 from renku.core.management.interface.plan_gateway import IPlanGateway
 from renku.core.management.interface.project_gateway import IProjectGateway
+from renku.core.metadata.database import Database
 from renku.core.models.dataset import Dataset, DatasetTag
 from renku.core.models.project import Project
 from renku.core.models.provenance.activity import Activity
@@ -59,26 +65,100 @@ def _export_graph(
     format: str = "json-ld",
     revision_or_range: str = None,
     strict: bool = False,
+    jobs: int = 1,
+    since_last: bool = False,
+    since: str = None,
 ):
-    """Output graph in specific format."""
+    """Output graph in specific format.
+
+    If ``since`` is set, only export objects that changed between this commit and ``HEAD`` and overwrite
+    ``revision_or_range``. Callers that keep an external copy of the graph up to date should store the exported commit
+    themselves and pass it in ``since``.
+
+    If ``since_last`` is set, only export objects that changed since the last export that used ``since_last`` and
+    overwrite ``revision_or_range``. The whole graph is exported if there is no previous export or if its commit isn't
+    an ancestor of ``HEAD``. The last exported commit is stored in the project's cache which isn't committed; so, each
+    clone of a project exports the whole graph the first time it uses ``since_last``.
+    """
 
     format = format.lower()
+    client = client_dispatcher.current_client
+
+    if since:
+        if not client.repository.is_ancestor(since, "HEAD"):
+            raise errors.ParameterError(f"Commit '{since}' doesn't exist or isn't an ancestor of HEAD.", "since")
+        revision_or_range = f"{since}..{client.repository.head.commit.hexsha}"
+    elif since_last:
+        head = client.repository.head.commit.hexsha
+        last_exported_commit = _get_last_exported_commit(client)
+        revision_or_range = f"{last_exported_commit}..{head}" if last_exported_commit else None
 
     if revision_or_range:
-        graph = _get_graph_for_revision(revision_or_range=revision_or_range)
+        graph = _get_graph_for_revision(revision_or_range=revision_or_range, jobs=jobs)
     else:
-        graph = _get_graph_for_all_objects()
+        graph = _get_graph_for_all_objects(jobs=jobs)
 
     # NOTE: rewrite ids for current environment
-    host = get_host(client_dispatcher.current_client)
+    host = get_host(client)
 
-    for node in graph:
-        update_nested_node_host(node, host)
+    graph = (_update_nodes_host(nodes, host) for nodes in graph)
+
+    if not strict and format in STREAMING_GRAPH_FORMATS:
+        result = STREAMING_GRAPH_FORMATS[format](graph)
+    else:
+        graph = [node for nodes in graph for node in nodes]
+
+        if strict:
+            _validate_graph(json.dumps(graph, indent=2), "json-ld")
+
+        result = GRAPH_FORMATS[format](graph)
+
+    if since_last:
+        _set_last_exported_commit(client, head)
+
+    return result
+
+
+LAST_EXPORTED_COMMIT_FILENAME = "graph-export.json"
+
+
+def _get_last_exported_commit_path(client) -> Path:
+    """Return path of the file that stores the last commit exported with ``since_last``."""
+    return client.renku_path / client.CACHE / LAST_EXPORTED_COMMIT_FILENAME
+
+
+def _get_last_exported_commit(client) -> Optional[str]:
+    """Return the last exported commit if it is still an ancestor of ``HEAD``."""
+    try:
+        with open(_get_last_exported_commit_path(client)) as file:
+            commit = json.load(file)["commit"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    # NOTE: History was rewritten since the last export
+    if not isinstance(commit, str) or not client.repository.is_ancestor(commit, "HEAD"):
+        return None
 
-    if strict:
-        _validate_graph(json.dumps(graph, indent=2), "json-ld")
+    return commit
 
-    return GRAPH_FORMATS[format](graph)
+
+def _set_last_exported_commit(client, commit: str):
+    """Store the last commit exported with ``since_last``."""
+    path = _get_last_exported_commit_path(client)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temporary_path = path.with_suffix(".tmp")
+    with open(temporary_path, "w") as file:
+        json.dump({"commit": commit}, file)
+    os.replace(temporary_path, path)
+
+
+def _update_nodes_host(nodes: List[Dict], host: str) -> List[Dict]:
+    """Update all @id in a list of nodes to include host if necessary."""
+    for node in nodes:
+        update_nested_node_host(node, host)
+
+    return nodes
 
 
 def update_nested_node_host(node: Dict, host: str) -> None:
@@ -100,21 +180,18 @@ def _get_graph_for_revision(
     revision_or_range: str,
     database_gateway: IDatabaseGateway,
     project_gateway: IProjectGateway,
-) -> List[Dict]:
+    jobs: int = 1,
+) -> Generator[List[Dict], None, None]:
     """Get the graph for changes made in a specific revision."""
     all_objects = database_gateway.get_modified_objects_from_revision(revision_or_range=revision_or_range)
 
     change_types = (Project, Dataset, DatasetTag, Activity, Plan, CompositePlan)
 
-    changed_objects = []
-
-    for obj in all_objects:
-        if isinstance(obj, change_types):
-            changed_objects.append(obj)
+    changed_objects = (obj for obj in all_objects if isinstance(obj, change_types))
 
     project = project_gateway.get_project()
 
-    return _convert_entities_to_graph(changed_objects, project)
+    return _convert_entities_to_graph(changed_objects, project, jobs=jobs)
 
 
 @inject.autoparams()
@@ -123,70 +200,189 @@ def _get_graph_for_all_objects(
     dataset_gateway: IDatasetGateway,
     activity_gateway: IActivityGateway,
     plan_gateway: IPlanGateway,
-) -> List[Dict]:
+    jobs: int = 1,
+) -> Generator[List[Dict], None, None]:
     """Get JSON-LD graph for all entities."""
     project = project_gateway.get_project()
-    objects: List[Union[Project, Dataset, DatasetTag, Activity, AbstractPlan]] = activity_gateway.get_all_activities()
 
-    processed_plans = set()
+    return _convert_entities_to_graph(
+        _get_all_objects(
+            project=project,
+            dataset_gateway=dataset_gateway,
+            activity_gateway=activity_gateway,
+            plan_gateway=plan_gateway,
+        ),
+        project,
+        jobs=jobs,
+    )
 
-    for activity in objects:
-        processed_plans |= get_activity_plan_ids(activity)
 
-    plans = [p for p in plan_gateway.get_all_plans() if p.id not in processed_plans]
+def _get_all_objects(
+    project: Project,
+    dataset_gateway: IDatasetGateway,
+    activity_gateway: IActivityGateway,
+    plan_gateway: IPlanGateway,
+) -> Generator[Union[Project, Dataset, DatasetTag, Activity, AbstractPlan], None, None]:
+    """Return all entities that are part of the graph one at a time."""
+    processed_plans = set()
 
-    objects.extend(plans)
+    for activity in activity_gateway.get_all_activities():
+        processed_plans |= get_activity_plan_ids(activity)
+        yield activity
 
-    objects.append(project)
+    for plan in plan_gateway.get_all_plans():
+        if plan.id not in processed_plans:
+            yield plan
 
-    datasets = dataset_gateway.get_all_active_datasets()
-    objects.extend(datasets)
+    yield project
 
-    for dataset in datasets:
-        objects.extend(dataset_gateway.get_all_tags(dataset))
+    for dataset in dataset_gateway.get_all_active_datasets():
+        yield dataset
+        yield from dataset_gateway.get_all_tags(dataset)
 
         current_dataset = dataset
         while current_dataset.derived_from:
             current_dataset = dataset_gateway.get_by_id(current_dataset.derived_from.url_id)
-            objects.append(current_dataset)
-
-    return _convert_entities_to_graph(objects, project)
+            yield current_dataset
 
 
 def _convert_entities_to_graph(
-    entities: List[Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan]], project: Project
-) -> List[Dict]:
-    """Convert entities to JSON-LD graph."""
-    graph = []
-    schemas = {
-        Project: ProjectSchema,
-        Dataset: DatasetSchema,
-        DatasetTag: DatasetTagSchema,
-        Activity: ActivitySchema,
-        Plan: PlanSchema,
-        CompositePlan: CompositePlanSchema,
-    }
+    entities: Iterable[Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan]],
+    project: Project,
+    jobs: int = 1,
+) -> Generator[List[Dict], None, None]:
+    """Convert entities to JSON-LD graph; yield the flattened JSON-LD nodes of each entity.
+
+    If ``jobs`` is more than one, entities are serialized in that many processes. Output order doesn't depend on
+    ``jobs``.
+    """
+    entities = _skip_processed_plans(entities)
+
+    if jobs > 1:
+        yield from _convert_entities_to_graph_in_parallel(entities, project.id, jobs)
+        return
+
+    for entity in entities:
+        yield _convert_entity_to_graph(entity, project.id)
 
+
+def _skip_processed_plans(
+    entities: Iterable[Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan]]
+) -> Generator[Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan], None, None]:
+    """Skip plans that are exported as part of an activity."""
     processed_plans = set()
-    project_id = project.id
 
     for entity in entities:
         if entity.id in processed_plans:
             continue
-        if isinstance(entity, (Dataset, Activity, AbstractPlan)):
-            # NOTE: Since the database is read-only, it's OK to modify objects; they won't be written back
-            entity.unfreeze()
-            entity.project_id = project_id
-        schema = next(s for t, s in schemas.items() if isinstance(entity, t))
-        graph.extend(schema(flattened=True).dump(entity))
-
-        if not isinstance(entity, Activity):
-            continue
 
-        # NOTE: mark activity plans as processed
-        processed_plans |= get_activity_plan_ids(entity)
+        yield entity
+
+        if isinstance(entity, Activity):
+            # NOTE: mark activity plans as processed
+            processed_plans |= get_activity_plan_ids(entity)
+
+
+def _convert_entity_to_graph(
+    entity: Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan], project_id: str
+) -> List[Dict]:
+    """Return flattened JSON-LD nodes of an entity."""
+    if isinstance(entity, (Dataset, Activity, AbstractPlan)) and entity.project_id != project_id:
+        # NOTE: Since the database is read-only, it's OK to modify objects; they won't be written back. Modified
+        # objects are kept in memory until the command finishes, so, only modify them if needed.
+        entity.unfreeze()
+        entity.project_id = project_id
+
+    schema = next(s for t, s in GRAPH_SCHEMAS.items() if isinstance(entity, t))
+
+    return schema(flattened=True).dump(entity)
+
+
+GRAPH_SCHEMAS = {
+    Project: ProjectSchema,
+    Dataset: DatasetSchema,
+    DatasetTag: DatasetTagSchema,
+    Activity: ActivitySchema,
+    Plan: PlanSchema,
+    CompositePlan: CompositePlanSchema,
+}
+
+PARALLEL_EXPORT_CHUNK_SIZE = 500
+"""Number of entities that a graph export worker serializes at once."""
+
+_worker_database: Optional[Database] = None
 
-    return graph
+
+def _initialize_export_worker(database_path: Union[Path, str]):
+    """Open a read-only database in a graph export worker process."""
+    global _worker_database
+
+    _worker_database = Database.from_path(database_path)
+
+
+def _convert_oids_to_graph(oids: List[str], project_id: str) -> List[List[Dict]]:
+    """Convert entities with the given ``oids`` to JSON-LD graph in a graph export worker process."""
+    return [_convert_entity_to_graph(_worker_database.get(oid), project_id) for oid in oids]
+
+
+@inject.autoparams("database_dispatcher")
+def _convert_entities_to_graph_in_parallel(
+    entities: Iterable[Union[Project, Dataset, DatasetTag, Activity, Plan, CompositePlan]],
+    project_id: str,
+    jobs: int,
+    database_dispatcher: IDatabaseDispatcher,
+) -> Generator[List[Dict], None, None]:
+    """Convert entities to JSON-LD graph in ``jobs`` processes.
+
+    Entities are partitioned into chunks of ``oid``s; each worker loads the objects of a chunk from its own read-only
+    database. Chunks' results are yielded in the order that they were submitted and only a few chunks are pending at
+    any time to keep memory usage bounded.
+    """
+    database_path = database_dispatcher.current_database.path
+
+    def get_chunks():
+        chunk = []
+        for entity in entities:
+            # NOTE: Objects that aren't stored on their own cannot be loaded by workers
+            if not entity._p_oid or entity._p_changed:
+                if chunk:
+                    yield chunk
+                    chunk = []
+                yield entity
+                continue
+
+            chunk.append(entity._p_oid)
+            if len(chunk) >= PARALLEL_EXPORT_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    pending = collections.deque()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs, initializer=_initialize_export_worker, initargs=(database_path,)
+    ) as executor:
+        for chunk in get_chunks():
+            if isinstance(chunk, list):
+                pending.append(executor.submit(_convert_oids_to_graph, chunk, project_id))
+            else:
+                pending.append(chunk)
+
+            while len(pending) > 2 * jobs:
+                yield from _get_pending_result(pending.popleft(), project_id)
+
+        while pending:
+            yield from _get_pending_result(pending.popleft(), project_id)
+
+
+def _get_pending_result(item, project_id: str) -> Generator[List[Dict], None, None]:
+    """Return result of a chunk that was submitted to a worker or convert an entity in the current process."""
+    if isinstance(item, concurrent.futures.Future):
+        yield from item.result()
+    else:
+        yield _convert_entity_to_graph(item, project_id)
 
 
 def get_activity_plan_ids(activity: Activity) -> Set[str]:
@@ -144,7 +144,10 @@ def _metadata_migration_check(client):
 
 def migrate_project():
     """Return a command to migrate all project's entities."""
-    return Command().command(_migrate_project).lock_project().require_clean().with_database(write=True)
+    from renku.core.management.command_builder.migration import RequireCleanUnlessResuming
+
+    command = Command().command(_migrate_project).lock_project()
+    return RequireCleanUnlessResuming(command).with_database(write=True)
 
 
 def _migrate_project(
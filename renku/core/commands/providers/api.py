@@ -15,11 +15,21 @@
 # limitations under the License.
 """API for providers."""
 import abc
+from typing import Optional, Tuple
+
+from renku.core import errors
 
 
 class ProviderApi(abc.ABC):
     """Interface defining provider methods."""
 
+    # NOTE: Number of files that are downloaded in parallel and the maximum number of downloads that start per second
+    # when importing a dataset. They can be changed with ``import_concurrency`` and ``import_rate_limit`` in the
+    # provider's section of renku configuration.
+    IMPORT_CONCURRENCY = 4
+    IMPORT_RATE_LIMIT = 1.0
+    CONFIG_SECTION = None
+
     @abc.abstractmethod
     def find_record(self, uri, **kwargs):
         """Find record by uri."""
@@ -55,6 +65,30 @@ class ProviderApi(abc.ABC):
         """Returns parameters that can be set for export."""
         return {}
 
+    def get_import_settings(self, client) -> Tuple[int, Optional[float]]:
+        """Return the number of parallel downloads and the rate limit of downloads when importing a dataset."""
+        concurrency = self.IMPORT_CONCURRENCY
+        rate_limit = self.IMPORT_RATE_LIMIT
+
+        if self.CONFIG_SECTION:
+            value = client.get_value(self.CONFIG_SECTION, "import_concurrency")
+            try:
+                concurrency = int(value) if value else concurrency
+            except ValueError:
+                raise errors.ConfigurationError(f"Invalid '{self.CONFIG_SECTION}.import_concurrency': {value}")
+
+            value = client.get_value(self.CONFIG_SECTION, "import_rate_limit")
+            try:
+                rate_limit = float(value) if value else rate_limit
+            except ValueError:
+                raise errors.ConfigurationError(f"Invalid '{self.CONFIG_SECTION}.import_rate_limit': {value}")
+
+        if concurrency < 1:
+            raise errors.ConfigurationError(f"Import concurrency must be a positive number: {concurrency}")
+
+        # NOTE: A non-positive rate limit disables rate limiting
+        return concurrency, rate_limit if rate_limit and rate_limit > 0 else None
+
     @property
     def is_git_based(self):
         """True if provider is a git repository."""
@@ -141,6 +141,8 @@ def make_file_url(file_id, base_url):
 class DataverseProvider(ProviderApi):
     """Dataverse API provider."""
 
+    CONFIG_SECTION = "dataverse"
+
     is_doi = attr.ib(default=False)
 
     _accept = attr.ib(default="application/json")
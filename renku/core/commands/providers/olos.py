@@ -36,6 +36,8 @@ from renku.core.utils import communication
 class OLOSProvider(ProviderApi):
     """Provider for OLOS integration."""
 
+    CONFIG_SECTION = "olos"
+
     _server_url = attr.ib(default=None)
 
     @staticmethod
@@ -481,6 +481,10 @@ class ZenodoExporter(ExporterApi):
 class ZenodoProvider(ProviderApi):
     """zenodo.org registry API provider."""
 
+    CONFIG_SECTION = "zenodo"
+    # NOTE: Zenodo allows 60 requests per minute for anonymous users
+    IMPORT_RATE_LIMIT = 1.0
+
     is_doi = attr.ib(default=False)
     _accept = attr.ib(default="application/json")
 
@@ -26,7 +26,8 @@ from renku.core.management.interface.activity_gateway import IActivityGateway
 from renku.core.management.interface.client_dispatcher import IClientDispatcher
 from renku.core.models.entity import Entity
 from renku.core.models.provenance.activity import Activity
-from renku.core.utils.metadata import filter_overridden_activities, get_modified_activities
+from renku.core.utils.checksum_cache import ChecksumCache
+from renku.core.utils.metadata import get_modified_activities
 from renku.core.utils.os import get_relative_path_to_cwd, get_relative_paths
 
 
@@ -53,7 +54,11 @@ def _get_status(client_dispatcher: IClientDispatcher, activity_gateway: IActivit
     paths = paths or []
     paths = get_relative_paths(base=client.path, paths=paths)
 
-    modified, deleted = _get_modified_paths(activity_gateway=activity_gateway, repository=client.repository)
+    modified, deleted = _get_modified_paths(
+        activity_gateway=activity_gateway,
+        repository=client.repository,
+        checksum_cache=ChecksumCache.from_client(client),
+    )
 
     if not modified and not deleted:
         return None, None, None, None
@@ -85,12 +90,14 @@ def _get_status(client_dispatcher: IClientDispatcher, activity_gateway: IActivit
     return stale_outputs, stale_activities, modified_inputs, deleted
 
 
-def _get_modified_paths(activity_gateway, repository) -> Tuple[Set[Tuple[Activity, Entity]], Set[str]]:
+def _get_modified_paths(
+    activity_gateway, repository, checksum_cache: ChecksumCache = None
+) -> Tuple[Set[Tuple[Activity, Entity]], Set[str]]:
     """Get modified and deleted usages/inputs of a list of activities."""
-    all_activities = activity_gateway.get_all_activities()
+    relevant_activities = activity_gateway.get_latest_activities()
 
-    relevant_activities = filter_overridden_activities(all_activities)
-
-    modified, deleted = get_modified_activities(activities=relevant_activities, repository=repository)
+    modified, deleted = get_modified_activities(
+        activities=relevant_activities, repository=repository, checksum_cache=checksum_cache
+    )
 
     return modified, {e.path for _, e in deleted}
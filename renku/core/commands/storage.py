@@ -20,6 +20,7 @@
 from renku.core.management.command_builder import inject
 from renku.core.management.command_builder.command import Command
 from renku.core.management.interface.client_dispatcher import IClientDispatcher
+from renku.core.metadata.database import Storage
 from renku.core.utils import communication
 
 
@@ -93,3 +94,27 @@ def _check_lfs_hook(paths, client_dispatcher: IClientDispatcher):
 def check_lfs_hook_command():
     """Command to pull the specified paths from external storage."""
     return Command().command(_check_lfs_hook)
+
+
+@inject.autoparams()
+def _set_metadata_format(packed: bool, client_dispatcher: IClientDispatcher):
+    """Store project's metadata in a pack or as loose files."""
+    storage = Storage(client_dispatcher.current_client.database_path)
+
+    if packed:
+        count = storage.repack()
+        communication.echo(f"Packed {count} metadata objects")
+    else:
+        count = storage.unpack()
+        communication.echo(f"Unpacked {count} metadata objects")
+
+
+def set_metadata_format_command():
+    """Command to change the storage format of project's metadata."""
+    return (
+        Command()
+        .command(_set_metadata_format)
+        .lock_project()
+        .require_migration()
+        .with_commit(message="renku storage: change metadata format", commit_if_empty=False)
+    )
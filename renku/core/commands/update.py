@@ -32,7 +32,8 @@ from renku.core.management.interface.plan_gateway import IPlanGateway
 from renku.core.management.workflow.activity import sort_activities
 from renku.core.management.workflow.concrete_execution_graph import ExecutionGraph
 from renku.core.models.provenance.activity import Activity
-from renku.core.utils.metadata import add_activity_if_recent, filter_overridden_activities, get_modified_activities
+from renku.core.utils.checksum_cache import ChecksumCache
+from renku.core.utils.metadata import add_activity_if_recent, get_modified_activities
 from renku.core.utils.os import get_relative_paths
 
 
@@ -61,7 +62,9 @@ def _update(
     paths = paths or []
     paths = get_relative_paths(base=client.path, paths=paths)
 
-    modified_activities, modified_paths = _get_modified_activities_and_paths(client.repository, activity_gateway)
+    modified_activities, modified_paths = _get_modified_activities_and_paths(
+        client.repository, activity_gateway, checksum_cache=ChecksumCache.from_client(client)
+    )
     activities = _get_downstream_activities(modified_activities, activity_gateway, paths)
 
     if len(activities) == 0:
@@ -106,11 +109,14 @@ def _is_activity_valid(activity: Activity, plan_gateway: IPlanGateway, client_di
     return plan.invalidated_at is None
 
 
-def _get_modified_activities_and_paths(repository, activity_gateway) -> Tuple[Set[Activity], Set[str]]:
+def _get_modified_activities_and_paths(
+    repository, activity_gateway, checksum_cache: ChecksumCache = None
+) -> Tuple[Set[Activity], Set[str]]:
     """Return latest activities that one of their inputs is modified."""
-    all_activities = activity_gateway.get_all_activities()
-    relevant_activities = filter_overridden_activities(all_activities)
-    modified, _ = get_modified_activities(activities=list(relevant_activities), repository=repository)
+    relevant_activities = activity_gateway.get_latest_activities()
+    modified, _ = get_modified_activities(
+        activities=list(relevant_activities), repository=repository, checksum_cache=checksum_cache
+    )
     return {a for a, _ in modified if _is_activity_valid(a)}, {e.path for _, e in modified}
 
 
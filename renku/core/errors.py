@@ -501,6 +501,14 @@ class ObjectNotFoundError(RenkuException):
         super().__init__(f"Cannot find object: '{filename}'")
 
 
+class ObjectPackCorruptError(RenkuException):
+    """Raised when a metadata pack file or its index is invalid."""
+
+    def __init__(self, filename):
+        """Embed exception and build a custom message."""
+        super().__init__(f"Invalid metadata pack: '{filename}'")
+
+
 class ParameterNotFoundError(RenkuException):
     """Raised when a parameter reference cannot be resolved to a parameter."""
 
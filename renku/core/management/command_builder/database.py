@@ -18,6 +18,7 @@
 """Command builder for local object database."""
 
 
+from renku.core import errors
 from renku.core.management.command_builder.command import Command, CommandResult, check_finalized
 from renku.core.management.command_builder.database_dispatcher import DatabaseDispatcher
 from renku.core.management.interface.activity_gateway import IActivityGateway
@@ -26,6 +27,7 @@ from renku.core.management.interface.database_gateway import IDatabaseGateway
 from renku.core.management.interface.dataset_gateway import IDatasetGateway
 from renku.core.management.interface.plan_gateway import IPlanGateway
 from renku.core.management.interface.project_gateway import IProjectGateway
+from renku.core.metadata.database import database_snapshots
 from renku.core.metadata.gateway.activity_gateway import ActivityGateway
 from renku.core.metadata.gateway.database_gateway import DatabaseGateway
 from renku.core.metadata.gateway.dataset_gateway import DatasetGateway
@@ -52,8 +54,17 @@ class DatabaseCommand(Command):
 
         client = context["client_dispatcher"].current_client
 
+        revision = None
+        if not self._write and not self._create and database_snapshots.enabled:
+            try:
+                revision = client.repository.head.commit.hexsha
+            except errors.GitError:
+                pass
+
         self.dispatcher = DatabaseDispatcher()
-        self.dispatcher.push_database_to_stack(path=self._path or client.database_path, commit=self._write)
+        self.dispatcher.push_database_to_stack(
+            path=self._path or client.database_path, commit=self._write, revision=revision
+        )
 
         context["bindings"][IDatabaseDispatcher] = self.dispatcher
 
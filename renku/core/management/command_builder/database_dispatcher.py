@@ -17,11 +17,11 @@
 # limitations under the License.
 """Renku database dispatcher."""
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from renku.core import errors
 from renku.core.management.interface.database_dispatcher import IDatabaseDispatcher
-from renku.core.metadata.database import Database
+from renku.core.metadata.database import Database, database_snapshots
 
 
 class DatabaseDispatcher(IDatabaseDispatcher):
@@ -41,17 +41,30 @@ class DatabaseDispatcher(IDatabaseDispatcher):
 
         return self.database_stack[-1][0]
 
-    def push_database_to_stack(self, path: Union[Path, str], commit: bool = False) -> None:
-        """Create and push a new client to the stack."""
-        new_database = Database.from_path(path)
-        self.database_stack.append((new_database, commit))
+    def push_database_to_stack(
+        self, path: Union[Path, str], commit: bool = False, revision: Optional[str] = None
+    ) -> None:
+        """Create and push a new client to the stack.
+
+        A read-only database of a given ``revision`` is reused from a previous command if possible.
+        """
+        new_database = None
+        if revision and not commit:
+            new_database = database_snapshots.checkout(path, revision)
+        if new_database is None:
+            new_database = Database.from_path(path)
+
+        self.database_stack.append((new_database, commit, revision))
 
     def pop_database(self) -> None:
         """Remove the current client from the stack."""
-        popped_database = self.database_stack.pop()
+        database, commit, revision = self.database_stack.pop()
 
-        if popped_database[1]:
-            popped_database[0].commit()
+        if commit:
+            database.commit()
+            database_snapshots.invalidate(database.path)
+        elif revision:
+            database_snapshots.release(database, revision)
 
     def finalize_dispatcher(self) -> None:
         """Close all database contexts."""
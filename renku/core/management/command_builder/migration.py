@@ -18,6 +18,7 @@
 """Command builder for migrations."""
 
 from renku.core.management.command_builder.command import Command, check_finalized
+from renku.core.management.command_builder.repo import RequireClean
 from renku.core.management.migrate import check_for_migration
 
 
@@ -40,3 +41,20 @@ class RequireMigration(Command):
         self._builder.add_pre_hook(self.DEFAULT_ORDER, self._pre_hook)
 
         return self._builder.build()
+
+
+class RequireCleanUnlessResuming(RequireClean):
+    """Builder to check if repo is clean unless an interrupted metadata migration is resumed."""
+
+    def _pre_hook(self, builder: Command, context: dict, *args, **kwargs) -> None:
+        """Check if repo is clean."""
+        from renku.core.management.migrations.m_0009__new_metadata_storage import is_metadata_migration_interrupted
+
+        if "client_dispatcher" not in context:
+            raise ValueError("Commit builder needs a IClientDispatcher to be set.")
+
+        # NOTE: An interrupted metadata migration leaves the repository dirty
+        if is_metadata_migration_interrupted(context["client_dispatcher"].current_client):
+            return
+
+        super()._pre_hook(builder, context, *args, **kwargs)
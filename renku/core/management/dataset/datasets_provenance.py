@@ -134,6 +134,8 @@ class DatasetsProvenance:
 
         def update_dataset(existing, new) -> Dataset:
             """Update existing dataset with the new dataset metadata."""
+            # NOTE: Datasets that a resumed migration loads from the database are immutable
+            existing.unfreeze()
             existing.update_metadata_from(new, exclude=["date_created", "derived_from", "same_as"])
             existing.dataset_files = new.dataset_files
             return existing
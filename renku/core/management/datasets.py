@@ -23,12 +23,12 @@ import glob
 import imghdr
 import os
 import shutil
-import time
 import urllib
 import uuid
+from collections import defaultdict
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.request import urlretrieve
 
 import attr
@@ -56,7 +56,7 @@ from renku.core.models.refs import LinkReference
 from renku.core.utils import communication
 from renku.core.utils.git import clone_repository, get_cache_directory_for_repository, get_git_user
 from renku.core.utils.metadata import is_external_file
-from renku.core.utils.os import get_absolute_path, get_files, get_relative_path, is_subpath
+from renku.core.utils.os import ContentHasher, copy_file, get_absolute_path, get_files, get_relative_path, is_subpath
 from renku.core.utils.urls import get_slug, remove_credentials
 
 
@@ -317,10 +317,22 @@ class DatasetsApiMixin(object):
         destination_names=None,
         repository: Repository = None,
         clear_files_before=False,
+        link=False,
+        concurrency: int = None,
+        rate_limit: float = None,
+        keep_files: List[DatasetFile] = None,
     ):
-        """Import the data into the data directory."""
+        """Import the data into the data directory.
+
+        ``concurrency`` and ``rate_limit`` set the number of parallel downloads and the maximum number of downloads that
+        start per second when importing a non-git dataset. ``keep_files`` are existing files of the dataset that are
+        kept when ``clear_files_before`` is set.
+        """
         sources = sources or ()
 
+        if external and link:
+            raise errors.ParameterError("Cannot use '--external' and '--link' together.")
+
         dataset_datadir = self.path / get_dataset_data_dir(self, dataset)
         # NOTE: Make sure that dataset's data dir exists because we check for existence of a destination later to decide
         # what will be its name
@@ -335,7 +347,12 @@ class DatasetsApiMixin(object):
         files = []
         if all_at_once:  # Importing a non-git dataset
             files = self._add_from_urls(
-                urls=urls, destination_names=destination_names, destination=destination, extract=extract
+                urls=urls,
+                destination_names=destination_names,
+                destination=destination,
+                extract=extract,
+                concurrency=concurrency,
+                rate_limit=rate_limit,
             )
         else:
             for url in urls:
@@ -356,7 +373,7 @@ class DatasetsApiMixin(object):
                             )
                         u = urllib.parse.urlparse(url)
                         new_files = self._add_from_local(
-                            dataset=dataset, path=u.path, external=external, destination=destination
+                            dataset=dataset, path=u.path, external=external, destination=destination, link=link
                         )
                     else:  # Remote URL
                         new_files = self._add_from_url(url=url, destination=destination, extract=extract)
@@ -414,6 +431,7 @@ class DatasetsApiMixin(object):
                     + "\n  ".join([str(p) for p in existing_files])
                 )
 
+        copies = []
         for data in files:
             operation = data.pop("operation", None)
             if not operation:
@@ -426,15 +444,18 @@ class DatasetsApiMixin(object):
             dst.parent.mkdir(parents=True, exist_ok=True)
 
             if action == "copy":
-                shutil.copy(src, dst)
-            elif action == "move":
-                shutil.move(src, dst, copy_function=shutil.copy)
+                data["hasher"] = ContentHasher(size=os.path.getsize(src))
+                copies.append((src, dst, action, data["hasher"]))
+            elif action in ("link", "move"):
+                copies.append((src, dst, action, None))
             elif action == "symlink":
                 self._create_external_file(src, dst)
                 data["is_external"] = True
             else:
                 raise errors.OperationError(f"Invalid action {action}")
 
+        self._copy_files(copies)
+
         # Track non-symlinks in LFS
         if self.check_external_storage():
             self.track_paths_in_storage(*files_to_commit)
@@ -443,26 +464,101 @@ class DatasetsApiMixin(object):
         self.repository.add(*files_to_commit, self.renku_pointers_path, force=True)
 
         n_staged_changes = len(self.repository.staged_changes)
-        if n_staged_changes == 0:
+        if n_staged_changes == 0 and urls:
             communication.warn("No new file was added to project")
 
-        if not files:
+        if not files and not keep_files:
             return
 
+        checksums = self._get_checksums_from_hashers(files)
+
         # Generate the DatasetFiles
         dataset_files = []
         for data in files:
             dataset_file = DatasetFile.from_path(
-                client=self, path=data["path"], source=data["source"], based_on=data.get("based_on")
+                client=self,
+                path=data["path"],
+                source=data["source"],
+                based_on=data.get("based_on"),
+                checksum=checksums.get(str(data["path"])),
             )
             dataset_files.append(dataset_file)
 
         if clear_files_before:
             dataset.clear_files()
+            dataset.add_or_update_files(keep_files or [])
         dataset.add_or_update_files(dataset_files)
         datasets_provenance = DatasetsProvenance()
         datasets_provenance.add_or_update(dataset, creator=get_git_user(self.repository))
 
+    @staticmethod
+    def _copy_files(operations: List[Tuple[Path, Path, str, Optional[ContentHasher]]]):
+        """Copy, hard link, or move files in parallel; hash copied content with the given hashers."""
+        if not operations:
+            return
+
+        def copy(operation):
+            src, dst, action, hasher = operation
+
+            if action == "move":
+                shutil.move(src, dst, copy_function=copy_file)
+            else:
+                copy_file(src, dst, link=action == "link", hasher=hasher)
+
+        progress_text = "Copying files"
+        communication.start_progress(progress_text, total=len(operations))
+
+        try:
+            max_workers = min(os.cpu_count() - 1, 4) or 1
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                futures = [executor.submit(copy, operation) for operation in operations]
+                for future in concurrent.futures.as_completed(futures):
+                    # NOTE: Re-raise copy errors
+                    future.result()
+                    communication.update_progress(progress_text, amount=1)
+        finally:
+            communication.finalize_progress(progress_text)
+
+    def _get_checksums_from_hashers(self, files: List[Dict]) -> Dict[str, str]:
+        """Return git hashes of files whose content was hashed while it was downloaded or copied.
+
+        Files whose content git converts when staging them are hashed by git instead.
+        """
+        hashers = {str(data["path"]): data.pop("hasher") for data in files if data.get("hasher")}
+        if not hashers:
+            return {}
+
+        configuration = self.repository.get_configuration()
+        autocrlf = str(configuration.get_value("core", "autocrlf", "false")).lower()
+        has_lfs_filter = bool(configuration.get_value('filter "lfs"', "clean", ""))
+        attributes = self.repository.get_attributes(*hashers)
+
+        def is_set(value) -> bool:
+            return value is not None and value != "unset"
+
+        checksums = {}
+        for path, hasher in hashers.items():
+            path_attributes = attributes.get(path, {})
+            if is_set(path_attributes.get("ident")) or is_set(path_attributes.get("working-tree-encoding")):
+                continue
+
+            filter_driver = path_attributes.get("filter")
+            if filter_driver == "lfs" and has_lfs_filter:
+                checksum = hasher.get_lfs_pointer_git_hash()
+            elif is_set(filter_driver):
+                continue
+            elif any(is_set(path_attributes.get(name)) for name in ("text", "eol", "crlf")):
+                continue
+            elif "text" not in path_attributes and autocrlf in ("true", "input"):
+                continue
+            else:
+                checksum = hasher.get_git_hash()
+
+            if checksum:
+                checksums[path] = checksum
+
+        return checksums
+
     def is_protected_path(self, path):
         """Checks if a path is a protected path."""
         try:
@@ -476,9 +572,9 @@ class DatasetsApiMixin(object):
 
         return False
 
-    def _add_from_local(self, dataset, path, external, destination) -> List[Dict]:
+    def _add_from_local(self, dataset, path, external, destination, link=False) -> List[Dict]:
         """Add a file or directory from a local filesystem."""
-        action = "symlink" if external else "copy"
+        action = "symlink" if external else "link" if link else "copy"
         absolute_dataset_data_dir = (self.path / get_dataset_data_dir(self, dataset)).resolve()
         source_root = Path(get_absolute_path(path))
         is_with_repo = is_subpath(path=source_root, base=self.path)
@@ -535,7 +631,9 @@ class DatasetsApiMixin(object):
         else:
             return [get_metadata(source_root)]
 
-    def _add_from_urls(self, urls, destination, destination_names, extract):
+    def _add_from_urls(self, urls, destination, destination_names, extract, concurrency=None, rate_limit=None):
+        from renku.core.utils.requests import TokenBucket
+
         if destination.exists() and not destination.is_dir():
             raise errors.ParameterError(f"Destination is not a directory: '{destination}'")
 
@@ -553,7 +651,10 @@ class DatasetsApiMixin(object):
                     communication.unsubscribe(communicator)
 
         files = []
-        max_workers = min(os.cpu_count() - 1, 4) or 1
+        # NOTE: Downloads are I/O-bound, so, the number of workers doesn't depend on the number of CPUs
+        max_workers = concurrency or 4
+        # NOTE: Limit the rate at which downloads start to avoid being rate limited by providers
+        rate_limiter = TokenBucket(rate=rate_limit, capacity=max_workers) if rate_limit else None
         with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
             futures = {
                 executor.submit(
@@ -564,6 +665,7 @@ class DatasetsApiMixin(object):
                     extract=extract,
                     filename=name,
                     multiple=True,
+                    rate_limiter=rate_limiter,
                 )
                 for url, name in zip(urls, destination_names)
             }
@@ -573,24 +675,24 @@ class DatasetsApiMixin(object):
 
         return files
 
-    def _add_from_url(self, url, destination, extract, filename=None, multiple: bool = False):
+    def _add_from_url(self, url, destination, extract, filename=None, multiple: bool = False, rate_limiter=None):
         """Process adding from url and return the location on disk."""
         from renku.core.utils import requests
 
+        if rate_limiter:
+            rate_limiter.acquire()
+
         url = self._provider_check(url)
 
         try:
-            start = time.time() * 1e3
-
+            hashers = {}
             tmp_root, paths = requests.download_file(
-                base_directory=self.renku_path / self.CACHE, url=url, filename=filename, extract=extract
+                base_directory=self.renku_path / self.CACHE,
+                url=url,
+                filename=filename,
+                extract=extract,
+                hashers=hashers,
             )
-
-            exec_time = (time.time() * 1e3 - start) // 1e3
-            # If execution time was less or equal to zero seconds,
-            # block the thread a bit to avoid being rate limited.
-            if exec_time == 0:
-                time.sleep(min(os.cpu_count() - 1, 4) or 1)
         except errors.RequestError as e:  # pragma nocover
             raise errors.OperationError("Cannot download from {}".format(url)) from e
 
@@ -610,6 +712,7 @@ class DatasetsApiMixin(object):
                 "path": dst.relative_to(self.path),
                 "source": remove_credentials(url),
                 "parent": self,
+                "hasher": hashers.get(src),
             }
             for src, dst in paths
         ]
@@ -869,7 +972,6 @@ class DatasetsApiMixin(object):
         """
         from renku.core.management.client import LocalClient
 
-        visited_repos = {}
         updated_files: List[DynamicProxy] = []
         deleted_files: List[DynamicProxy] = []
 
@@ -877,48 +979,46 @@ class DatasetsApiMixin(object):
 
         try:
             communication.start_progress(progress_text, len(files))
-            for file in files:
-                communication.update_progress(progress_text, 1)
-                if not file.based_on:
-                    continue
 
-                based_on = file.based_on
-                url = based_on.url
-                if url in visited_repos:
-                    remote_repository, remote_client = visited_repos[url]
+            files_per_url = defaultdict(list)
+            for file in files:
+                if file.based_on:
+                    files_per_url[file.based_on.url].append(file)
                 else:
-                    remote_repository = clone_repository(
-                        url=url, path=get_cache_directory_for_repository(client=self, url=url), checkout_revision=ref
-                    )
-                    remote_client = LocalClient(remote_repository.path)
-                    visited_repos[url] = remote_repository, remote_client
-
-                checksum = remote_repository.get_object_hash(path=based_on.path, revision="HEAD")
-                found = bool(checksum)
-                changed = found and based_on.checksum != checksum
-
-                src = remote_repository.path / based_on.path
-                dst = self.renku_path.parent / file.entity.path
-
-                if changed:
-                    if src.exists():
-                        # Fetch file if it is tracked by Git LFS
-                        remote_client.pull_paths_from_storage(remote_client.path / based_on.path)
-                        if is_external_file(path=src, client_path=remote_client.path):
-                            self.remove_file(dst)
-                            self._create_external_file(src.resolve(), dst)
+                    communication.update_progress(progress_text, 1)
+
+            for url, url_files in files_per_url.items():
+                remote_repository = clone_repository(
+                    url=url, path=get_cache_directory_for_repository(client=self, url=url), checkout_revision=ref
+                )
+                remote_client = LocalClient(remote_repository.path)
+
+                checksums = self._get_remote_checksums(remote_repository, [f.based_on.path for f in url_files])
+                changed_files = []
+
+                for file in url_files:
+                    communication.update_progress(progress_text, 1)
+
+                    based_on = file.based_on
+                    checksum = checksums[based_on.path]
+                    found = bool(checksum)
+                    changed = found and based_on.checksum != checksum
+
+                    if changed:
+                        if (remote_repository.path / based_on.path).exists():
+                            changed_files.append((file, checksum))
                         else:
-                            shutil.copy(src, dst)
-                        file.based_on = RemoteEntity(checksum=checksum, path=based_on.path, url=based_on.url)
-                        updated_files.append(file)
-                    else:
-                        # File was removed or renamed
-                        found = False
-
-                if not found:
-                    if delete:
-                        self.remove_file(dst)
-                    deleted_files.append(file)
+                            # File was removed or renamed
+                            found = False
+
+                    if not found:
+                        if delete:
+                            self.remove_file(self.renku_path.parent / file.entity.path)
+                        deleted_files.append(file)
+
+                if changed_files:
+                    self._copy_remote_files(remote_client, changed_files)
+                    updated_files.extend(file for file, _ in changed_files)
         finally:
             communication.finalize_progress(progress_text)
 
@@ -936,6 +1036,45 @@ class DatasetsApiMixin(object):
 
         return updated_files, deleted_files
 
+    @staticmethod
+    def _get_remote_checksums(repository, paths: List[str]) -> Dict[str, Optional[str]]:
+        """Return checksums of paths in the HEAD of a remote repository by reading its tree once."""
+        tree_checksums = repository.get_tree_object_hashes(path=".", revision="HEAD")
+        has_submodules = len(repository.submodules) > 0
+
+        checksums = {}
+        for path in paths:
+            checksum = tree_checksums.get(os.path.normpath(path))
+            if checksum is None and has_submodules:
+                # NOTE: Files in submodules aren't in the repository's tree
+                checksum = repository.get_object_hash(path=path, revision="HEAD")
+            checksums[path] = checksum
+
+        return checksums
+
+    def _copy_remote_files(self, remote_client, changed_files: List[Tuple[DynamicProxy, str]]):
+        """Fetch changed files of a remote repository from LFS at once and copy them into the project."""
+        # Fetch files if they are tracked by Git LFS
+        remote_client.pull_paths_from_storage(*(remote_client.path / f.based_on.path for f, _ in changed_files))
+
+        copies = []
+        for file, checksum in changed_files:
+            src = remote_client.path / file.based_on.path
+            dst = self.renku_path.parent / file.entity.path
+
+            if is_external_file(path=src, client_path=remote_client.path):
+                self.remove_file(dst)
+                self._create_external_file(src.resolve(), dst)
+            else:
+                copies.append((src, dst))
+
+            file.based_on = RemoteEntity(checksum=checksum, path=file.based_on.path, url=file.based_on.url)
+
+        max_workers = min(os.cpu_count() - 1, 4) or 1
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            # NOTE: Consume results to re-raise copy errors
+            list(executor.map(lambda paths: shutil.copy(*paths), copies))
+
     def _create_external_file(self, src, dst):
         """Create a new external file."""
         try:
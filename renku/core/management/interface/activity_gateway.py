@@ -55,6 +55,14 @@ class IActivityGateway(ABC):
         """Get all activities in the project."""
         raise NotImplementedError
 
+    def get_latest_activities(self) -> List[Activity]:
+        """Get activities that are not overridden by a newer activity with the same or a superset of outputs."""
+        raise NotImplementedError
+
+    def add_latest_activities_index(self):
+        """Add the index of latest activities to a database that doesn't have it."""
+        raise NotImplementedError
+
     def add(self, activity: Activity) -> None:
         """Add an ``Activity`` to storage."""
         raise NotImplementedError
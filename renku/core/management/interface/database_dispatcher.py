@@ -19,7 +19,7 @@
 
 from abc import ABC
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 if TYPE_CHECKING:
     from renku.core.metadata.database import Database
@@ -36,7 +36,9 @@ class IDatabaseDispatcher(ABC):
         """Get the currently active database."""
         raise NotImplementedError
 
-    def push_database_to_stack(self, path: Union[Path, str], commit: bool = False) -> None:
+    def push_database_to_stack(
+        self, path: Union[Path, str], commit: bool = False, revision: Optional[str] = None
+    ) -> None:
         """Create and push a new database to the stack."""
         raise NotImplementedError
 
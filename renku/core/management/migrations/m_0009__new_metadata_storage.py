@@ -17,6 +17,7 @@
 # limitations under the License.
 """Migrate old metadata to new storage format."""
 
+import json
 import os
 import shutil
 import traceback
@@ -25,7 +26,7 @@ from collections import defaultdict
 from hashlib import sha1
 from itertools import chain
 from pathlib import Path, PurePosixPath
-from typing import List, Optional, Union
+from typing import List, Optional, Set, Union
 from urllib.parse import urlparse
 
 import renku.core.management.migrate
@@ -36,6 +37,7 @@ from renku.core.management.dataset.datasets_provenance import DatasetsProvenance
 from renku.core.management.interface.activity_gateway import IActivityGateway
 from renku.core.management.interface.client_dispatcher import IClientDispatcher
 from renku.core.management.interface.database_gateway import IDatabaseGateway
+from renku.core.management.interface.plan_gateway import IPlanGateway
 from renku.core.management.interface.project_gateway import IProjectGateway
 from renku.core.management.migrations.models import v9 as old_schema
 from renku.core.management.migrations.utils import (
@@ -68,11 +70,17 @@ NON_EXISTING_ENTITY_CHECKSUM = "0" * 40
 
 PLAN_CACHE = {}
 
+CHANGED_PATHS_CACHE = {}
+
+MIGRATION_CHECKPOINT_FILENAME = "renku-metadata-migration.json"
+
 
 def migrate(migration_context):
     """Migration function."""
     client = migration_context.client
-    committed = _commit_previous_changes(client)
+    checkpoint = _read_migration_checkpoint(client)
+    # NOTE: Changes of an interrupted migration are committed at the end
+    committed = checkpoint["committed"] if checkpoint else _commit_previous_changes(client)
     # NOTE: Initialize submodules
     _ = client.repository.submodules
     _generate_new_metadata(
@@ -166,6 +174,7 @@ def _generate_new_metadata(
     client_dispatcher: IClientDispatcher,
     database_gateway: IDatabaseGateway,
     activity_gateway: IActivityGateway,
+    plan_gateway: IPlanGateway,
     force=True,
     remove=True,
     committed=False,
@@ -174,17 +183,6 @@ def _generate_new_metadata(
     """Generate graph and dataset provenance metadata."""
     client = client_dispatcher.current_client
 
-    if force:
-        remove_graph_files(client)
-    elif client.has_graph_files():
-        raise errors.OperationError("Graph metadata exists.")
-
-    database_gateway.initialize()
-
-    maybe_migrate_project_to_database(client)
-
-    datasets_provenance = DatasetsProvenance()
-
     commits = list(
         client.repository.iterate_commits(
             f"{client.renku_path}/workflow/*.yaml", ".renku/datasets/*/*.yml", reverse=True
@@ -192,16 +190,41 @@ def _generate_new_metadata(
     )
     n_commits = len(commits)
 
-    for n, commit in enumerate(commits, start=1):
+    CHANGED_PATHS_CACHE.clear()
+    n_processed_commits = _get_processed_commits_count(client, commits=commits, migration_type=migration_type)
+
+    if n_processed_commits:
+        communication.echo(f"Resuming migration after commit {commits[n_processed_commits - 1].hexsha}")
+        # NOTE: Reuse plans that are already migrated
+        PLAN_CACHE.update({plan.id.rsplit("/", maxsplit=1)[-1]: plan for plan in plan_gateway.get_all_plans()})
+    else:
+        if force:
+            remove_graph_files(client)
+        elif client.has_graph_files():
+            raise errors.OperationError("Graph metadata exists.")
+
+        database_gateway.initialize()
+
+        maybe_migrate_project_to_database(client)
+
+    datasets_provenance = DatasetsProvenance()
+
+    for n, commit in enumerate(commits[n_processed_commits:], start=n_processed_commits + 1):
         communication.echo(f"Processing commits {n}/{n_commits} {commit.hexsha}", end="\r")
 
         # NOTE: Treat the last commit differently if it was done by this migration
         is_last_commit = committed and n == n_commits
+        processed_workflow_files = []
 
         try:
             # NOTE: Don't migrate workflows for dataset-only migrations
             if MigrationType.WORKFLOWS in migration_type:
-                _process_workflows(activity_gateway=activity_gateway, commit=commit, remove=remove, client=client)
+                _process_workflows(
+                    activity_gateway=activity_gateway,
+                    commit=commit,
+                    client=client,
+                    processed_workflow_files=processed_workflow_files,
+                )
             _process_datasets(
                 client=client,
                 commit=commit,
@@ -222,8 +245,76 @@ def _generate_new_metadata(
 
         # NOTE: Commit changes after each step
         database_gateway.commit()
+        _set_migration_checkpoint(client, commit=commit.hexsha, migration_type=migration_type, committed=committed)
+
+        # NOTE: Remove workflow files only after their metadata is stored, so that an interrupted migration can resume
+        if remove:
+            for path in processed_workflow_files:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
 
     database_gateway.commit()
+    _remove_migration_checkpoint(client)
+
+
+def _get_migration_checkpoint_path(client) -> Path:
+    """Return path of the file that stores progress of an interrupted migration."""
+    # NOTE: Store it in ``.git`` so that it's never committed while the project is migrated
+    return client.repository.path / ".git" / MIGRATION_CHECKPOINT_FILENAME
+
+
+def is_metadata_migration_interrupted(client) -> bool:
+    """Return if a metadata migration was interrupted and can be resumed."""
+    return _read_migration_checkpoint(client) is not None
+
+
+def _read_migration_checkpoint(client) -> Optional[dict]:
+    """Return progress of an interrupted migration if its database still exists."""
+    try:
+        with open(_get_migration_checkpoint_path(client)) as file:
+            checkpoint = json.load(file)
+        if not isinstance(checkpoint["commit"], str) or not isinstance(checkpoint["committed"], bool):
+            return None
+        MigrationType(checkpoint["migration_type"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return checkpoint if client.database_path.exists() else None
+
+
+def _get_processed_commits_count(client, commits: List[Commit], migration_type: MigrationType) -> int:
+    """Return number of commits that an interrupted migration already processed."""
+    checkpoint = _read_migration_checkpoint(client)
+
+    if not checkpoint or checkpoint["migration_type"] != migration_type.value:
+        return 0
+
+    for n, processed_commit in enumerate(commits, start=1):
+        if processed_commit.hexsha == checkpoint["commit"]:
+            return n
+
+    return 0
+
+
+def _set_migration_checkpoint(client, commit: str, migration_type: MigrationType, committed: bool):
+    """Store the last commit that is processed and committed to the database."""
+    path = _get_migration_checkpoint_path(client)
+
+    temporary_path = path.with_suffix(".tmp")
+    with open(temporary_path, "w") as file:
+        json.dump({"commit": commit, "migration_type": migration_type.value, "committed": committed}, file)
+
+    os.replace(temporary_path, path)
+
+
+def _remove_migration_checkpoint(client):
+    """Remove progress of the migration once it's finished."""
+    try:
+        _get_migration_checkpoint_path(client).unlink()
+    except FileNotFoundError:
+        pass
 
 
 def _convert_run_to_plan(run: old_schema.Run, project_id) -> Plan:
@@ -337,7 +428,9 @@ def _get_process_runs(workflow_run: old_schema.WorkflowRun) -> List[old_schema.P
     return activities
 
 
-def _process_workflows(client: LocalClient, activity_gateway: IActivityGateway, commit: Commit, remove: bool):
+def _process_workflows(
+    client: LocalClient, activity_gateway: IActivityGateway, commit: Commit, processed_workflow_files: List[str]
+):
 
     for file in commit.get_changes(paths=f"{client.renku_path}/workflow/*.yaml"):
         if file.deleted:
@@ -364,11 +457,7 @@ def _process_workflows(client: LocalClient, activity_gateway: IActivityGateway,
             for new_activity in new_activities:
                 activity_gateway.add(new_activity)
 
-        if remove:
-            try:
-                os.remove(file.b_path)
-            except FileNotFoundError:
-                pass
+        processed_workflow_files.append(file.b_path)
 
 
 def _process_run_to_new_activity(process_run: old_schema.ProcessRun, client: LocalClient) -> List[Activity]:
@@ -509,12 +598,7 @@ def _convert_generated_entity(entity: old_schema.Entity, revision: str, activity
     """
     assert isinstance(entity, old_schema.Entity)
 
-    try:
-        entity_commit = client.repository.get_previous_commit(path=entity.path, revision=revision, submodule=True)
-    except errors.GitCommitNotFoundError:
-        return None
-
-    if entity_commit.hexsha != revision:
+    if not _is_modified_in_revision(client, path=entity.path, revision=revision):
         return None
 
     checksum = client.repository.get_object_hash(revision=revision, path=entity.path)
@@ -539,6 +623,51 @@ def _convert_generated_entity(entity: old_schema.Entity, revision: str, activity
     return new_entity
 
 
+def _is_modified_in_revision(client, path: str, revision: str) -> bool:
+    """Return if a path or anything beneath it is modified in a commit."""
+    changed_paths = _get_changed_paths(client, revision)
+
+    if changed_paths is not None:
+        if os.path.normpath(path) in changed_paths:
+            return True
+        # NOTE: Changes in submodules aren't in the list of changed paths
+        if len(client.repository.submodules) == 0:
+            return False
+
+    try:
+        entity_commit = client.repository.get_previous_commit(path=path, revision=revision, submodule=True)
+    except errors.GitCommitNotFoundError:
+        return False
+
+    return entity_commit.hexsha == revision
+
+
+def _get_changed_paths(client, revision: str) -> Optional[Set[str]]:
+    """Return changed files of a commit and their parent directories or None for merge commits."""
+    if revision not in CHANGED_PATHS_CACHE:
+        changed_paths = None
+
+        try:
+            commit = client.repository.get_commit(revision)
+        except errors.GitCommitNotFoundError:
+            commit = None
+
+        # NOTE: Which commits change a path is ambiguous for merge commits; let ``git log`` decide for them
+        if commit and commit.hexsha == revision and len(commit.parents) <= 1:
+            output = client.repository.run_git_command(
+                "diff-tree", "-r", "-z", "--name-only", "--no-commit-id", "--no-renames", "--root", revision
+            )
+            changed_paths = set()
+            for changed_path in output.split("\0"):
+                if changed_path:
+                    changed_paths.add(changed_path)
+                    changed_paths.update(str(p) for p in PurePosixPath(changed_path).parents if str(p) != ".")
+
+        CHANGED_PATHS_CACHE[revision] = changed_paths
+
+    return CHANGED_PATHS_CACHE[revision]
+
+
 def _convert_invalidated_entity(entity: old_schema.Entity, client) -> Optional[Entity]:
     """Convert an Entity to one with proper metadata."""
     assert isinstance(entity, old_schema.Entity)
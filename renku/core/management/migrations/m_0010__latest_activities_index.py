@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Add the latest activities index to projects that don't have it."""
+
+from renku.core.management.command_builder import inject
+from renku.core.management.interface.activity_gateway import IActivityGateway
+
+
+def migrate(migration_context):
+    """Migration function."""
+    _add_latest_activities_index()
+
+
+@inject.autoparams()
+def _add_latest_activities_index(activity_gateway: IActivityGateway):
+    """Build the latest activities index from existing activities."""
+    activity_gateway.add_latest_activities_index()
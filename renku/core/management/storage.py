@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Client for handling a data storage."""
+import concurrent.futures
 import csv
 import functools
 import itertools
@@ -27,7 +28,7 @@ from collections import defaultdict
 from pathlib import Path
 from shutil import move, which
 from subprocess import PIPE, STDOUT, check_output, run
-from typing import Optional
+from typing import List, Optional
 
 import attr
 import pathspec
@@ -39,6 +40,7 @@ from renku.core.models.provenance.activity import Collection
 from renku.core.utils import communication
 from renku.core.utils.file_size import parse_file_size
 from renku.core.utils.git import run_command
+from renku.core.utils.os import LFS_POINTER_TEMPLATE, hash_file
 
 from .git import _expand_directories
 from .repository import RepositoryApiMixin
@@ -73,8 +75,6 @@ class StorageApiMixin(RepositoryApiMixin):
 
     _CMD_STORAGE_INSTALL = ["git", "lfs", "install", "--local"]
 
-    _CMD_STORAGE_TRACK = ["git", "lfs", "track", "--"]
-
     _CMD_STORAGE_UNTRACK = ["git", "lfs", "untrack", "--"]
 
     _CMD_STORAGE_CLEAN = ["git", "lfs", "clean"]
@@ -174,6 +174,8 @@ class StorageApiMixin(RepositoryApiMixin):
         # Calculate which paths can be tracked in lfs
         track_paths = []
         attrs = self.repository.get_attributes(*paths)
+        renku_lfs_ignore = self.renku_lfs_ignore
+        minimum_lfs_file_size = self.minimum_lfs_file_size
 
         for path in paths:
             path = Path(path)
@@ -190,30 +192,17 @@ class StorageApiMixin(RepositoryApiMixin):
 
             if (
                 path.is_dir()
-                and not self.renku_lfs_ignore.match_file(relative_path)
-                and not any(self.renku_lfs_ignore.match_tree(str(relative_path)))
+                and not renku_lfs_ignore.match_file(relative_path)
+                and not any(renku_lfs_ignore.match_tree(str(relative_path)))
             ):
-                track_paths.append(str(path / "**"))
-            elif not self.renku_lfs_ignore.match_file(str(relative_path)):
+                track_paths.append(str(relative_path / "**"))
+            elif not renku_lfs_ignore.match_file(str(relative_path)):
                 file_size = os.path.getsize(str(os.path.relpath(self.path / path, os.getcwd())))
-                if file_size >= self.minimum_lfs_file_size:
+                if file_size >= minimum_lfs_file_size:
                     track_paths.append(str(relative_path))
 
         if track_paths:
-            try:
-                result = run_command(
-                    self._CMD_STORAGE_TRACK,
-                    *track_paths,
-                    stdout=PIPE,
-                    stderr=STDOUT,
-                    cwd=self.path,
-                    universal_newlines=True,
-                )
-
-                if result.returncode != 0:
-                    raise errors.GitLFSError(f"Error executing 'git lfs track: \n {result.stdout}")
-            except (KeyboardInterrupt, OSError) as e:
-                raise errors.ParameterError(f"Couldn't run 'git lfs':\n{e}")
+            self._add_lfs_patterns_to_gitattributes(track_paths)
 
         show_message = self.get_value("renku", "show_lfs_message")
         if track_paths and (show_message is None or show_message == "True"):
@@ -225,6 +214,46 @@ class StorageApiMixin(RepositoryApiMixin):
 
         return track_paths
 
+    def _add_lfs_patterns_to_gitattributes(self, patterns: List[str]):
+        """Add LFS filter for patterns to ``.gitattributes`` in a single write, the same way ``git lfs track`` does."""
+        attributes_path = self.path / ".gitattributes"
+
+        try:
+            content = attributes_path.read_text()
+        except FileNotFoundError:
+            content = ""
+
+        tracked_patterns = set()
+        for line in content.splitlines():
+            pattern, *attributes = line.split() or [""]
+            if "filter=lfs" in attributes:
+                tracked_patterns.add(pattern)
+
+        lines = []
+        for pattern in patterns:
+            pattern = _escape_lfs_pattern(pattern)
+            if pattern not in tracked_patterns:
+                tracked_patterns.add(pattern)
+                lines.append(f"{pattern} filter=lfs diff=lfs merge=lfs -text\n")
+
+        if not lines:
+            return
+
+        try:
+            with attributes_path.open("a") as f:
+                if content and not content.endswith("\n"):
+                    f.write("\n")
+                f.writelines(lines)
+        except OSError as e:
+            raise errors.GitLFSError(f"Cannot update '{attributes_path}':\n{e}")
+
+        # NOTE: Touch tracked files so that git applies the LFS filter to them even if they are unmodified
+        for path in _expand_directories([self.path / p for p in patterns]):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
     @check_external_storage_wrapper
     def untrack_paths_from_storage(self, *paths):
         """Untrack paths from the external storage."""
@@ -320,11 +349,10 @@ class StorageApiMixin(RepositoryApiMixin):
                 relative_path = absolute_path.relative_to(client.path)
 
             if client.path not in tracked_paths:
-                tracked_paths[client.path] = self.list_tracked_paths(client)
+                tracked_paths[client.path] = set(self.list_tracked_paths(client))
 
             if client.path not in unpushed_paths:
-                u_paths = self.list_unpushed_lfs_paths(client)
-                unpushed_paths[client.path] = u_paths
+                unpushed_paths[client.path] = set(self.list_unpushed_lfs_paths(client))
 
             if absolute_path in unpushed_paths[client.path]:
                 local_only_paths.append(str(relative_path))
@@ -334,49 +362,65 @@ class StorageApiMixin(RepositoryApiMixin):
                 client_dict[client.path].append(str(relative_path))
                 clients[client.path] = client
 
-        for client_path, paths in client_dict.items():
-            client = clients[client_path]
-
-            for path in paths:
-                with open(path, "r") as tracked_file:
-                    try:
-                        header = tracked_file.read(len(self._LFS_HEADER))
-                        if header == self._LFS_HEADER:
-                            # file is not pulled
-                            continue
-                    except UnicodeDecodeError:
-                        # likely a binary file, not lfs pointer file
-                        pass
-                with tempfile.NamedTemporaryFile(mode="w+t", encoding="utf-8", delete=False) as tmp, open(
-                    path, "r+t"
-                ) as input_file:
-                    result = run(
-                        self._CMD_STORAGE_CLEAN, cwd=client_path, stdin=input_file, stdout=tmp, universal_newlines=True
-                    )
-
-                    if result.returncode != 0:
-                        raise errors.GitLFSError(f"Error executing 'git lfs clean: \n {result.stdout}")
-
-                    tmp_path = tmp.name
-                move(tmp_path, path)
-
-                # get lfs sha hash
-                old_pointer = client.repository.get_raw_content(path=path, revision="HEAD")
-                old_pointer = old_pointer.splitlines()[1]
-                old_pointer = old_pointer.split(" ")[1].split(":")[1]
-
-                prefix1 = old_pointer[:2]
-                prefix2 = old_pointer[2:4]
-
-                # remove from lfs cache
-                object_path = client.path / ".git" / "lfs" / "objects" / prefix1 / prefix2 / old_pointer
-                object_path.unlink()
-
-            # add paths so they don't show as modified
-            client.repository.add(*paths)
+        max_workers = min(os.cpu_count() - 1, 4) or 1
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            for client_path, paths in client_dict.items():
+                client = clients[client_path]
+
+                # NOTE: Consume results to re-raise errors
+                list(executor.map(functools.partial(self._clean_storage_file, client), paths))
+
+                # add paths so they don't show as modified
+                client.repository.add(*paths)
 
         return untracked_paths, local_only_paths
 
+    def _clean_storage_file(self, client, path: str):
+        """Replace a pulled LFS file with its pointer and remove its object from LFS cache."""
+        absolute_path = client.path / path
+
+        with open(absolute_path, "r") as tracked_file:
+            try:
+                header = tracked_file.read(len(self._LFS_HEADER))
+                if header == self._LFS_HEADER:
+                    # file is not pulled
+                    return
+            except UnicodeDecodeError:
+                # likely a binary file, not lfs pointer file
+                pass
+
+        # get lfs sha hash
+        old_pointer = client.repository.get_raw_content(path=path, revision="HEAD")
+        old_pointer = old_pointer.splitlines()[1]
+        old_pointer = old_pointer.split(" ")[1].split(":")[1]
+
+        prefix1 = old_pointer[:2]
+        prefix2 = old_pointer[2:4]
+        object_path = client.path / ".git" / "lfs" / "objects" / prefix1 / prefix2 / old_pointer
+
+        checksum = hash_file(absolute_path)
+        size = os.path.getsize(absolute_path)
+
+        with tempfile.NamedTemporaryFile(
+            mode="w+t", encoding="utf-8", dir=absolute_path.parent, delete=False
+        ) as tmp, open(absolute_path, "r+t") as input_file:
+            if checksum == old_pointer and object_path.exists():
+                # NOTE: Content is already in LFS cache; write the pointer directly instead of running ``git lfs clean``
+                tmp.write(LFS_POINTER_TEMPLATE.format(oid=checksum, size=size))
+            else:
+                result = run(
+                    self._CMD_STORAGE_CLEAN, cwd=client.path, stdin=input_file, stdout=tmp, universal_newlines=True
+                )
+
+                if result.returncode != 0:
+                    raise errors.GitLFSError(f"Error executing 'git lfs clean: \n {result.stdout}")
+
+            tmp_path = tmp.name
+        move(tmp_path, absolute_path)
+
+        # remove from lfs cache
+        object_path.unlink()
+
     @check_external_storage_wrapper
     def checkout_paths_from_storage(self, *paths):
         """Checkout a paths from LFS."""
@@ -394,6 +438,8 @@ class StorageApiMixin(RepositoryApiMixin):
             return
 
         attrs = self.repository.get_attributes(*paths)
+        renku_lfs_ignore = self.renku_lfs_ignore
+        minimum_lfs_file_size = self.minimum_lfs_file_size
         track_paths = []
 
         for path in paths:
@@ -409,9 +455,9 @@ class StorageApiMixin(RepositoryApiMixin):
                 continue
 
             if not absolute_path.is_dir():
-                if self.renku_lfs_ignore.match_file(path):
+                if renku_lfs_ignore.match_file(path):
                     continue
-                if os.path.getsize(absolute_path) < self.minimum_lfs_file_size:
+                if os.path.getsize(absolute_path) < minimum_lfs_file_size:
                     continue
 
                 track_paths.append(path)
@@ -627,3 +673,8 @@ class StorageApiMixin(RepositoryApiMixin):
         # for dataset in datasets_provenance.datasets:
         #     for file_ in dataset.files:
         #         _map_checksum_old(file_.entity, sha_mapping)
+
+
+def _escape_lfs_pattern(pattern: str) -> str:
+    """Escape a pattern for ``.gitattributes`` the same way ``git lfs track`` does."""
+    return pattern.replace("\\", "/").replace(" ", "[[:space:]]").replace("#", "\\#")
@@ -17,15 +17,22 @@
 # limitations under the License.
 """Custom database for store Persistent objects."""
 
+import contextlib
 import datetime
 import hashlib
 import importlib
 import io
 import json
+import mmap
+import os
+import struct
+import threading
+import weakref
+from collections import OrderedDict
 from enum import Enum
 from pathlib import Path
 from types import BuiltinFunctionType, FunctionType
-from typing import Dict, List, Optional, Union
+from typing import Dict, Generator, List, Optional, Tuple, Union
 from uuid import uuid4
 
 import persistent
@@ -55,6 +62,13 @@ MARKER = object()
 NEW = z64  # NOTE: Do not change this value since this is the default when a Persistent object is created
 PERSISTED = b"1" * 8
 
+DEFAULT_CACHE_SIZE = int(os.getenv("RENKU_DATABASE_CACHE_SIZE", 100_000))
+"""Maximum number of non-ghost objects kept in the database cache."""
+DEFAULT_CACHE_SIZE_BYTES = int(os.getenv("RENKU_DATABASE_CACHE_SIZE_BYTES", 1024 * 1024 * 1024))
+"""Maximum estimated size of non-ghost objects kept in the database cache."""
+DEFAULT_SNAPSHOTS_SIZE_BYTES = int(os.getenv("RENKU_DATABASE_SNAPSHOTS_SIZE_BYTES", 0))
+"""Maximum estimated size of read-only database snapshots; snapshots are disabled by default."""
+
 
 def _is_module_allowed(module_name: str, type_name: str):
     """Checks whether it is allowed to import from the given module for security purposes."""
@@ -63,6 +77,18 @@ def _is_module_allowed(module_name: str, type_name: str):
         raise TypeError(f"Objects of type '{type_name}' are not allowed")
 
 
+def estimate_size(data) -> int:
+    """Return an estimate of the memory used by an object from its serialized data."""
+    if isinstance(data, str):
+        return 50 + len(data)
+    elif isinstance(data, dict):
+        return 64 + sum(estimate_size(k) + estimate_size(v) for k, v in data.items())
+    elif isinstance(data, list):
+        return 56 + sum(8 + estimate_size(v) for v in data)
+
+    return 28
+
+
 def get_type_name(object) -> Optional[str]:
     """Return fully-qualified object's type name."""
     if object is None:
@@ -176,9 +202,12 @@ class Database:
 
     ROOT_OID = "root"
 
-    def __init__(self, storage):
+    def __init__(self, storage, cache_size: Optional[int] = None, cache_size_bytes: Optional[int] = None):
         self._storage: Storage = storage
-        self._cache = Cache()
+        self._cache = Cache(
+            max_objects=cache_size if cache_size is not None else DEFAULT_CACHE_SIZE,
+            max_bytes=cache_size_bytes if cache_size_bytes is not None else DEFAULT_CACHE_SIZE_BYTES,
+        )
         # The pre-cache is used by get to avoid infinite loops when objects load their state
         self._pre_cache: Dict[OID_TYPE, persistent.Persistent] = {}
         # Objects added explicitly by add() or when serializing other objects. After commit they are moved to _cache.
@@ -307,6 +336,7 @@ class Database:
         object = self._reader.deserialize(data)
         object._p_changed = 0
         object._p_serial = PERSISTED
+        object._p_estimated_size = estimate_size(data)
         if isinstance(object, Persistent):
             object.freeze()
 
@@ -355,9 +385,12 @@ class Database:
         data = self._storage.load(filename=self._get_filename_from_oid(object._p_oid))
         self._reader.set_ghost_state(object, data)
         object._p_serial = PERSISTED
+        object._p_estimated_size = estimate_size(data)
         if isinstance(object, Persistent):
             object.freeze()
 
+        self._cache.activate(object)
+
     def commit(self):
         """Commit modified and new objects."""
         while self._objects_to_commit:
@@ -370,6 +403,7 @@ class Database:
         compress = False if isinstance(object, (Catalog, RenkuOOBTree, OOBucket, Project, Index)) else True
         self._storage.store(filename=self._get_filename_from_oid(object._p_oid), data=data, compress=compress)
 
+        object._p_estimated_size = estimate_size(data)
         self._cache[object._p_oid] = object
 
         object._p_changed = 0  # NOTE: transition from changed to up-to-date
@@ -388,6 +422,26 @@ class Database:
         remove_from(self._pre_cache)
         remove_from(self._objects_to_commit)
 
+    @property
+    def path(self) -> Path:
+        """Return path of the database's storage."""
+        return self._storage.path
+
+    @property
+    def cache_statistics(self) -> Dict[str, int]:
+        """Return hit, miss, and eviction counters of the object cache."""
+        return self._cache.statistics
+
+    @property
+    def estimated_size(self) -> int:
+        """Return estimated size of objects that are loaded in memory."""
+        return self._cache.active_bytes
+
+    @property
+    def is_modified(self) -> bool:
+        """Return whether there are objects that are modified or not committed."""
+        return bool(self._objects_to_commit)
+
     def readCurrent(self, object):
         """We don't use this method but some Persistent logic require its existence."""
         assert object._p_jar is self
@@ -400,10 +454,25 @@ class Database:
 
 @implementer(IPickleCache)
 class Cache:
-    """Database ``Cache``."""
+    """Database ``Cache``.
 
-    def __init__(self):
+    The cache keeps the most recently used objects in memory up to a maximum number of objects and an estimated size
+    in bytes. When a limit is exceeded, the least recently used objects that are persisted and not modified are turned
+    into ghosts. Ghosts stay in the cache so that references to them remain valid and their state is reloaded from the
+    storage when they are accessed again.
+    """
+
+    def __init__(self, max_objects: Optional[int] = None, max_bytes: Optional[int] = None):
         self._entries = {}
+        # NOTE: Non-ghost objects in least-recently-used order
+        self._active: "OrderedDict[OID_TYPE, persistent.Persistent]" = OrderedDict()
+        self._active_bytes: int = 0
+        self._max_objects: Optional[int] = max_objects
+        self._max_bytes: Optional[int] = max_bytes
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
 
     def __len__(self):
         return len(self._entries)
@@ -420,28 +489,67 @@ class Cache:
         assert oid == object._p_oid, f"Cache key does not match oid: {oid} != {object._p_oid}"
 
         if oid in self._entries:
-            existing_data = self.get(oid)
+            existing_data = self._entries[oid]
             if existing_data is not object:
                 raise ValueError(f"The same oid exists: {existing_data} != {object}")
 
         self._entries[oid] = object
 
+        if object._p_state != GHOST:
+            self.activate(object)
+
     def __delitem__(self, oid):
         assert isinstance(oid, OID_TYPE), f"Invalid oid type: '{type(oid)}'"
         self._entries.pop(oid)
+        self._deactivate(oid)
+
+    @property
+    def active_objects(self) -> int:
+        """Return number of non-ghost objects in the cache."""
+        return len(self._active)
+
+    @property
+    def active_bytes(self) -> int:
+        """Return estimated size of non-ghost objects in the cache."""
+        return self._active_bytes
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "objects": len(self._entries),
+            "active_objects": len(self._active),
+            "active_bytes": self._active_bytes,
+        }
 
     def clear(self):
         """Remove all entries."""
         self._entries.clear()
+        self._active.clear()
+        self._active_bytes = 0
 
     def pop(self, oid, default=MARKER):
         """Remove and return an object."""
+        self._deactivate(oid)
         return self._entries.pop(oid) if default is MARKER else self._entries.pop(oid, default)
 
     def get(self, oid, default=None):
         """See ``IPickleCache``."""
         assert isinstance(oid, OID_TYPE), f"Invalid oid type: '{type(oid)}'"
-        return self._entries.get(oid, default)
+
+        object = self._entries.get(oid, MARKER)
+        if object is MARKER:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        if oid in self._active:
+            self._active.move_to_end(oid)
+
+        return object
 
     def new_ghost(self, oid, object):
         """See ``IPickleCache``."""
@@ -455,6 +563,139 @@ class Cache:
 
         self[oid] = object
 
+    def activate(self, object: persistent.Persistent):
+        """Mark an object as recently used after its state is loaded and evict objects if cache is full."""
+        oid = object._p_oid
+
+        if oid in self._active:
+            self._active.move_to_end(oid)
+        elif oid in self._entries:
+            self._active[oid] = object
+            self._active_bytes += object._p_estimated_size
+
+        self._evict()
+
+    def _deactivate(self, oid: OID_TYPE):
+        object = self._active.pop(oid, None)
+        if object is not None:
+            self._active_bytes -= object._p_estimated_size
+
+    def _is_full(self) -> bool:
+        return (self._max_objects is not None and len(self._active) > self._max_objects) or (
+            self._max_bytes is not None and self._active_bytes > self._max_bytes
+        )
+
+    def _evict(self):
+        """Turn least recently used objects that are not modified into ghosts until the cache is within its limits."""
+        if not self._is_full():
+            return
+
+        for oid, object in list(self._active.items()):
+            if not self._is_full():
+                break
+
+            if oid == Database.ROOT_OID or isinstance(object, Index):
+                continue
+            # NOTE: Only objects that can be reloaded from the storage are turned into ghosts
+            if object._p_state != UPTODATE or object._p_serial != PERSISTED:
+                continue
+
+            object._p_deactivate()
+            if object._p_state == GHOST:
+                self._deactivate(oid)
+                self.evictions += 1
+
+
+class DatabaseSnapshots:
+    """Read-only ``Database`` instances that are shared between commands that read the same revision of a project.
+
+    A snapshot is checked out by one command at a time and is returned to the pool when the command finishes, so, it
+    is never used concurrently. Objects loaded by a command can be used after the command returns (e.g. to serialize
+    a response); callers that do so must defer returning databases to the pool with ``deferred_release`` until they
+    are done with the objects. Snapshots of older revisions of a project are dropped, and least recently used
+    snapshots are dropped when their estimated size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes: int = max_bytes
+        self._snapshots: "OrderedDict[Tuple[str, str], Database]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether snapshots are stored."""
+        return self.max_bytes > 0
+
+    def checkout(self, path: Union[Path, str], revision: str) -> Optional[Database]:
+        """Remove and return the snapshot of a database at a revision if it exists."""
+        with self._lock:
+            return self._snapshots.pop((str(Path(path).resolve()), revision), None)
+
+    def release(self, database: Database, revision: str):
+        """Return a database to the pool unless it was modified or releasing is deferred in the current thread."""
+        deferred = getattr(self._local, "deferred", None)
+        if deferred is not None:
+            deferred.append((database, revision))
+            return
+
+        self._release(database, revision)
+
+    def begin_deferred_release(self):
+        """Keep databases that are released in the current thread out of the pool until ``end_deferred_release``."""
+        self._local.deferred = []
+
+    def end_deferred_release(self):
+        """Return databases that were released in the current thread since ``begin_deferred_release`` to the pool."""
+        deferred = getattr(self._local, "deferred", None) or []
+        self._local.deferred = None
+
+        for database, revision in deferred:
+            self._release(database, revision)
+
+    @contextlib.contextmanager
+    def deferred_release(self):
+        """Keep databases that are released in the current thread out of the pool while the context is active."""
+        self.begin_deferred_release()
+        try:
+            yield
+        finally:
+            self.end_deferred_release()
+
+    def _release(self, database: Database, revision: str):
+        if not self.enabled or database.is_modified:
+            return
+
+        path = str(Path(database.path).resolve())
+        with self._lock:
+            for key in [k for k in self._snapshots if k[0] == path]:
+                del self._snapshots[key]
+
+            self._snapshots[(path, revision)] = database
+
+            total_size = sum(d.estimated_size for d in self._snapshots.values())
+            while self._snapshots and total_size > self.max_bytes:
+                _, snapshot = self._snapshots.popitem(last=False)
+                total_size -= snapshot.estimated_size
+
+    def invalidate(self, path: Union[Path, str]):
+        """Drop all snapshots of a database."""
+        path = str(Path(path).resolve())
+        with self._lock:
+            for key in [k for k in self._snapshots if k[0] == path]:
+                del self._snapshots[key]
+
+    def clear(self):
+        """Drop all snapshots."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+database_snapshots = DatabaseSnapshots(max_bytes=DEFAULT_SNAPSHOTS_SIZE_BYTES)
+
 
 class Index(persistent.Persistent):
     """Database index."""
@@ -588,26 +829,66 @@ class Index(persistent.Persistent):
 
 
 class Storage:
-    """Store Persistent objects on the disk."""
+    """Store Persistent objects on the disk.
+
+    Objects are stored either as loose files (one file per object under ``<aa>/<bb>/<oid>``) or in a pack. A pack is an
+    append-only file containing the serialized data of many objects along with a sorted index that maps each ``oid`` to
+    its offset and length in the pack file. Both files are memory-mapped when reading. New objects are always written as
+    loose files which take precedence over packed objects; ``repack`` moves them into the pack.
+    """
 
     OID_FILENAME_LENGTH = 64
 
+    PACK_FILENAME = "objects.pack"
+    PACK_INDEX_FILENAME = "objects.idx"
+    PACK_MAGIC = b"RNKPACK1"
+    PACK_INDEX_MAGIC = b"RNKIDX01"
+    # NOTE: Each index entry is an oid followed by its offset and length in the pack file
+    PACK_INDEX_ENTRY = struct.Struct(f"<{OID_FILENAME_LENGTH}sQQ")
+    PACK_INDEX_HEADER = struct.Struct("<8sQ")
+
     def __init__(self, path: Union[Path, str]):
         self.path = Path(path)
         self.zstd_compressor = zstd.ZstdCompressor()
         self.zstd_decompressor = zstd.ZstdDecompressor()
+        self._pack: Optional[mmap.mmap] = None
+        self._pack_index: Optional[mmap.mmap] = None
+        self._pack_size: int = 0
+        self._pack_loaded = False
+
+    @property
+    def pack_path(self) -> Path:
+        """Path of the pack file."""
+        return self.path / self.PACK_FILENAME
+
+    @property
+    def pack_index_path(self) -> Path:
+        """Path of the pack's index file."""
+        return self.path / self.PACK_INDEX_FILENAME
+
+    @property
+    def is_packed(self) -> bool:
+        """Return True if the storage has a pack file."""
+        return self.pack_index_path.exists()
+
+    @classmethod
+    def is_pack_file(cls, path: Union[Path, str]) -> bool:
+        """Return True if path is a pack or a pack index file."""
+        return Path(path).name in (cls.PACK_FILENAME, cls.PACK_INDEX_FILENAME)
+
+    def _get_loose_path(self, filename: str) -> Path:
+        is_oid_path = len(filename) == Storage.OID_FILENAME_LENGTH
+        if is_oid_path:
+            return self.path / filename[0:2] / filename[2:4] / filename
+
+        return self.path / filename
 
     def store(self, filename: str, data: Union[Dict, List], compress=False):
         """Store object."""
         assert isinstance(filename, str)
 
-        is_oid_path = len(filename) == Storage.OID_FILENAME_LENGTH
-        if is_oid_path:
-            path = self.path / filename[0:2] / filename[2:4] / filename
-            path.parent.mkdir(parents=True, exist_ok=True)
-        else:
-            path = self.path / filename
-            self.path.mkdir(parents=True, exist_ok=True)
+        path = self._get_loose_path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
 
         if compress:
             with open(path, "wb") as f, self.zstd_compressor.stream_writer(f) as compressor:
@@ -621,24 +902,193 @@ class Storage:
         """Load data for object with object id oid."""
         assert isinstance(filename, str)
 
-        is_oid_path = len(filename) == Storage.OID_FILENAME_LENGTH
-        if is_oid_path:
-            path = self.path / filename[0:2] / filename[2:4] / filename
-        else:
-            path = self.path / filename
+        path = self._get_loose_path(filename)
+
+        if path.exists():
+            with open(path, "rb") as file:
+                return self._decode(file)
 
-        if not path.exists():
+        content = self._load_packed(filename)
+        if content is None:
             raise errors.ObjectNotFoundError(filename)
 
-        with open(path, "rb") as file:
-            header = int.from_bytes(file.read(4), "little")
-            file.seek(0)
-            if header == zstd.MAGIC_NUMBER:
-                with self.zstd_decompressor.stream_reader(file) as zfile:
-                    data = json.load(zfile)
+        return self._decode(io.BytesIO(content))
+
+    def exists(self, filename: str) -> bool:
+        """Return True if filename exists in the storage either as a loose file or in the pack."""
+        return self._get_loose_path(filename).exists() or self._find_in_pack(filename) is not None
+
+    def _decode(self, file):
+        header = int.from_bytes(file.read(4), "little")
+        file.seek(0)
+        if header == zstd.MAGIC_NUMBER:
+            with self.zstd_decompressor.stream_reader(file) as zfile:
+                return json.load(zfile)
+
+        return json.load(file)
+
+    def _open_pack(self):
+        """Memory-map pack and its index if they exist."""
+        if self._pack_loaded:
+            return
+
+        self._pack_loaded = True
+
+        if not self.pack_index_path.exists() or not self.pack_path.exists():
+            return
+
+        with open(self.pack_index_path, "rb") as index_file, open(self.pack_path, "rb") as pack_file:
+            self._pack_index = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._pack = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._pack_size = self.PACK_INDEX_HEADER.unpack_from(self._pack_index, 0)
+        if magic != self.PACK_INDEX_MAGIC or self._pack[: len(self.PACK_MAGIC)] != self.PACK_MAGIC:
+            self.close()
+            raise errors.ObjectPackCorruptError(self.pack_path)
+
+    def close(self):
+        """Release memory-mapped pack files."""
+        if self._pack is not None:
+            self._pack.close()
+        if self._pack_index is not None:
+            self._pack_index.close()
+
+        self._pack = None
+        self._pack_index = None
+        self._pack_size = 0
+        self._pack_loaded = False
+
+    def _find_in_pack(self, filename: str) -> Optional[Tuple[int, int]]:
+        """Binary-search the pack index and return offset and length of an object."""
+        if len(filename) != Storage.OID_FILENAME_LENGTH:
+            return None
+
+        self._open_pack()
+
+        if self._pack_index is None:
+            return None
+
+        key = filename.encode("ascii")
+        entry_size = self.PACK_INDEX_ENTRY.size
+        header_size = self.PACK_INDEX_HEADER.size
+
+        low, high = 0, self._pack_size
+        while low < high:
+            middle = (low + high) // 2
+            oid, offset, length = self.PACK_INDEX_ENTRY.unpack_from(self._pack_index, header_size + middle * entry_size)
+            if oid < key:
+                low = middle + 1
+            elif oid > key:
+                high = middle
             else:
-                data = json.load(file)
-        return data
+                return offset, length
+
+        return None
+
+    def _load_packed(self, filename: str) -> Optional[bytes]:
+        location = self._find_in_pack(filename)
+        if location is None:
+            return None
+
+        offset, length = location
+        return self._pack[offset : offset + length]
+
+    def _iterate_packed(self) -> Generator[Tuple[str, int, int], None, None]:
+        """Iterate over all objects in the pack and return their oid, offset and length."""
+        self._open_pack()
+
+        if self._pack_index is None:
+            return
+
+        entry_size = self.PACK_INDEX_ENTRY.size
+        header_size = self.PACK_INDEX_HEADER.size
+
+        for position in range(self._pack_size):
+            oid, offset, length = self.PACK_INDEX_ENTRY.unpack_from(
+                self._pack_index, header_size + position * entry_size
+            )
+            yield oid.decode("ascii"), offset, length
+
+    def _iterate_loose(self) -> Generator[Path, None, None]:
+        """Iterate over all loose objects that can be packed."""
+        if not self.path.exists():
+            return
+
+        for path in self.path.glob("??/??/*"):
+            if path.is_file() and len(path.name) == Storage.OID_FILENAME_LENGTH:
+                yield path
+
+    def repack(self) -> int:
+        """Move all loose objects into the pack and return the number of packed objects.
+
+        Packed objects that have a newer loose version are replaced. The new pack is written next to the old one and
+        replaces it only when complete.
+        """
+        loose_objects = {path.name: path for path in self._iterate_loose()}
+        packed_objects = {oid: (offset, length) for oid, offset, length in self._iterate_packed()}
+
+        oids = sorted(set(loose_objects) | set(packed_objects))
+        if not oids:
+            return 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        new_pack_path = self.pack_path.with_suffix(".pack.tmp")
+        new_pack_index_path = self.pack_index_path.with_suffix(".idx.tmp")
+
+        with open(new_pack_path, "wb") as pack_file, open(new_pack_index_path, "wb") as index_file:
+            pack_file.write(self.PACK_MAGIC)
+            index_file.write(self.PACK_INDEX_HEADER.pack(self.PACK_INDEX_MAGIC, len(oids)))
+
+            for oid in oids:
+                if oid in loose_objects:
+                    content = loose_objects[oid].read_bytes()
+                else:
+                    offset, length = packed_objects[oid]
+                    content = self._pack[offset : offset + length]
+
+                index_file.write(self.PACK_INDEX_ENTRY.pack(oid.encode("ascii"), pack_file.tell(), len(content)))
+                pack_file.write(content)
+
+        self.close()
+
+        # NOTE: Replace the index last so that readers never see an index pointing past the end of the pack
+        os.replace(new_pack_path, self.pack_path)
+        os.replace(new_pack_index_path, self.pack_index_path)
+
+        for path in loose_objects.values():
+            path.unlink()
+            self._remove_empty_parents(path)
+
+        return len(oids)
+
+    def unpack(self) -> int:
+        """Write all packed objects as loose files, remove the pack, and return the number of unpacked objects."""
+        count = 0
+
+        for oid, offset, length in self._iterate_packed():
+            path = self._get_loose_path(oid)
+            if path.exists():  # NOTE: Loose objects are newer than packed ones
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(self._pack[offset : offset + length])
+            count += 1
+
+        self.close()
+
+        if self.pack_index_path.exists():
+            self.pack_index_path.unlink()
+        if self.pack_path.exists():
+            self.pack_path.unlink()
+
+        return count
+
+    def _remove_empty_parents(self, path: Path):
+        for parent in (path.parent, path.parent.parent):
+            try:
+                parent.rmdir()
+            except OSError:  # NOTE: Directory is not empty
+                return
 
 
 class ObjectWriter:
@@ -756,9 +1206,11 @@ class ObjectReader:
     def __init__(self, database: Database):
         self._classes: Dict[str, type] = {}
         self._database = database
+        self._deserialization_cache = []
 
-        # a cache for normal (non-persistent objects with an id) to deduplicate them on load
-        self._normal_object_cache = {}
+        # a cache for normal (non-persistent objects with an id) to deduplicate them on load; it doesn't keep objects
+        # alive so that they can be freed when their parent objects are turned into ghosts
+        self._normal_object_cache = weakref.WeakValueDictionary()
 
     def _get_class(self, type_name: str) -> type:
         cls = self._classes.get(type_name)
@@ -878,8 +1330,9 @@ class ObjectReader:
                 data = self._deserialize_helper(data)
                 assert isinstance(data, dict)
 
-                if "id" in data and data["id"] in self._normal_object_cache:
-                    return self._normal_object_cache[data["id"]]
+                existing_object = self._normal_object_cache.get(data["id"]) if "id" in data else None
+                if existing_object is not None:
+                    return existing_object
 
                 for name, value in data.items():
                     object.__setattr__(new_object, name, value)
@@ -888,6 +1341,9 @@ class ObjectReader:
                     new_object = cls.make_instance(new_object)
 
                 if "id" in data and isinstance(data["id"], str) and data["id"].startswith("/"):
-                    self._normal_object_cache[data["id"]] = new_object
+                    try:
+                        self._normal_object_cache[data["id"]] = new_object
+                    except TypeError:  # NOTE: Object doesn't support weak references
+                        pass
 
             return new_object
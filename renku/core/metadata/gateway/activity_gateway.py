@@ -17,8 +17,10 @@
 # limitations under the License.
 """Renku activity database gateway implementation."""
 
+import json
+import os
 from pathlib import Path
-from typing import List, Optional, Set, Tuple, Union
+from typing import FrozenSet, Generator, List, Optional, Set, Tuple, Union
 
 from persistent.list import PersistentList
 
@@ -26,10 +28,10 @@ from renku.core.management.command_builder.command import inject
 from renku.core.management.interface.activity_gateway import IActivityGateway
 from renku.core.management.interface.database_dispatcher import IDatabaseDispatcher
 from renku.core.management.interface.plan_gateway import IPlanGateway
+from renku.core.metadata.database import Index, RenkuOOBTree
 from renku.core.metadata.gateway.database_gateway import ActivityDownstreamRelation
 from renku.core.models.provenance.activity import Activity, ActivityCollection
 from renku.core.models.workflow.plan import Plan
-from renku.core.utils.os import are_paths_related
 
 
 class ActivityGateway(IActivityGateway):
@@ -104,9 +106,42 @@ class ActivityGateway(IActivityGateway):
         """Get all activities in the project."""
         return list(self.database_dispatcher.current_database["activities"].values())
 
+    def get_latest_activities(self) -> List[Activity]:
+        """Get activities that are not overridden by a newer activity with the same or a superset of outputs."""
+        database = self.database_dispatcher.current_database
+
+        try:
+            index = database["latest-activities"]
+        except KeyError:
+            from renku.core.utils.metadata import filter_overridden_activities
+
+            # NOTE: Projects that aren't migrated don't have the index; don't modify the database in read-only commands
+            return filter_overridden_activities(self.get_all_activities())
+
+        return list(index.values())
+
+    def add_latest_activities_index(self):
+        """Add the index of latest activities to a database that doesn't have it."""
+        database = self.database_dispatcher.current_database
+
+        try:
+            database["latest-activities"]
+        except KeyError:
+            pass
+        else:
+            return
+
+        index = database.add_index(name="latest-activities", object_type=Activity)
+        by_generation = database["activities-by-generation"]
+
+        for activity in sorted(database["activities"].values(), key=lambda a: a.ended_at_time):
+            _update_latest_activities(index, by_generation, activity)
+
     def add(self, activity: Activity):
         """Add an ``Activity`` to storage."""
 
+        self.add_latest_activities_index()
+
         database = self.database_dispatcher.current_database
 
         database["activities"].add(activity)
@@ -122,18 +157,18 @@ class ActivityGateway(IActivityGateway):
                 by_usage[usage.entity.path] = PersistentList()
             by_usage[usage.entity.path].append(activity)
 
-            for path, activities in by_generation.items():
-                if are_paths_related(path, usage.entity.path):
-                    upstreams.update(activities)
+            for activities in _get_related_paths_values(by_generation, usage.entity.path):
+                upstreams.update(activities)
 
         for generation in activity.generations:
             if generation.entity.path not in by_generation:
                 by_generation[generation.entity.path] = PersistentList()
             by_generation[generation.entity.path].append(activity)
 
-            for path, activities in by_usage.items():
-                if are_paths_related(path, generation.entity.path):
-                    downstreams.update(activities)
+            for activities in _get_related_paths_values(by_usage, generation.entity.path):
+                downstreams.update(activities)
+
+        _update_latest_activities(database["latest-activities"], by_generation, activity)
 
         if upstreams:
             for s in upstreams:
@@ -157,3 +192,81 @@ class ActivityGateway(IActivityGateway):
     def get_all_activity_collections(self) -> List[ActivityCollection]:
         """Get all activity collections in the project."""
         return list(self.database_dispatcher.current_database["activity-collections"].values())
+
+
+def _get_related_paths_values(tree: RenkuOOBTree, path: str) -> Generator[List[Activity], None, None]:
+    """Return values of all keys in a path-keyed tree that are equal to, a parent of, or a child of ``path``.
+
+    Keys are sorted in the tree, so children of a path are found with a range query and parents by looking up each of
+    the path's ancestors. This avoids comparing ``path`` with every key in the tree.
+    """
+    path = os.path.normpath(str(path))
+
+    if path == ".":
+        yield from tree.values()
+        return
+
+    # NOTE: A key may or may not have a trailing slash
+    ancestors = {".", "./"}
+    parts = path.split("/")
+    for index in range(1, len(parts) + 1):
+        ancestor = "/".join(parts[:index])
+        ancestors.update((ancestor, f"{ancestor}/"))
+
+    for key in ancestors:
+        value = tree.get(key)
+        if value is not None:
+            yield value
+
+    # NOTE: All children of path are in range ['path/', 'path0') since '0' is the character after '/'
+    yield from tree.values(min=f"{path}/", max=f"{path}0", excludemax=True)
+
+
+def _get_outputs(activity: Activity) -> FrozenSet[str]:
+    """Return generation paths of an activity."""
+    return frozenset(g.entity.path for g in activity.generations)
+
+
+def _get_outputs_key(outputs: FrozenSet[str]) -> str:
+    """Return a key for a set of outputs in the latest activities index."""
+    return json.dumps(sorted(outputs))
+
+
+def _update_latest_activities(index: Index, by_generation: RenkuOOBTree, activity: Activity):
+    """Update the latest activities index with a new activity.
+
+    The index has one activity per set of outputs and gives the same result as ``filter_overridden_activities``. Only
+    entries that share an output with the activity are compared with it; these are found using ``by_generation``.
+    """
+    outputs = _get_outputs(activity)
+
+    if outputs:
+        candidate_keys = {_get_outputs_key(_get_outputs(a)) for path in outputs for a in by_generation.get(path, [])}
+        # NOTE: Activities without outputs are a subset of every activity
+        candidate_keys.add(_get_outputs_key(frozenset()))
+    else:
+        candidate_keys = set(index.keys())
+
+    subset_of = []
+    superset_of = []
+
+    for key in candidate_keys:
+        existing_activity = index.get(key)
+        if existing_activity is None:
+            continue
+
+        existing_outputs = _get_outputs(existing_activity)
+        if outputs.issubset(existing_outputs):
+            subset_of.append(existing_activity)
+        elif outputs.issuperset(existing_outputs):
+            superset_of.append((key, existing_activity))
+
+    if any(activity.ended_at_time < a.ended_at_time for a in subset_of):
+        # NOTE: Activity is a subset of another, newer activity
+        return
+
+    for key, existing_activity in superset_of:
+        if activity.ended_at_time > existing_activity.ended_at_time:
+            index.pop(key)
+
+    index.add(activity, key=_get_outputs_key(outputs))
@@ -31,7 +31,7 @@ from renku.core.management.command_builder.command import inject
 from renku.core.management.interface.client_dispatcher import IClientDispatcher
 from renku.core.management.interface.database_dispatcher import IDatabaseDispatcher
 from renku.core.management.interface.database_gateway import IDatabaseGateway
-from renku.core.metadata.database import RenkuOOBTree
+from renku.core.metadata.database import RenkuOOBTree, Storage
 from renku.core.models.dataset import Dataset
 from renku.core.models.provenance.activity import Activity, ActivityCollection
 from renku.core.models.workflow.plan import AbstractPlan
@@ -92,6 +92,7 @@ def initialize_database(database):
     database.add_index(name="activities", object_type=Activity, attribute="id")
     database.add_root_object(name="activities-by-usage", obj=RenkuOOBTree())
     database.add_root_object(name="activities-by-generation", obj=RenkuOOBTree())
+    database.add_index(name="latest-activities", object_type=Activity)
 
     database.add_index(name="activity-collections", object_type=ActivityCollection, attribute="id")
 
@@ -144,7 +145,18 @@ class DatabaseGateway(IDatabaseGateway):
         client_dispatcher = inject.instance(IClientDispatcher)
         client = client_dispatcher.current_client
 
+        database = self.database_dispatcher.current_database
+
         if ".." in revision_or_range:
+            paths = client.repository.get_changed_paths(revision_or_range, client.database_path)
+
+            # NOTE: Objects that are moved into a pack are deleted as loose files, so, a diff of the whole range misses
+            # them if they were modified and packed within the range. Check each commit in this case.
+            if not any(Storage.is_pack_file(p) for p in paths):
+                for path in paths:
+                    yield database.get(Path(path).name)
+                return
+
             commits = client.repository.iterate_commits(revision=revision_or_range)
         else:
             commits = [client.repository.get_commit(revision_or_range)]
@@ -153,7 +165,10 @@ class DatabaseGateway(IDatabaseGateway):
             for file in commit.get_changes(paths=f"{client.database_path}/**"):
                 if file.deleted:
                     continue
+                # NOTE: Repacking doesn't modify objects; they were already yielded when they were first stored
+                if Storage.is_pack_file(file.a_path):
+                    continue
 
                 oid = Path(file.a_path).name
 
-                yield self.database_dispatcher.current_database.get(oid)
+                yield database.get(oid)
@@ -20,8 +20,10 @@
 import configparser
 import math
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
 from collections import defaultdict
 from datetime import datetime
 from functools import lru_cache
@@ -37,6 +39,8 @@ from renku.core.utils.os import delete_file, get_absolute_path
 NULL_TREE = git.NULL_TREE
 _MARKER = object()
 
+CAT_FILE_BATCH_ENV_VAR = "RENKU_GIT_CAT_FILE_BATCH"
+
 
 def git_unicode_unescape(s: str, encoding: str = "utf-8") -> str:
     """Undoes git/gitpython unicode encoding."""
@@ -48,6 +52,14 @@ def git_unicode_unescape(s: str, encoding: str = "utf-8") -> str:
     return s
 
 
+def is_cat_file_batch_enabled() -> bool:
+    """Return if object lookups should go through long-lived ``git cat-file --batch`` processes.
+
+    Set ``RENKU_GIT_CAT_FILE_BATCH=0`` to run a separate git command for each lookup instead.
+    """
+    return os.environ.get(CAT_FILE_BATCH_ENV_VAR, "1").lower() not in ("0", "false", "no")
+
+
 def split_paths(*paths):
     """Return a generator with split list of paths."""
     argument_batch_size = 100
@@ -66,6 +78,8 @@ class BaseRepository:
         super().__init__()
         self._repository = repository
         self._path = Path(path).resolve()
+        # NOTE: ``cat-file`` co-processes answer one request at a time
+        self._cat_file_lock = threading.Lock()
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.path}>"
@@ -272,11 +286,29 @@ class BaseRepository:
 
         attributes = defaultdict(dict)
 
-        for batch in split_paths(*paths):
-            data = self.run_git_command("check-attr", "-z", "--all", "--", *batch)
-            for path, name, value in zip_longest(*[iter(data.strip("\0").split("\0"))] * 3):
-                if path:
-                    attributes[path][name] = value
+        # NOTE: Pass all paths to a single process rather than one process per batch of arguments
+        command = ["git", "check-attr", "-z", "--all", "--stdin"]
+        try:
+            result = subprocess.run(
+                command,
+                input="".join(f"{path}\0" for path in paths),
+                capture_output=True,
+                check=True,
+                cwd=self.path,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise errors.GitCommandError(
+                message=f"Git command failed: {e.stderr}",
+                command=command,
+                stdout=e.stdout,
+                stderr=e.stderr,
+                status=e.returncode,
+            ) from e
+
+        for path, name, value in zip_longest(*[iter(result.stdout.strip("\0").split("\0"))] * 3):
+            if path:
+                attributes[path][name] = value
 
         return attributes
 
@@ -333,6 +365,30 @@ class BaseRepository:
         else:
             return Commit.from_commit(self._repository, commit)
 
+    def get_changed_paths(self, revision_or_range: str, *paths: Union[Path, str]) -> List[str]:
+        """Return paths that are added or modified in a revision range using a single ``git diff``.
+
+        NOTE: A range ``A..B`` is diffed from the merge base of ``A`` and ``B`` to match the commits that
+        ``git log A..B`` returns. Deleted paths are not included.
+        """
+        if "..." not in revision_or_range:
+            revision_or_range = revision_or_range.replace("..", "...", 1)
+
+        output = self.run_git_command(
+            "diff", "--name-only", "-z", "--no-renames", "--diff-filter=d", revision_or_range, "--", *paths
+        )
+
+        return [p for p in output.split("\0") if p]
+
+    def is_ancestor(self, ancestor: Union["Commit", str], descendant: Union["Commit", str] = "HEAD") -> bool:
+        """Return True if ``ancestor`` is an ancestor of (or the same commit as) ``descendant``."""
+        try:
+            self.run_git_command("merge-base", "--is-ancestor", str(ancestor), str(descendant))
+        except errors.GitCommandError:
+            return False
+
+        return True
+
     def get_ignored_paths(self, *paths: Union[Path, str]) -> List[str]:
         """Return ignored paths matching ``.gitignore`` file."""
         ignored = []
@@ -380,6 +436,11 @@ class BaseRepository:
         absolute_path = get_absolute_path(path, self.path)
 
         def get_content_helper() -> bool:
+            if not apply_filters:
+                object_name = checksum or f"{revision}:{os.path.relpath(absolute_path, self.path)}"
+                if self._can_use_cat_file_batch(object_name):
+                    return self._copy_object_to_file(object_name, output_file)
+
             command = ["git", "cat-file"]
 
             if checksum is None:
@@ -454,6 +515,16 @@ class BaseRepository:
             paths: Set[Union[Path, str]], revision: str, repository: BaseRepository
         ) -> Dict[str, str]:
             """Get hashes for paths in a specific revision."""
+            object_names = {path: f"{revision}:{path}" for path in paths}
+            if repository._can_use_cat_file_batch(*object_names.values()):
+                result = {}
+                for path, object_name in object_names.items():
+                    try:
+                        result[path] = repository._get_object_hash_from_revision(object_name)
+                    except errors.GitCommandError:
+                        result[path] = None
+                return result
+
             existing_paths = repository.get_existing_paths_in_revision(paths, revision=revision)
             result = {}
             for batch in split_paths(*existing_paths):
@@ -545,7 +616,7 @@ class BaseRepository:
                 return
 
             try:
-                return self.run_git_command("rev-parse", f"{stashed_revision}:{relative_path}")
+                return self._get_object_hash_from_revision(f"{stashed_revision}:{relative_path}")
             except errors.GitCommandError:
                 return
 
@@ -561,7 +632,7 @@ class BaseRepository:
         relative_path = os.path.relpath(absolute_path, start=self.path)
 
         try:
-            return self.run_git_command("rev-parse", f"{revision}:{relative_path}")
+            return self._get_object_hash_from_revision(f"{revision}:{relative_path}")
         except errors.GitCommandError:
             # NOTE: The file can be in a submodule or it can be a directory which is staged but not committed yet.
             # It's also possible that the file was not there when the command ran but was there when workflows were
@@ -572,6 +643,28 @@ class BaseRepository:
 
             return get_object_hash_from_submodules()
 
+    def get_tree_object_hashes(self, path: Union[Path, str], revision: str = "HEAD") -> Dict[str, str]:
+        """Return git hashes of a path and all objects beneath it in a revision.
+
+        NOTE: This runs a single ``git ls-tree`` regardless of the number of objects. Returned paths are relative to
+        the repo's root and objects from submodules are not included.
+        """
+        relative_path = os.path.relpath(get_absolute_path(path, self.path), start=self.path)
+
+        try:
+            data = self.run_git_command("ls-tree", "-r", "-t", "-z", "--full-tree", revision, "--", relative_path)
+        except errors.GitCommandError:
+            return {}
+
+        hashes = {}
+        for entry in data.split("\0"):
+            if not entry:
+                continue
+            metadata, entry_path = entry.split("\t", 1)
+            hashes[entry_path] = metadata.split()[2]
+
+        return hashes
+
     def get_user(self) -> "Actor":
         """Return the local/global git user."""
         configuration = self.get_configuration()
@@ -623,6 +716,10 @@ class BaseRepository:
     ) -> List[str]:
         """List all paths that exist in a revision."""
 
+        if paths and self._can_use_cat_file_batch(*map(str, paths)) and len(self.submodules) == 0:
+            relative_paths = [os.path.relpath(get_absolute_path(p, self.path), self.path) for p in paths]
+            return [p for p in relative_paths if self._get_object_header(f"{revision}:{p}")]
+
         try:
             if paths:
                 dirs = []
@@ -665,6 +762,23 @@ class BaseRepository:
     @staticmethod
     def hash_objects(paths: List[Union[Path, str]]) -> List[str]:
         """Create a git hash for a list of paths. The paths don't need to be in a repository."""
+        if paths and not any("\n" in str(p) for p in paths):
+            # NOTE: Pass all paths to a single process rather than one process per batch of arguments
+            command = ["git", "hash-object", "--stdin-paths"]
+            try:
+                result = subprocess.run(
+                    command, input="\n".join(map(str, paths)), capture_output=True, check=True, text=True
+                )
+            except subprocess.CalledProcessError as e:
+                raise errors.GitCommandError(
+                    message=f"Git command failed: {e.stderr}",
+                    command=command,
+                    stdout=e.stdout,
+                    stderr=e.stderr,
+                    status=e.returncode,
+                ) from e
+            return result.stdout.splitlines()
+
         hashes = []
         try:
             for batch in split_paths(*paths):
@@ -680,6 +794,51 @@ class BaseRepository:
                 status=e.status,
             ) from e
 
+    def _can_use_cat_file_batch(self, *object_names: str) -> bool:
+        """Return if objects can be queried through the ``cat-file`` co-processes."""
+        # NOTE: Requests to ``cat-file`` are newline-separated
+        return (
+            self._repository is not None
+            and is_cat_file_batch_enabled()
+            and not any("\n" in name for name in object_names)
+        )
+
+    def _get_object_header(self, object_name: str) -> Optional[Tuple[str, str, int]]:
+        """Return hash, type, and size of an object or None if it doesn't exist using ``cat-file --batch-check``."""
+        with self._cat_file_lock:
+            try:
+                hexsha, type, size = self._repository.git.get_object_header(object_name)
+            except ValueError:
+                return
+
+        return hexsha.decode("ascii"), type.decode("ascii"), size
+
+    def _get_object_hash_from_revision(self, object_name: str) -> str:
+        """Return hash of an object in the form ``<revision>:<path>``."""
+        if self._can_use_cat_file_batch(object_name):
+            header = self._get_object_header(object_name)
+            if header:
+                return header[0]
+            # NOTE: Commits of submodules aren't in the object database, so, only ``rev-parse`` can resolve them
+            if len(self.submodules) == 0:
+                raise errors.GitCommandError(f"Cannot find object '{object_name}'")
+
+        return self.run_git_command("rev-parse", object_name)
+
+    def _copy_object_to_file(self, object_name: str, output_file: BinaryIO) -> bool:
+        """Write raw content of an object to a file using ``cat-file --batch``; return False if it doesn't exist."""
+        with self._cat_file_lock:
+            try:
+                _, _, _, stream = self._repository.git.stream_object_data(object_name)
+            except ValueError:
+                return False
+
+            # NOTE: The stream must be read completely before sending another request
+            shutil.copyfileobj(stream, output_file)
+
+        output_file.flush()
+        return True
+
     @staticmethod
     def hash_object(path: Union[Path, str]) -> str:
         """Create a git hash for a a path. The path doesn't need to be in a repository."""
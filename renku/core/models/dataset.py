@@ -17,12 +17,14 @@
 # limitations under the License.
 """Models representing datasets."""
 
+import bisect
 import copy
 import os
 import posixpath
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from urllib.parse import quote, urlparse
 from uuid import uuid4
 
@@ -236,10 +238,16 @@ class DatasetFile(Slots):
 
     @classmethod
     def from_path(
-        cls, client, path: Union[str, Path], source=None, based_on: RemoteEntity = None
+        cls, client, path: Union[str, Path], source=None, based_on: RemoteEntity = None, checksum: str = None
     ) -> Optional["DatasetFile"]:
-        """Return an instance from a path."""
-        entity = get_entity_from_revision(repository=client.repository, path=path)
+        """Return an instance from a path.
+
+        If ``checksum`` is passed, it's used as the file's git hash instead of hashing the file again.
+        """
+        if checksum:
+            entity = Entity(checksum=checksum, path=path)
+        else:
+            entity = get_entity_from_revision(repository=client.repository, path=path)
         if not entity:
             return
 
@@ -291,6 +299,224 @@ class DatasetFile(Slots):
         return self.date_removed is not None
 
 
+class _Child(NamedTuple):
+    """An entry of an internal node of ``DatasetFilesNode``."""
+
+    key: str
+    size: int
+    removed: int
+    node: "DatasetFilesNode"
+
+
+class DatasetFilesNode(Persistent):
+    """A node of a copy-on-write B-tree that stores dataset files using their paths as keys.
+
+    Nodes are never modified. An update creates new nodes only on the paths to the changed files and reuses the rest of
+    the tree, so, successive versions of a dataset share their unchanged files and only new nodes are stored in the
+    database.
+    """
+
+    MAX_SIZE = 256
+    MIN_SIZE = MAX_SIZE // 4
+
+    children: Optional[List["DatasetFilesNode"]] = None
+    files: Optional[List[DatasetFile]] = None
+    removed_counts: Optional[List[int]] = None
+    sizes: Optional[List[int]] = None
+
+    def __init__(self, *, height: int, files: List[DatasetFile] = None, children: List[_Child] = None):
+        self.id: str = f"/dataset-files-nodes/{uuid4().hex}"
+        # NOTE: Leaves have a height of 0 and their keys are paths of their files; internal nodes store the smallest
+        # key, the number of files, and the number of removed files of each of their children.
+        self.height: int = height
+
+        if height == 0:
+            self.files = files or []
+            self.keys: List[str] = [str(f.entity.path) for f in self.files]
+        else:
+            self.children = [c.node for c in children]
+            self.keys = [c.key for c in children]
+            self.removed_counts = [c.removed for c in children]
+            self.sizes = [c.size for c in children]
+
+    @classmethod
+    def from_files(cls, files: Iterable[DatasetFile]) -> "DatasetFilesNode":
+        """Create a tree from a list of files.
+
+        An active file has precedence over a removed file with the same path.
+        """
+        files_per_path: Dict[str, DatasetFile] = {}
+        for file in files:
+            path = str(file.entity.path)
+            existing_file = files_per_path.get(path)
+            if existing_file is None or existing_file.is_removed() or not file.is_removed():
+                files_per_path[path] = file
+
+        leaves = cls._create_nodes([files_per_path[p] for p in sorted(files_per_path)], height=0)
+        return cls._create_root(leaves, height=0)
+
+    @property
+    def is_leaf(self) -> bool:
+        """Return if the node stores files."""
+        return self.height == 0
+
+    def __len__(self):
+        return len(self.files) if self.is_leaf else sum(self.sizes)
+
+    def __iter__(self) -> Iterator[DatasetFile]:
+        if self.is_leaf:
+            yield from self.files
+        else:
+            for child in self.children:
+                yield from child
+
+    def get(self, path: str) -> Optional[DatasetFile]:
+        """Return a file using its path."""
+        node = self
+        while not node.is_leaf:
+            index = bisect.bisect_right(node.keys, path) - 1
+            if index < 0:
+                return
+            node = node.children[index]
+
+        index = bisect.bisect_left(node.keys, path)
+        if index < len(node.keys) and node.keys[index] == path:
+            return node.files[index]
+
+    def get_removed_files(self) -> Iterator[DatasetFile]:
+        """Return removed files without visiting subtrees that have none."""
+        if self.is_leaf:
+            yield from (f for f in self.files if f.is_removed())
+        else:
+            for removed_count, child in zip(self.removed_counts, self.children):
+                if removed_count:
+                    yield from child.get_removed_files()
+
+    def update(self, changes: Dict[str, Optional[DatasetFile]]) -> "DatasetFilesNode":
+        """Return a new tree with files added, replaced, or deleted (for ``None`` values) using their paths."""
+        if not changes:
+            return self
+
+        children = self._update(sorted(changes.items(), key=lambda c: c[0]))
+        return self._create_root(children, height=self.height)
+
+    @staticmethod
+    def diff(left: "DatasetFilesNode", right: "DatasetFilesNode") -> Tuple[List[DatasetFile], List[DatasetFile]]:
+        """Return files of each tree that are in subtrees not shared by the other tree.
+
+        A path that is not in these files either is in a shared subtree or doesn't exist in either of the trees.
+        """
+
+        def get_identity(node):
+            # NOTE: Nodes that are not stored yet don't have an oid
+            return node._p_oid or id(node)
+
+        left_nodes, right_nodes = [left], [right]
+
+        while True:
+            left_identities = {get_identity(n) for n in left_nodes}
+            right_identities = {get_identity(n) for n in right_nodes}
+            left_nodes = [n for n in left_nodes if get_identity(n) not in right_identities]
+            right_nodes = [n for n in right_nodes if get_identity(n) not in left_identities]
+
+            left_height = left_nodes[0].height if left_nodes else -1
+            right_height = right_nodes[0].height if right_nodes else -1
+
+            if left_height <= 0 and right_height <= 0:
+                return [f for n in left_nodes for f in n.files], [f for n in right_nodes for f in n.files]
+
+            if left_height >= right_height:
+                left_nodes = [c for n in left_nodes for c in n.children]
+            if right_height >= left_height:
+                right_nodes = [c for n in right_nodes for c in n.children]
+
+    def _get_items(self) -> Union[List[DatasetFile], List[_Child]]:
+        if self.is_leaf:
+            return self.files
+
+        return [_Child(*c) for c in zip(self.keys, self.sizes, self.removed_counts, self.children)]
+
+    def _as_child(self) -> _Child:
+        if self.is_leaf:
+            removed = sum(1 for f in self.files if f.is_removed())
+        else:
+            removed = sum(self.removed_counts)
+
+        return _Child(key=self.keys[0], size=len(self), removed=removed, node=self)
+
+    def _update(self, changes: List[Tuple[str, Optional[DatasetFile]]]) -> List[_Child]:
+        """Apply sorted changes and return nodes (with the same height as this node) that replace this node."""
+        if self.is_leaf:
+            files = dict(zip(self.keys, self.files))
+            for path, file in changes:
+                if file is None:
+                    files.pop(path, None)
+                else:
+                    files[path] = file
+
+            return self._create_nodes([files[p] for p in sorted(files)], height=0)
+
+        changes_per_child = defaultdict(list)
+        for path, file in changes:
+            index = max(bisect.bisect_right(self.keys, path) - 1, 0)
+            changes_per_child[index].append((path, file))
+
+        new_nodes = set()
+        children = []
+        for index, child in enumerate(self._get_items()):
+            if index not in changes_per_child:
+                children.append(child)
+                continue
+
+            for new_child in child.node._update(changes_per_child[index]):
+                new_nodes.add(id(new_child.node))
+
+                previous = children[-1] if children else None
+                if previous and (
+                    (id(previous.node) in new_nodes and len(previous.node.keys) < self.MIN_SIZE)
+                    or len(new_child.node.keys) < self.MIN_SIZE
+                ):
+                    # NOTE: Merge underfull nodes with their previous sibling to keep the tree balanced
+                    children.pop()
+                    items = previous.node._get_items() + new_child.node._get_items()
+                    merged_children = self._create_nodes(items, height=self.height - 1)
+                    new_nodes.update(id(c.node) for c in merged_children)
+                    children.extend(merged_children)
+                else:
+                    children.append(new_child)
+
+        return self._create_nodes(children, height=self.height)
+
+    @classmethod
+    def _create_nodes(cls, items: Union[List[DatasetFile], List[_Child]], height: int) -> List[_Child]:
+        """Create nodes with evenly distributed items."""
+        if not items:
+            return []
+
+        count = -(-len(items) // cls.MAX_SIZE)
+        chunks = [items[len(items) * i // count : len(items) * (i + 1) // count] for i in range(count)]
+
+        if height == 0:
+            return [cls(height=0, files=c)._as_child() for c in chunks]
+
+        return [cls(height=height, children=c)._as_child() for c in chunks]
+
+    @classmethod
+    def _create_root(cls, children: List[_Child], height: int) -> "DatasetFilesNode":
+        if not children:
+            return cls(height=0, files=[])
+
+        while len(children) > 1:
+            height += 1
+            children = cls._create_nodes(children, height=height)
+
+        root = children[0].node
+        while not root.is_leaf and len(root.children) == 1:
+            root = root.children[0]
+
+        return root
+
+
 class Dataset(Persistent):
     """Represent a dataset."""
 
@@ -342,7 +568,7 @@ class Dataset(Persistent):
 
         self.creators: List[Person] = creators or []
         # `dataset_files` includes existing files and those that have been removed in the previous version
-        self.dataset_files: List[DatasetFile] = dataset_files or []
+        self.dataset_files = dataset_files or []
         self.date_created: datetime = date_created
         self.date_modified: datetime = local_now()
         self.date_published: datetime = fix_datetime(date_published)
@@ -377,10 +603,27 @@ class Dataset(Persistent):
             if not isinstance(creator, (Person, SoftwareAgent)):
                 raise ValueError(f"Invalid creator type: {creator}")
 
+    def __setstate__(self, state):
+        # NOTE: Older metadata stores files as a list inside the dataset
+        dataset_files = state.pop("dataset_files", None)
+        super().__setstate__(state)
+        if dataset_files is not None:
+            self.__dict__["_dataset_files"] = DatasetFilesNode.from_files(dataset_files)
+
+    @property
+    def dataset_files(self) -> List[DatasetFile]:
+        """Return list of existing files and those that have been removed in the previous version sorted by path."""
+        return list(self._dataset_files)
+
+    @dataset_files.setter
+    def dataset_files(self, files: List[DatasetFile]):
+        """Replace all files."""
+        self._dataset_files: DatasetFilesNode = DatasetFilesNode.from_files(files)
+
     @property
     def files(self):
         """Return list of existing files."""
-        return [f for f in self.dataset_files if not f.is_removed()]
+        return [f for f in self._dataset_files if not f.is_removed()]
 
     @property
     def creators_csv(self):
@@ -407,7 +650,7 @@ class Dataset(Persistent):
 
         dataset.annotations = [a.copy() for a in self.annotations]
         dataset.creators = self.creators.copy()
-        dataset.dataset_files = [f.copy() for f in self.dataset_files]
+        # NOTE: Files are stored in an immutable tree that is shared between copies
         dataset.images = list(dataset.images or [])
         dataset.keywords = list(dataset.keywords or [])
         return dataset
@@ -462,33 +705,45 @@ class Dataset(Persistent):
 
     def find_file(self, path: Union[Path, str]) -> Optional[DatasetFile]:
         """Find a file in the dataset using its relative path."""
-        path = str(path)
-        for file in self.dataset_files:
-            if str(file.entity.path) == path and not file.is_removed():
-                return file
+        file = self._dataset_files.get(str(path))
+        if file and not file.is_removed():
+            return file
 
     def update_files_from(self, current_dataset: "Dataset", date: datetime = None):
-        """Check `current_files` to reuse existing entries and mark removed files."""
-        new_files: Dict[str, DatasetFile] = {f.entity.path: f for f in self.files}
-        current_files: Dict[str, DatasetFile] = {f.entity.path: f for f in current_dataset.files}
+        """Check `current_files` to reuse existing entries and mark removed files.
+
+        Only files that are not shared with ``current_dataset`` are compared.
+        """
+        new_files, current_files = DatasetFilesNode.diff(self._dataset_files, current_dataset._dataset_files)
+        new_files: Dict[str, DatasetFile] = {str(f.entity.path): f for f in new_files}
+        current_files: Dict[str, DatasetFile] = {str(f.entity.path): f for f in current_files if not f.is_removed()}
+
+        def get_removed_file(file):
+            removed_file = DatasetFile.from_dataset_file(file)
+            removed_file.remove(date)
+            return removed_file
 
-        files = []
+        changes: Dict[str, Optional[DatasetFile]] = {}
 
         for path, file in new_files.items():
-            # Use existing entries from `current_files` to avoid creating new ids
             current_file = current_files.pop(path, None)
-            if current_file and file.is_equal_to(current_file):
-                files.append(current_file)
-            else:
-                files.append(file)
+            if file.is_removed():
+                changes[path] = get_removed_file(current_file) if current_file else None
+            elif current_file and file is not current_file and file.is_equal_to(current_file):
+                # Use existing entries from `current_files` to avoid creating new ids
+                changes[path] = current_file
 
         # NOTE: Whatever remains in `current_files` are removed in the newer version
-        for removed_file in current_files.values():
-            removed_file = DatasetFile.from_dataset_file(removed_file)
-            removed_file.remove(date)
-            files.append(removed_file)
+        for path, current_file in current_files.items():
+            changes[path] = get_removed_file(current_file)
 
-        self.dataset_files = files
+        # NOTE: Files that were removed in the previous version aren't part of the newer version
+        for file in self._dataset_files.get_removed_files():
+            path = str(file.entity.path)
+            if path not in new_files:
+                changes[path] = None
+
+        self._dataset_files = self._dataset_files.update(changes)
 
     def update_metadata_from(self, other: "Dataset", exclude=None):
         """Update metadata from another dataset."""
@@ -535,7 +790,10 @@ class Dataset(Persistent):
                 raise errors.InvalidFileOperation(f"File cannot be found: {path}")
             return
 
+        # NOTE: Files are shared with other versions of the dataset, so, they are replaced instead of being modified
+        file = file.copy()
         file.remove()
+        self._dataset_files = self._dataset_files.update({str(file.entity.path): file})
 
         return file
 
@@ -546,21 +804,18 @@ class Dataset(Persistent):
         if isinstance(files, DatasetFile):
             files = [files]
 
-        new_files = []
+        new_files: Dict[str, DatasetFile] = {}
 
         for file in files:
             existing_file = self.find_file(file.entity.path)
-            if not existing_file:
-                new_files.append(file)
-            elif file.entity.checksum != existing_file.entity.checksum or file.date_added != existing_file.date_added:
-                self.dataset_files.remove(existing_file)
-                new_files.append(file)
-
-        if not new_files:
-            return
-
-        self.dataset_files += new_files
-        self._p_changed = True
+            if (
+                not existing_file
+                or file.entity.checksum != existing_file.entity.checksum
+                or file.date_added != existing_file.date_added
+            ):
+                new_files[str(file.entity.path)] = file
+
+        self._dataset_files = self._dataset_files.update(new_files)
 
     def clear_files(self):
         """Remove all files."""
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018-2021- Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent cache of git hashes of files keyed by their stat data."""
+
+import json
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from renku.core.utils.os import get_absolute_path
+
+StatData = Tuple[int, int, int]
+
+
+class ChecksumCache:
+    """Store git blob hashes of files along with their modification time, size, and inode.
+
+    Similar to git's index, a file is hashed again only if its stat data changed since it was cached. Only regular files
+    are cached because the stat data of a directory doesn't change when the files it contains change.
+    """
+
+    FILENAME = "checksums.json"
+
+    # NOTE: Files modified this close to caching time may change again without their mtime changing (racy git problem)
+    RACY_INTERVAL_NS = 2 * 1_000_000_000
+
+    def __init__(self, path: Union[Path, str]):
+        self._path: Path = Path(path)
+        self._entries: Optional[Dict[str, list]] = None
+        self._modified: bool = False
+
+    @classmethod
+    def from_client(cls, client) -> "ChecksumCache":
+        """Return the checksum cache of a project."""
+        return cls(client.renku_path / client.CACHE / cls.FILENAME)
+
+    @property
+    def entries(self) -> Dict[str, list]:
+        """Return cached entries; load them from disk if needed."""
+        if self._entries is None:
+            self._entries = self._load()
+
+        return self._entries
+
+    def _load(self) -> Dict[str, list]:
+        try:
+            with open(self._path) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def save(self):
+        """Write the cache to disk if it was modified."""
+        if not self._modified:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self._path.with_suffix(".tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temporary_path, self._path)
+
+        self._modified = False
+
+    @staticmethod
+    def _get_stat_data(path: Union[Path, str]) -> Optional[StatData]:
+        try:
+            stat_result = os.lstat(path)
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+
+        return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+    def get(self, path: str, stat_data: Optional[StatData]) -> Optional[str]:
+        """Return the cached hash of a path if its stat data didn't change."""
+        if stat_data is None:
+            return None
+
+        entry = self.entries.get(path)
+        if not entry or tuple(entry[:3]) != stat_data:
+            return None
+
+        return entry[3]
+
+    def set(self, path: str, stat_data: Optional[StatData], checksum: Optional[str]):
+        """Cache hash of a path."""
+        if stat_data is None or checksum is None:
+            if self.entries.pop(path, None) is not None:
+                self._modified = True
+            return
+
+        if time.time_ns() - stat_data[0] < self.RACY_INTERVAL_NS:
+            return
+
+        self.entries[path] = [*stat_data, checksum]
+        self._modified = True
+
+    def get_object_hashes(self, repository, paths: List[Union[Path, str]]) -> Dict[str, Optional[str]]:
+        """Return git hashes of paths in repository's ``HEAD``; hash only files that changed since they were cached.
+
+        NOTE: Cached hashes are only valid for ``HEAD`` if paths are not modified in the working directory.
+        """
+        hashes = {}
+        missing = {}
+
+        for path in set(paths):
+            stat_data = self._get_stat_data(get_absolute_path(path, repository.path))
+            checksum = self.get(str(path), stat_data)
+
+            if checksum is not None:
+                hashes[path] = checksum
+            else:
+                missing[path] = stat_data
+
+        if missing:
+            missing_hashes = repository.get_object_hashes(paths=list(missing), revision="HEAD")
+            for path, stat_data in missing.items():
+                checksum = missing_hashes.get(path)
+                hashes[path] = checksum
+                self.set(str(path), stat_data, checksum)
+
+        return hashes
@@ -20,11 +20,14 @@
 import os
 import pathlib
 import shutil
+import threading
 import urllib
+from collections import OrderedDict
 from functools import reduce
+from itertools import chain
 from pathlib import Path
 from subprocess import SubprocessError, run
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from renku.core import errors
@@ -40,8 +43,9 @@ CLI_GITLAB_ENDPOINT = "repos"
 RENKU_BACKUP_PREFIX = "renku-backup"
 
 
-# TODO: Make sure caching is thread-safe
-_entity_cache = {}
+ENTITY_CACHE_SIZE = 10000
+# NOTE: Linux limits the length of a single command-line argument to 128 KiB
+MAX_JOINED_ARGUMENT_LENGTH = 100_000
 
 
 def run_command(command, *paths, separator=None, **kwargs):
@@ -57,7 +61,9 @@ def run_command(command, *paths, separator=None, **kwargs):
 
     result = None
 
-    for batch in split_paths(*paths):
+    batches = _split_joined_paths(paths, separator) if separator else split_paths(*paths)
+
+    for batch in batches:
         if separator:
             batch = [separator.join(batch)]
 
@@ -76,6 +82,24 @@ def run_command(command, *paths, separator=None, **kwargs):
     return result
 
 
+def _split_joined_paths(paths, separator: str):
+    """Return batches of paths that fit in a single argument once joined by ``separator``."""
+    batch = []
+    length = 0
+
+    for path in map(str, paths):
+        if batch and length + len(separator) + len(path) > MAX_JOINED_ARGUMENT_LENGTH:
+            yield batch
+            batch = []
+            length = 0
+
+        length += len(path) + (len(separator) if batch else 0)
+        batch.append(path)
+
+    if batch or not paths:
+        yield batch
+
+
 def is_valid_git_repository(repository: Optional["Repository"]) -> bool:
     """Return if is a git repository and has a valid HEAD."""
     return repository is not None and repository.head.is_valid()
@@ -225,51 +249,182 @@ def is_path_safe(path: Union[Path, str]) -> bool:
 
 
 def get_entity_from_revision(repository: "Repository", path: Union[Path, str], revision: str = None) -> "Entity":
-    """Return an Entity instance from given path and revision."""
+    """Return an Entity instance from given path and revision.
+
+    NOTE: Hashes of a directory's members are resolved in batches rather than one git process per member. Entities are
+    cached only when ``revision`` is given since the working tree can change between calls.
+    """
+    from renku.core.models.entity import Entity
+
+    key = _get_entity_cache_key(repository, path, revision)
+    cached_entity = _entity_cache.get(key) if key else None
+    if cached_entity:
+        return cached_entity
+
+    absolute_path = repository.path / path
+    if str(path) != "." and absolute_path.is_dir():
+        entity = _get_collection_from_revision(repository, path, revision, cache_key=key)
+    else:
+        # NOTE: For untracked directory the hash is None; make sure to stage them first before calling this function.
+        checksum = repository.get_object_hash(revision=revision, path=path)
+        # NOTE: If object was not found at a revision it's either removed or exists in a different revision; keep the
+        # entity and use revision as checksum
+        checksum = checksum or revision or "HEAD"
+        id = Entity.generate_id(checksum=checksum, path=path)
+        entity = Entity(id=id, checksum=checksum, path=path)
+
+        if key:
+            _entity_cache.set(key, entity)
+
+    return entity
+
+
+class _EntityCache:
+    """A thread-safe LRU cache of entities."""
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entities: "OrderedDict[Tuple[str, str, str], Entity]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional["Entity"]:
+        """Return a cached entity and mark it as recently used."""
+        with self._lock:
+            entity = self._entities.get(key)
+            if entity is not None:
+                self._entities.move_to_end(key)
+            return entity
+
+    def set(self, key: Tuple[str, str, str], entity: "Entity"):
+        """Cache an entity and evict the least recently used ones if the cache is full."""
+        with self._lock:
+            self._entities[key] = entity
+            self._entities.move_to_end(key)
+            while len(self._entities) > self._max_size:
+                self._entities.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached entities."""
+        with self._lock:
+            self._entities.clear()
+
+
+_entity_cache = _EntityCache(max_size=ENTITY_CACHE_SIZE)
+
+
+def _get_entity_cache_key(
+    repository: "Repository", path: Union[Path, str], revision: Optional[str]
+) -> Optional[Tuple[str, str, str]]:
+    """Return a cache key for an entity or None if it cannot be cached."""
+    if not revision:
+        return
+
+    # NOTE: Resolve revision to a commit sha since a reference like ``HEAD`` can move
+    try:
+        commit = repository.get_commit(revision)
+    except errors.GitCommitNotFoundError:
+        return
+
+    return str(repository.path), commit.hexsha, os.path.normpath(path)
+
+
+def _get_collection_from_revision(
+    repository: "Repository", path: Union[Path, str], revision: Optional[str], cache_key: Optional[Tuple[str, str, str]]
+) -> "Entity":
+    """Return a Collection and all of its members by walking the working tree once and hashing members in batches."""
     from renku.core.models.entity import Collection, Entity
 
-    def get_directory_members(absolute_path: Path) -> List[Entity]:
-        """Return first-level files/directories in a directory."""
-        members: List[Entity] = []
+    root = Path(os.path.normpath(path))
+    directories: List[Path] = []
+    files: List[Path] = []
+    members: Dict[Path, List[Path]] = {}
 
-        for member in absolute_path.iterdir():
+    # NOTE: Parents are always visited before their children
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        directories.append(directory)
+        members[directory] = []
+
+        for member in (repository.path / directory).iterdir():
             if member.name == ".gitkeep":
                 continue
 
             member_path = member.relative_to(repository.path)
+            members[directory].append(member_path)
 
-            assert all(member_path != m.path for m in members)
+            if member.is_dir():
+                pending.append(member_path)
+            else:
+                files.append(member_path)
+
+    hashes = _get_directory_object_hashes(repository, root, files, directories, revision)
+
+    def get_checksum(member_path: Path) -> str:
+        # NOTE: If object was not found at a revision it's either removed or exists in a different revision; keep the
+        # entity and use revision as checksum
+        return hashes.get(member_path) or revision or "HEAD"
+
+    entities: Dict[Path, Entity] = {}
+    for file in files:
+        checksum = get_checksum(file)
+        entities[file] = Entity(id=Entity.generate_id(checksum=checksum, path=file), checksum=checksum, path=file)
+
+    for directory in reversed(directories):
+        checksum = get_checksum(directory)
+        directory_path = path if directory == root else directory
+        entities[directory] = Collection(
+            id=Entity.generate_id(checksum=checksum, path=directory_path),
+            checksum=checksum,
+            path=directory_path,
+            members=[entities[m] for m in members[directory]],
+        )
 
-            entity = get_entity_from_revision(repository, member_path, revision)
-            # NOTE: If a path is not found at a revision we assume that it didn't exist at that revision
-            if entity:
-                members.append(entity)
+    if cache_key:
+        repository_path, commit_sha, _ = cache_key
+        for entity_path, entity in entities.items():
+            _entity_cache.set((repository_path, commit_sha, str(entity_path)), entity)
 
-        return members
+    return entities[root]
 
-    global _entity_cache
-    key = (revision, str(path))
-    cached_entry = _entity_cache.get(key)
-    if cached_entry:
-        return cached_entry
 
-    # NOTE: For untracked directory the hash is None; make sure to stage them first before calling this function.
-    checksum = repository.get_object_hash(revision=revision, path=path)
-    # NOTE: If object was not found at a revision it's either removed or exists in a different revision; keep the
-    # entity and use revision as checksum
-    checksum = checksum or revision or "HEAD"
-    id = Entity.generate_id(checksum=checksum, path=path)
+def _get_directory_object_hashes(
+    repository: "Repository", root: Path, files: List[Path], directories: List[Path], revision: Optional[str]
+) -> Dict[Path, Optional[str]]:
+    """Return git hashes of files and directories beneath ``root`` using a few batched git commands."""
+    hashes: Dict[Path, Optional[str]] = {}
 
-    absolute_path = repository.path / path
-    if str(path) != "." and absolute_path.is_dir():
-        members = get_directory_members(absolute_path)
-        entity = Collection(id=id, checksum=checksum, path=path, members=members)
-    else:
-        entity = Entity(id=id, checksum=checksum, path=path)
+    # NOTE: If revision is not specified, we use hash-object to hash the (possibly) modified files and fall back to
+    # ``HEAD`` for the rest
+    if not revision and files:
+        try:
+            file_hashes = repository.hash_objects([repository.path / f for f in files])
+        except errors.GitCommandError:
+            pass
+        else:
+            hashes.update(zip(files, file_hashes))
 
-    _entity_cache[cached_entry] = entity
+    tree_hashes = repository.get_tree_object_hashes(path=root, revision=revision or "HEAD")
+    for member_path in chain(files, directories):
+        if member_path not in hashes:
+            hashes[member_path] = tree_hashes.get(str(member_path))
 
-    return entity
+    # NOTE: Directories which are staged but not committed yet get their hash from a stash commit
+    if any(hashes[d] is None for d in directories):
+        stashed_revision = repository.run_git_command("stash", "create")
+        if stashed_revision:
+            tree_hashes = repository.get_tree_object_hashes(path=root, revision=stashed_revision)
+            for directory in directories:
+                if hashes[directory] is None:
+                    hashes[directory] = tree_hashes.get(str(directory))
+
+    # NOTE: Objects in submodules aren't listed in the project's tree
+    if repository.submodules and any(h is None for h in hashes.values()):
+        for member_path, checksum in hashes.items():
+            if checksum is None:
+                hashes[member_path] = repository.get_object_hash(path=member_path, revision=revision or "HEAD")
+
+    return hashes
 
 
 def default_path(path="."):
@@ -416,11 +571,12 @@ def clone_renku_repository(
     checkout_revision=None,
     use_renku_credentials: bool = False,
     reuse_existing_repository: bool = False,
+    clone_options: List[str] = None,
 ) -> "Repository":
     """Clone a Renku Repository."""
     parsed_url = parse_git_url(url)
 
-    clone_options = None
+    clone_options = list(clone_options or [])
     create_backup = False
 
     if parsed_url.hostname == "localhost":
@@ -429,7 +585,7 @@ def clone_renku_repository(
     elif parsed_url.scheme in ["http", "https"] and gitlab_token:
         git_url = get_oauth_url(url, gitlab_token)
     elif parsed_url.scheme in ["http", "https"] and use_renku_credentials:
-        clone_options = [f"--config credential.helper='!renku credentials --hostname {parsed_url.hostname}'"]
+        clone_options.append(f"--config credential.helper='!renku credentials --hostname {parsed_url.hostname}'")
         deployment_hostname = deployment_hostname or parsed_url.hostname
         git_url = get_renku_repo_url(url, deployment_hostname=deployment_hostname, access_token=None)
         create_backup = True
@@ -449,7 +605,7 @@ def clone_renku_repository(
         config=config,
         raise_git_except=raise_git_except,
         checkout_revision=checkout_revision,
-        clone_options=clone_options,
+        clone_options=clone_options or None,
     )
 
     if create_backup:
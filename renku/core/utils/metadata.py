@@ -32,6 +32,7 @@ if TYPE_CHECKING:
     from renku.core.models.entity import Entity
     from renku.core.models.provenance.activity import Activity
     from renku.core.models.provenance.agent import Person
+    from renku.core.utils.checksum_cache import ChecksumCache
 
 
 def construct_creators(creators: List[Union[dict, str]], ignore_email=False):
@@ -85,19 +86,22 @@ def construct_creator(creator: Union[dict, str], ignore_email) -> Tuple[Optional
 
 
 def get_modified_activities(
-    activities: List["Activity"], repository
+    activities: List["Activity"], repository, checksum_cache: Optional["ChecksumCache"] = None
 ) -> Tuple[Set[Tuple["Activity", "Entity"]], Set[Tuple["Activity", "Entity"]]]:
-    """Get lists of activities that have modified/deleted usage entities."""
+    """Get lists of activities that have modified/deleted usage entities.
+
+    If a ``checksum_cache`` is passed, only files that changed since they were last hashed are hashed again.
+    """
     modified = set()
     deleted = set()
 
-    paths = []
+    paths = {usage.entity.path for activity in activities for usage in activity.usages}
 
-    for activity in activities:
-        for usage in activity.usages:
-            paths.append(usage.entity.path)
-
-    hashes = repository.get_object_hashes(paths=paths, revision="HEAD")
+    if checksum_cache is not None:
+        hashes = checksum_cache.get_object_hashes(repository=repository, paths=list(paths))
+        checksum_cache.save()
+    else:
+        hashes = repository.get_object_hashes(paths=list(paths), revision="HEAD")
 
     for activity in activities:
         for usage in activity.usages:
@@ -20,12 +20,18 @@
 import hashlib
 import os
 import re
+import shutil
 from pathlib import Path
 from typing import Generator, List, Optional, Union
 
 from renku.core import errors
 
 BLOCK_SIZE = 4096
+COPY_BLOCK_SIZE = 1024 * 1024
+
+FICLONE = 0x40049409  # NOTE: ``ioctl`` request to create a reflink on Linux (``_IOW(0x94, 9, int)``)
+
+LFS_POINTER_TEMPLATE = "version https://git-lfs.github.com/spec/v1\noid sha256:{oid}\nsize {size}\n"
 
 
 def get_relative_path_to_cwd(path: Union[Path, str]) -> str:
@@ -151,6 +157,128 @@ def delete_file(path: Union[Path, str], ignore_errors: bool = True):
             raise
 
 
+class ContentHasher:
+    """Calculate git and LFS hashes of a file's content while it's written.
+
+    A git blob hash includes the size of the content in its header, so, the expected size must be known in advance. No
+    git hash is returned if the content has a different size.
+    """
+
+    def __init__(self, size: Optional[int]):
+        self.expected_size: Optional[int] = size
+        self.size: int = 0
+        self._sha1 = None
+        if size is not None:
+            self._sha1 = hashlib.sha1(f"blob {size}\0".encode("ascii"))
+        self._sha256 = hashlib.sha256()
+
+    def update(self, data: bytes):
+        """Hash a chunk of content."""
+        if self._sha1 is not None:
+            self._sha1.update(data)
+        self._sha256.update(data)
+        self.size += len(data)
+
+    @property
+    def is_complete(self) -> bool:
+        """Return if all of the expected content is hashed."""
+        return self.expected_size is None or self.size == self.expected_size
+
+    def get_git_hash(self) -> Optional[str]:
+        """Return git blob hash of the content."""
+        if self._sha1 is None or not self.is_complete:
+            return None
+
+        return self._sha1.hexdigest()
+
+    def get_lfs_pointer_git_hash(self) -> Optional[str]:
+        """Return git blob hash of the LFS pointer file of the content."""
+        if not self.is_complete:
+            return None
+        elif self.size == 0:  # NOTE: Git LFS doesn't create pointers for empty files
+            return hash_git_blob(b"")
+
+        pointer = LFS_POINTER_TEMPLATE.format(oid=self._sha256.hexdigest(), size=self.size)
+
+        return hash_git_blob(pointer.encode("ascii"))
+
+
+def hash_git_blob(content: bytes) -> str:
+    """Calculate git blob hash of some content."""
+    return hashlib.sha1(f"blob {len(content)}\0".encode("ascii") + content).hexdigest()
+
+
+def copy_file(
+    source: Union[Path, str], destination: Union[Path, str], link: bool = False, hasher: ContentHasher = None
+) -> str:
+    """Copy a file's content and permission bits in the cheapest way that the filesystem supports.
+
+    Returns the method used for copying: ``link``, ``reflink``, ``copy_file_range``, or ``copy``. Hard links are only
+    created if ``link`` is set since source and destination share their content afterwards. If a reflink isn't possible
+    and a ``hasher`` is passed, the content is hashed while copying it.
+    """
+    if link:
+        try:
+            os.link(source, destination)
+        except OSError:
+            pass
+        else:
+            return "link"
+
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        method = _clone_file_content(source_file, destination_file, hash_content=hasher is not None)
+
+        if method is None and hasher is not None:
+            for block in iter(lambda: source_file.read(COPY_BLOCK_SIZE), b""):
+                hasher.update(block)
+                destination_file.write(block)
+            method = "copy"
+
+    if method is None:
+        # NOTE: ``shutil.copyfile`` uses ``sendfile`` where it's available
+        shutil.copyfile(source, destination)
+        method = "copy"
+
+    shutil.copymode(source, destination)
+
+    return method
+
+
+def _clone_file_content(source_file, destination_file, hash_content: bool = False) -> Optional[str]:
+    """Copy content of an open file with a reflink or ``copy_file_range``; return None if neither is supported.
+
+    ``copy_file_range`` isn't used if the content should be hashed since then it's read anyway.
+    """
+    try:
+        import fcntl
+
+        fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+    except (ImportError, OSError):
+        pass
+    else:
+        return "reflink"
+
+    if hash_content or not hasattr(os, "copy_file_range"):
+        return None
+
+    # NOTE: Pseudo-files report a size of zero and ``copy_file_range`` may stop early on some file systems; the
+    # content is copied again in these cases since the destination is truncated when it's reopened.
+    remaining = os.fstat(source_file.fileno()).st_size
+    if remaining == 0:
+        return None
+
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining)
+            if copied == 0:
+                return None
+            remaining -= copied
+    except OSError:
+        return None
+
+    return "copy_file_range"
+
+
 def hash_file(path: Union[Path, str]) -> Optional[str]:
     """Calculate the sha256 hash of a file."""
     if not os.path.exists(path):
@@ -19,14 +19,23 @@
 
 This module provides some wrapper functions around ``requests`` library. It sets a timeout and converts exception types
 whenever needed. Use this module instead of ``requests``.
+
+All requests of a process share the same connection pools so that connections to a host are kept alive and reused
+instead of doing a new TCP and TLS handshake for each request.
 """
 
+import concurrent.futures
+import hashlib
+import json
 import os
+import shutil
 import tempfile
+import threading
+import time
 import urllib
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import patoolib
 import requests
@@ -34,8 +43,15 @@ from requests.adapters import HTTPAdapter, TimeoutSauce
 from urllib3.util.retry import Retry
 
 from renku.core import errors
+from renku.core.utils.os import ContentHasher
 
 _RENKU_REQUESTS_TIMEOUT_SECONDS = float(os.getenv("RENKU_REQUESTS_TIMEOUT_SECONDS", 1200))
+# NOTE: Number of hosts to keep connection pools for and maximum number of connections to each host
+_RENKU_REQUESTS_POOL_CONNECTIONS = int(os.getenv("RENKU_REQUESTS_POOL_CONNECTIONS", 10))
+_RENKU_REQUESTS_POOL_MAXSIZE = int(os.getenv("RENKU_REQUESTS_POOL_MAXSIZE", 10))
+# NOTE: Files larger than this are downloaded in this many parallel byte ranges
+_RENKU_DOWNLOAD_RANGED_MIN_SIZE = int(os.getenv("RENKU_DOWNLOAD_RANGED_MIN_SIZE", 32 * 1024 * 1024))
+_RENKU_DOWNLOAD_PARALLEL_RANGES = int(os.getenv("RENKU_DOWNLOAD_PARALLEL_RANGES", 4))
 
 
 class _CustomTimeout(TimeoutSauce):
@@ -55,6 +71,87 @@ class _CustomTimeout(TimeoutSauce):
 requests.adapters.TimeoutSauce = _CustomTimeout
 
 
+class _AdapterPool:
+    """Process-wide HTTP adapters; each adapter holds connection pools that are shared by all threads.
+
+    ``requests.Session`` isn't thread-safe but ``HTTPAdapter`` is; so, each request uses a new session with a shared
+    adapter. Adapters are re-created in a forked process since connections cannot be shared between processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._adapters: Dict[Tuple, HTTPAdapter] = {}
+        self._pid = None
+
+    def get_adapter(self, total_requests: int, backoff_factor: float, statuses: Tuple[int, ...]) -> HTTPAdapter:
+        """Return a shared adapter for the given retry configuration."""
+        key = (total_requests, backoff_factor, tuple(statuses))
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._adapters = {}
+                self._pid = os.getpid()
+
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                retries = Retry(total=total_requests, backoff_factor=backoff_factor, status_forcelist=list(statuses))
+                adapter = HTTPAdapter(
+                    pool_connections=_RENKU_REQUESTS_POOL_CONNECTIONS,
+                    pool_maxsize=_RENKU_REQUESTS_POOL_MAXSIZE,
+                    max_retries=retries,
+                    pool_block=True,
+                )
+                self._adapters[key] = adapter
+
+        return adapter
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+
+            self._adapters = {}
+
+
+_adapter_pool = _AdapterPool()
+
+
+class TokenBucket:
+    """A thread-safe token-bucket rate limiter.
+
+    Tokens are added at ``rate`` tokens per second up to ``capacity`` tokens; each request takes one token, so, at most
+    ``capacity`` requests can be sent at once and then ``rate`` requests per second on average.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise errors.ParameterError(f"Rate limit must be positive: {rate}")
+
+        self.rate: float = rate
+        self.capacity: int = max(capacity, 1)
+
+        self._lock = threading.Lock()
+        self._tokens: float = self.capacity
+        self._updated_at: float = time.monotonic()
+
+    def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+
+
 def delete(url, headers=None):
     """Send a DELETE request."""
     return _request("delete", url=url, headers=headers)
@@ -124,8 +221,23 @@ def check_response(response):
         raise errors.ExportError(response.content)
 
 
-def download_file(base_directory: Union[Path, str], url: str, filename, extract, chunk_size=16384):
-    """Download a URL to a given location."""
+def download_file(
+    base_directory: Union[Path, str],
+    url: str,
+    filename,
+    extract,
+    chunk_size=16384,
+    hashers: Dict[Path, ContentHasher] = None,
+):
+    """Download a URL to a given location.
+
+    Large files from servers that support HTTP Range requests are downloaded in parallel byte ranges. Downloaded ranges
+    are recorded in a manifest inside ``base_directory`` so that an interrupted download resumes where it stopped.
+    Interrupted downloads that aren't resumed for a while are removed.
+
+    If ``hashers`` is passed, content of files that are downloaded in one stream is hashed while writing it and the
+    hasher is stored in ``hashers`` for the downloaded path.
+    """
     from renku.core.utils import communication
 
     def extract_dataset(filepath):
@@ -139,12 +251,36 @@ def download_file(base_directory: Union[Path, str], url: str, filename, extract,
             filepath.unlink()
             return Path(tmp), [p for p in Path(tmp).rglob("*")]
 
+    def write_response(response, download_to):
+        """Write content of a response to a file in one stream and hash it."""
+        with open(str(download_to), "wb") as file_:
+            total_size = int(response.headers.get("content-length", 0))
+            # NOTE: Content-Length is the size of the encoded content if the server compresses the response
+            is_encoded = response.headers.get("content-encoding", "identity").lower() != "identity"
+            has_size = "content-length" in response.headers and not is_encoded
+            hasher = ContentHasher(size=total_size if has_size else None)
+
+            communication.start_progress(name=download_to.name, total=total_size)
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:  # ignore keep-alive chunks
+                        file_.write(chunk)
+                        hasher.update(chunk)
+                        communication.update_progress(name=download_to.name, amount=len(chunk))
+            finally:
+                communication.finalize_progress(name=download_to.name)
+
+        if hashers is not None:
+            hashers[download_to] = hasher
+
     tmp_root = Path(base_directory)
     tmp_root.mkdir(parents=True, exist_ok=True)
     tmp = tempfile.mkdtemp(dir=tmp_root)
 
+    _RangedDownload.remove_stale(directory=tmp_root)
+
     try:
-        with requests.get(url, stream=True, allow_redirects=True) as response:
+        with _get_session().get(url, stream=True, allow_redirects=True) as response:
             response.raise_for_status()
 
             if not filename:
@@ -157,17 +293,16 @@ def download_file(base_directory: Union[Path, str], url: str, filename, extract,
                     raise errors.ParameterError(f"URL Cannot find a file to download from {url}")
 
             download_to = Path(tmp) / filename
-            with open(str(download_to), "wb") as file_:
-                total_size = int(response.headers.get("content-length", 0))
+            ranged_download = _RangedDownload.from_response(response, url=url, directory=tmp_root, filename=filename)
 
-                communication.start_progress(name=filename, total=total_size)
-                try:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:  # ignore keep-alive chunks
-                            file_.write(chunk)
-                            communication.update_progress(name=filename, amount=len(chunk))
-                finally:
-                    communication.finalize_progress(name=filename)
+            if not ranged_download:
+                write_response(response, download_to)
+
+        if ranged_download and not ranged_download.download(destination=download_to):
+            # NOTE: The server didn't respond with byte ranges (e.g. the file changed); download it in one stream
+            with _get_session().get(url, stream=True, allow_redirects=True) as response:
+                response.raise_for_status()
+                write_response(response, download_to)
 
     except (requests.exceptions.HTTPError, urllib.error.HTTPError) as e:  # pragma nocover
         raise errors.RequestError(f"Cannot download from {url}") from e
@@ -178,6 +313,271 @@ def download_file(base_directory: Union[Path, str], url: str, filename, extract,
     return download_to.parent, [download_to]
 
 
+class _RangedDownload:
+    """Download a file in parallel byte ranges; record finished ranges in a manifest to resume interrupted downloads.
+
+    Each worker thread requests a range, writes it at its offset in a preallocated file, and adapts the size of its next
+    range to its throughput so that each request takes about ``TARGET_RANGE_SECONDS``. Downloads are identified by the
+    requested URL and filename; the URL after redirects is only used for fetching since it might be temporary (e.g. a
+    signed URL).
+    """
+
+    DIRECTORY = "downloads"
+    STALE_SECONDS = 7 * 24 * 60 * 60
+
+    INITIAL_RANGE_SIZE = 4 * 1024 * 1024
+    MIN_RANGE_SIZE = 1024 * 1024
+    MAX_RANGE_SIZE = 64 * 1024 * 1024
+    TARGET_RANGE_SECONDS = 5
+
+    def __init__(
+        self, *, url: str, download_url: str, size: int, validator: str, directory: Path, filename: str, parallel: int
+    ):
+        self.url: str = url
+        self.download_url: str = download_url
+        self.size: int = size
+        self.validator: str = validator
+        self.parallel: int = parallel
+
+        key = hashlib.sha256(f"{url}\0{filename}".encode("utf-8")).hexdigest()
+        self.path: Path = directory / self.DIRECTORY / key / "data"
+        self.manifest_path: Path = self.path.with_name("manifest.json")
+
+        self._lock = threading.Lock()
+        self._completed: List[List[int]] = []
+        self._gaps: List[List[int]] = []
+        self._downloaded: int = 0
+        self._stopped: bool = False
+        self._not_ranged: bool = False
+
+    @classmethod
+    def remove_stale(cls, directory: Path):
+        """Remove downloads that weren't resumed for ``STALE_SECONDS`` since they hold preallocated files."""
+        downloads = directory / cls.DIRECTORY
+        if not downloads.is_dir():
+            return
+
+        now = time.time()
+        for path in downloads.iterdir():
+            # NOTE: Replacing the manifest after each downloaded range updates the modification time of the directory
+            try:
+                is_stale = now - path.stat().st_mtime > cls.STALE_SECONDS
+            except OSError:
+                continue
+
+            if is_stale:
+                shutil.rmtree(path, ignore_errors=True)
+
+    @classmethod
+    def from_response(
+        cls, response: requests.Response, url: str, directory: Path, filename: str, parallel: int = None
+    ) -> Optional["_RangedDownload"]:
+        """Return a ranged download if the response is for a large file and the server supports byte ranges."""
+        headers = response.headers
+
+        if headers.get("accept-ranges", "").lower() != "bytes":
+            return None
+        # NOTE: Content-Length is the size of the encoded content if the server compresses the response
+        if headers.get("content-encoding", "identity").lower() != "identity":
+            return None
+
+        try:
+            size = int(headers.get("content-length", 0))
+        except ValueError:
+            return None
+
+        if size < _RENKU_DOWNLOAD_RANGED_MIN_SIZE:
+            return None
+
+        # NOTE: Ranges can only be combined if they are from the same version of the file; the server guarantees this
+        # in responses to requests with an If-Range header which requires a strong ETag
+        validator = headers.get("etag", "")
+        if not validator or validator.startswith("W/"):
+            return None
+
+        return cls(
+            url=url,
+            download_url=response.url,
+            size=size,
+            validator=validator,
+            directory=directory,
+            filename=filename,
+            parallel=parallel or _RENKU_DOWNLOAD_PARALLEL_RANGES,
+        )
+
+    def download(self, destination: Path) -> bool:
+        """Download the file and move it to ``destination``.
+
+        Return False if the server doesn't respond with byte ranges; the partial download is removed in this case.
+        """
+        from renku.core.utils import communication
+
+        self._prepare()
+
+        name = destination.name
+        communication.start_progress(name=name, total=self.size)
+        communication.update_progress(name=name, amount=self._downloaded)
+        reported = self._downloaded
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(self.parallel) as executor:
+                futures = {executor.submit(self._download_ranges) for _ in range(self.parallel)}
+
+                # NOTE: Communication listeners are thread-local, so, progress is reported from this thread
+                while futures:
+                    done, futures = concurrent.futures.wait(futures, timeout=0.5)
+                    for future in done:
+                        if future.exception():
+                            # NOTE: Stop other workers; finished ranges are kept in the manifest
+                            self._stopped = True
+                            future.result()
+
+                    downloaded = self._downloaded
+                    communication.update_progress(name=name, amount=downloaded - reported)
+                    reported = downloaded
+        except requests.RequestException as e:
+            raise errors.RequestError(f"Cannot download from {self.url}") from e
+        finally:
+            communication.finalize_progress(name=name)
+
+        if not self._not_ranged:
+            shutil.move(str(self.path), str(destination))
+        shutil.rmtree(self.path.parent, ignore_errors=True)
+
+        return not self._not_ranged
+
+    def _prepare(self):
+        """Load the manifest of a previous download or preallocate a new file."""
+        manifest = self._load_manifest()
+
+        if manifest and self.path.exists() and self.path.stat().st_size == self.size:
+            self._completed = manifest["completed"]
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as file:
+                try:
+                    os.posix_fallocate(file.fileno(), 0, self.size)
+                except (AttributeError, OSError):
+                    file.truncate(self.size)
+            self._completed = []
+            self._save_manifest()
+
+        self._gaps = []
+        position = 0
+        for start, end in self._completed:
+            if position < start:
+                self._gaps.append([position, start])
+            position = end
+        if position < self.size:
+            self._gaps.append([position, self.size])
+
+        self._downloaded = sum(end - start for start, end in self._completed)
+
+    def _load_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get("url") != self.url
+            or manifest.get("size") != self.size
+            or manifest.get("validator") != self.validator
+            or not isinstance(manifest.get("completed"), list)
+        ):
+            return None
+
+        return manifest
+
+    def _save_manifest(self):
+        """Write the manifest; must be called with the lock held or before starting workers."""
+        manifest = {"url": self.url, "size": self.size, "validator": self.validator, "completed": self._completed}
+        temporary_path = self.manifest_path.with_suffix(".tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temporary_path, self.manifest_path)
+
+    def _allocate(self, size: int) -> Optional[Tuple[int, int]]:
+        """Return the next range to download."""
+        with self._lock:
+            if not self._gaps or self._stopped:
+                return None
+
+            gap = self._gaps[0]
+            start = gap[0]
+            end = min(start + size, gap[1])
+            if end == gap[1]:
+                self._gaps.pop(0)
+            else:
+                gap[0] = end
+
+            return start, end
+
+    def _complete(self, start: int, end: int):
+        """Record a downloaded range and merge it with adjacent ranges."""
+        with self._lock:
+            self._completed.append([start, end])
+            self._completed.sort()
+
+            merged = [self._completed[0]]
+            for range_ in self._completed[1:]:
+                if range_[0] <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], range_[1])
+                else:
+                    merged.append(range_)
+            self._completed = merged
+
+            self._save_manifest()
+
+    def _download_ranges(self):
+        """Download ranges until there is nothing left; run in a worker thread."""
+        session = _get_session()
+        range_size = self.INITIAL_RANGE_SIZE
+
+        with open(self.path, "r+b") as file:
+            while True:
+                range_ = self._allocate(range_size)
+                if range_ is None:
+                    return
+
+                start, end = range_
+                started_at = time.monotonic()
+
+                headers = {"Range": f"bytes={start}-{end - 1}", "If-Range": self.validator}
+
+                with session.get(self.download_url, headers=headers, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        # NOTE: The server sends the whole file if it changed or if it ignores ranges
+                        with self._lock:
+                            self._not_ranged = True
+                            self._stopped = True
+                        return
+
+                    file.seek(start)
+                    position = start
+                    for chunk in response.iter_content(chunk_size=65536):
+                        chunk = chunk[: end - position]
+                        file.write(chunk)
+                        position += len(chunk)
+                        with self._lock:
+                            self._downloaded += len(chunk)
+                        if position >= end:
+                            break
+
+                if position != end:
+                    raise errors.RequestError(f"Incomplete ranged download for {self.url}")
+
+                file.flush()
+                self._complete(start, end)
+
+                elapsed = max(time.monotonic() - started_at, 1e-3)
+                range_size = int((end - start) / elapsed * self.TARGET_RANGE_SECONDS)
+                range_size = max(self.MIN_RANGE_SIZE, min(range_size, self.MAX_RANGE_SIZE))
+
+
 def get_filename_from_headers(response):
     """Extract filename from content-disposition headers if available."""
     content_disposition = response.headers.get("content-disposition", None)
@@ -208,14 +608,22 @@ def get_filename_from_headers(response):
 @contextmanager
 def _retry(total_requests=5, backoff_factor=0.2, statuses=(500, 502, 503, 504, 429)):
     """Default HTTP session for requests."""
-    _session = requests.Session()
-
-    retries = Retry(total=total_requests, backoff_factor=backoff_factor, status_forcelist=list(statuses))
-
-    _session.mount("http://", HTTPAdapter(max_retries=retries))
-    _session.mount("https://", HTTPAdapter(max_retries=retries))
-
     try:
-        yield _session
+        yield _get_session(total_requests=total_requests, backoff_factor=backoff_factor, statuses=statuses)
     except requests.RequestException as e:
         raise errors.RequestError("renku operation failed due to network connection failure") from e
+
+
+def _get_session(total_requests=5, backoff_factor=0.2, statuses=(500, 502, 503, 504, 429)) -> requests.Session:
+    """Return a session that uses the shared connection pools.
+
+    NOTE: Don't close the session since it closes the shared adapter.
+    """
+    session = requests.Session()
+
+    adapter = _adapter_pool.get_adapter(total_requests, backoff_factor, statuses)
+
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
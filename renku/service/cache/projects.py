@@ -16,9 +16,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Renku service project cache management."""
+import time
+
 from marshmallow import EXCLUDE
 
 from renku.service.cache.base import BaseCache
+from renku.service.cache.config import REDIS_NAMESPACE
 from renku.service.cache.models.project import Project
 from renku.service.cache.models.user import User
 from renku.service.cache.serializers.project import ProjectSchema
@@ -29,6 +32,7 @@ class ProjectManagementCache(BaseCache):
     """Project management cache."""
 
     project_schema = ProjectSchema()
+    used_projects_key = f"{REDIS_NAMESPACE}.projects.used"
 
     def make_project(self, user, project_data):
         """Store user project metadata."""
@@ -68,6 +72,21 @@ class ProjectManagementCache(BaseCache):
 
         return project_obj
 
+    def mark_project_used(self, project):
+        """Record when a project was used."""
+        self.cache.zadd(self.used_projects_key, {project.project_id: time.time()})
+
+    def get_recently_used_projects(self, period):
+        """Iterate through projects that were used in the last ``period`` seconds."""
+        since = time.time() - period
+        self.cache.zremrangebyscore(self.used_projects_key, "-inf", f"({since}")
+
+        for project_id in self.cache.zrangebyscore(self.used_projects_key, since, "+inf"):
+            try:
+                yield Project.load(project_id.decode("utf-8"))
+            except KeyError:
+                self.cache.zrem(self.used_projects_key, project_id)
+
     def user_projects(self):
         """Iterate through all cached projects."""
         for user in User.all():
@@ -46,8 +46,17 @@ SERVICE_NAME = "Renku Service"
 OPENAPI_VERSION = "3.0.3"
 API_VERSION = "v1"
 
+# NOTE: Deserialized metadata of projects is kept in memory for read requests, keyed by the project's HEAD commit
+DATABASE_SNAPSHOTS_SIZE_BYTES = int(os.getenv("RENKU_SVC_DATABASE_SNAPSHOTS_SIZE_BYTES", 256 * 1024 * 1024))
+
 PROJECT_CLONE_NO_DEPTH = -1
 PROJECT_CLONE_DEPTH_DEFAULT = int(os.getenv("PROJECT_CLONE_DEPTH_DEFAULT", 1))
+# NOTE: Projects are fetched at most once in `PROJECT_FETCH_TIME` seconds. Read requests use the last fetched state of
+# a project if it's not older than `PROJECT_FETCH_MAX_AGE` seconds while the project is fetched in the background.
+# Projects that were used in the last `PROJECT_KEEP_FRESH_TIME` seconds are fetched in the background regularly.
+PROJECT_FETCH_TIME = 30
+PROJECT_FETCH_MAX_AGE = int(os.getenv("PROJECT_FETCH_MAX_AGE", 600))
+PROJECT_KEEP_FRESH_TIME = int(os.getenv("PROJECT_KEEP_FRESH_TIME", 600))
 TEMPLATE_CLONE_DEPTH_DEFAULT = int(os.getenv("TEMPLATE_CLONE_DEPTH_DEFAULT", 0))
 
 CACHE_DIR = os.getenv("CACHE_DIR", os.path.realpath(tempfile.TemporaryDirectory().name))
@@ -57,6 +66,9 @@ CACHE_UPLOADS_PATH.mkdir(parents=True, exist_ok=True)
 CACHE_PROJECTS_PATH = Path(CACHE_DIR) / Path("projects")
 CACHE_PROJECTS_PATH.mkdir(parents=True, exist_ok=True)
 
+CACHE_MIRRORS_PATH = Path(CACHE_DIR) / Path("mirrors")
+CACHE_MIRRORS_PATH.mkdir(parents=True, exist_ok=True)
+
 TAR_ARCHIVE_CONTENT_TYPE = "application/x-tar"
 ZIP_ARCHIVE_CONTENT_TYPE = "application/zip"
 GZ_ARCHIVE_CONTENT_TYPE = "application/x-gzip"
@@ -18,7 +18,6 @@
 """Renku service controller mixin."""
 import contextlib
 from abc import ABCMeta, abstractmethod
-from datetime import datetime
 from functools import wraps
 from pathlib import Path
 
@@ -33,7 +32,13 @@ from renku.service.cache.config import REDIS_NAMESPACE
 from renku.service.cache.models.job import Job
 from renku.service.cache.models.project import Project
 from renku.service.cache.models.user import User
-from renku.service.config import PROJECT_CLONE_DEPTH_DEFAULT, PROJECT_CLONE_NO_DEPTH
+from renku.service.config import (
+    PROJECT_CLONE_DEPTH_DEFAULT,
+    PROJECT_CLONE_NO_DEPTH,
+    PROJECT_FETCH_MAX_AGE,
+    PROJECT_FETCH_TIME,
+)
+from renku.service.controllers.utils.project_clone import fetch_project, reset_project
 from renku.service.controllers.utils.remote_project import RemoteProject
 from renku.service.errors import (
     AuthenticationTokenMissing,
@@ -43,10 +48,9 @@ from renku.service.errors import (
 )
 from renku.service.jobs.contexts import enqueue_retry
 from renku.service.jobs.delayed_ctrl import delayed_ctrl_job
+from renku.service.jobs.project import enqueue_project_fetch
 from renku.service.serializers.common import DelayedResponseRPC
 
-PROJECT_FETCH_TIME = 30
-
 
 def local_identity(method):
     """Ensure identity on local execution."""
@@ -237,7 +241,14 @@ class RenkuOperationMixin(metaclass=ABCMeta):
 
         # NOTE: Only do a fetch every >30s to get eventual consistency but not slow things down too much,
         # except for MigrateProject since that is likely to require to unshallow the repository
-        if project.fetch_age < PROJECT_FETCH_TIME and not isinstance(self, MigrateProjectCtrl):
+        is_migration = isinstance(self, MigrateProjectCtrl)
+        if project.fetch_age < PROJECT_FETCH_TIME and not is_migration:
+            return
+
+        unshallow = self.migrate_project or self.clone_depth == PROJECT_CLONE_NO_DEPTH
+        if not (self.is_write or unshallow or is_migration) and project.fetch_age < PROJECT_FETCH_MAX_AGE:
+            # NOTE: Read operations use the last fetched state of a project and don't wait for the network
+            enqueue_project_fetch(project)
             return
 
         lock = project.write_lock()
@@ -250,31 +261,8 @@ class RenkuOperationMixin(metaclass=ABCMeta):
                     # NOTE: return immediately in case of multiple writers waiting
                     return
 
-                repository = Repository(project.abs_path)
-                origin = None
-                tracking_branch = repository.active_branch.remote_branch
-                if tracking_branch:
-                    origin = tracking_branch.remote
-                elif len(repository.remotes) == 1:
-                    origin = repository.remotes[0]
-
-                if origin:
-                    unshallow = self.migrate_project or self.clone_depth == PROJECT_CLONE_NO_DEPTH
-                    if unshallow:
-                        try:
-                            # NOTE: It could happen that repository is already un-shallowed,
-                            # in this case we don't want to leak git exception, but still want to fetch.
-                            repository.fetch("origin", repository.active_branch, unshallow=True)
-                        except errors.GitCommandError:
-                            repository.fetch("origin", repository.active_branch)
-
-                        repository.reset(f"{origin}/{repository.active_branch}", hard=True)
-                    else:
-                        repository.fetch("origin", repository.active_branch)
-                        repository.reset(f"{origin}/{repository.active_branch}", hard=True)
-
-                project.last_fetched_at = datetime.utcnow()
-                project.save()
+                remote_branch = fetch_project(project, unshallow=unshallow)
+                reset_project(project, remote_branch)
         except (portalocker.LockException, portalocker.AlreadyLocked) as e:
             raise RenkuServiceLockError() from e
 
@@ -285,6 +273,7 @@ class RenkuOperationMixin(metaclass=ABCMeta):
             raise OperationNotSupported("local execution is disabled")
 
         project = self.cache.get_project(self.user, self.context["project_id"])
+        self.cache.mark_project_used(project)
 
         if self.skip_lock:
             lock = contextlib.suppress()
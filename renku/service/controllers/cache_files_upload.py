@@ -17,16 +17,15 @@
 # limitations under the License.
 """Renku service cache upload files controller."""
 import os
-import shutil
-from pathlib import Path
-
-import patoolib
-from patoolib.util import PatoolError
 
 from renku.core.errors import RenkuException
 from renku.service.config import CACHE_UPLOADS_PATH, SUPPORTED_ARCHIVES
 from renku.service.controllers.api.abstract import ServiceCtrl
 from renku.service.controllers.api.mixins import RenkuOperationMixin
+from renku.service.controllers.utils.file_upload import list_unpacked_files, unpack_archive, write_chunk
+from renku.service.jobs.contexts import enqueue_retry
+from renku.service.jobs.queues import UPLOADS_JOB_QUEUE
+from renku.service.jobs.uploads import unpack_archive_job
 from renku.service.serializers.cache import FileUploadRequest, FileUploadResponseRPC, extract_file
 from renku.service.views import result_response
 
@@ -40,13 +39,15 @@ class UploadFilesCtrl(ServiceCtrl, RenkuOperationMixin):
     def __init__(self, cache, user_data, flask_request):
         """Construct controller."""
         self.file = extract_file(flask_request)
+        self.ctx = UploadFilesCtrl.REQUEST_SERIALIZER.load(flask_request.args)
 
         self.response_builder = {
             "file_name": self.file.filename,
             "content_type": self.file.content_type,
             "is_archive": self.file.content_type in SUPPORTED_ARCHIVES,
+            "unpack_archive": self.ctx["unpack_archive"],
+            "override_existing": self.ctx["override_existing"],
         }
-        self.response_builder.update(UploadFilesCtrl.REQUEST_SERIALIZER.load(flask_request.args))
 
         super(UploadFilesCtrl, self).__init__(cache, user_data, {})
 
@@ -61,39 +62,38 @@ class UploadFilesCtrl(ServiceCtrl, RenkuOperationMixin):
         user_cache_dir.mkdir(exist_ok=True)
 
         file_path = user_cache_dir / self.file.filename
-        if file_path.exists():
-            if self.response_builder.get("override_existing", False):
-                file_path.unlink()
-            else:
+        override = self.response_builder.get("override_existing", False)
+
+        if "chunked_id" in self.ctx:
+            chunked_id = self.ctx["chunked_id"]
+            received_size, completed = write_chunk(
+                self.user.user_id,
+                chunked_id,
+                self.file.stream,
+                offset=self.ctx["chunk_offset"],
+                total_size=self.ctx["total_size"],
+                destination=file_path,
+                override=override,
+            )
+
+            if not completed:
+                # NOTE: Files of an upload that was completed by an earlier request are returned again
+                files = self.get_uploaded_files(file_path) if received_size == self.ctx["total_size"] else []
+                return {"files": files, "chunked_id": chunked_id, "received_size": received_size}
+        else:
+            if file_path.exists() and not override:
                 raise RenkuException("file exists")
+            elif file_path.exists():
+                file_path.unlink()
 
-        self.file.save(str(file_path))
+            self.file.save(str(file_path))
 
-        files = []
         if self.response_builder["unpack_archive"] and self.response_builder["is_archive"]:
-            unpack_dir = "{0}.unpacked".format(file_path.name)
-            temp_dir = file_path.parent / Path(unpack_dir)
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-            temp_dir.mkdir(exist_ok=True)
-
-            try:
-                patoolib.extract_archive(str(file_path), outdir=str(temp_dir))
-            except PatoolError:
-                return RenkuException("unable to unpack archive")
-
-            for file_ in temp_dir.glob("**/*"):
-                relative_path = file_.relative_to(user_cache_dir)
-
-                file_obj = {
-                    "file_name": file_.name,
-                    "file_size": os.stat(file_).st_size,
-                    "relative_path": str(relative_path),
-                    "is_dir": file_.is_dir(),
-                }
-
-                files.append(file_obj)
+            if self.ctx.get("is_delayed", False):
+                return {"files": [], "job_id": self.enqueue_unpack_archive(file_path).job_id}
 
+            unpack_dir = unpack_archive(file_path)
+            files = list(list_unpacked_files(unpack_dir, user_cache_dir))
         else:
             relative_path = file_path.relative_to(CACHE_UPLOADS_PATH / self.user.user_id)
 
@@ -101,11 +101,38 @@ class UploadFilesCtrl(ServiceCtrl, RenkuOperationMixin):
             self.response_builder["relative_path"] = str(relative_path)
             self.response_builder["is_dir"] = file_path.is_dir()
 
-            files.append(self.response_builder)
+            files = [self.response_builder]
 
         files = self.cache.set_files(self.user, files)
         return {"files": files}
 
+    def get_uploaded_files(self, file_path):
+        """Return registered files of an upload including files that were unpacked from it."""
+        relative_path = str(file_path.relative_to(CACHE_UPLOADS_PATH / self.user.user_id))
+        unpacked_prefix = f"{relative_path}.unpacked/"
+
+        return [
+            f
+            for f in self.cache.get_files(self.user)
+            if f.relative_path == relative_path or f.relative_path.startswith(unpacked_prefix)
+        ]
+
+    def enqueue_unpack_archive(self, file_path):
+        """Unpack an uploaded archive in a worker."""
+        job = self.cache.make_job(self.user, job_data={"renku_op": "unpack_archive"})
+
+        with enqueue_retry(UPLOADS_JOB_QUEUE) as queue:
+            queue.enqueue(
+                unpack_archive_job,
+                self.user_data,
+                job.job_id,
+                str(file_path.relative_to(CACHE_UPLOADS_PATH / self.user.user_id)),
+                job_timeout=int(os.getenv("WORKER_UPLOAD_JOBS_TIMEOUT", 1800)),
+                result_ttl=int(os.getenv("WORKER_UPLOAD_JOBS_RESULT_TTL", 500)),
+            )
+
+        return job
+
     def renku_op(self):
         """Renku operation for the controller."""
         # NOTE: We leave it empty since it does not execute renku operation.
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Utilities for uploaded files.
+
+Large files are uploaded in chunks. Each chunk is sent with the id of the upload and its offset in the file and is
+written to a partial file on arrival. A client resumes an interrupted upload by sending the remaining chunks; the
+response of each chunk contains the number of bytes that were received so far.
+"""
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Generator, Tuple
+
+import patoolib
+import portalocker
+from patoolib.util import PatoolError
+
+from renku.core.errors import RenkuException
+from renku.service.cache.models.project import LOCK_TIMEOUT
+from renku.service.config import CACHE_UPLOADS_PATH
+
+CHUNKS_DIRECTORY = ".chunks"
+LOCK_SUFFIX = ".lock"
+CHUNK_BUFFER_SIZE = 1024 * 1024
+
+
+def get_chunks_path(user_id: str, chunked_id: str) -> Path:
+    """Return path of the partial file of a chunked upload."""
+    return CACHE_UPLOADS_PATH / user_id / CHUNKS_DIRECTORY / chunked_id
+
+
+def write_chunk(
+    user_id: str, chunked_id: str, stream, offset: int, total_size: int, destination: Path, override: bool = False
+) -> Tuple[int, bool]:
+    """Write a chunk of an upload at an offset.
+
+    A chunk can be sent again, but it cannot start after the end of the received data. Once all data is received, the
+    file is moved to ``destination``. Returns the number of bytes received so far and whether this chunk completed the
+    upload. If the upload was completed by an earlier request (e.g. the final chunk is sent again), the received size
+    is ``total_size`` and the upload isn't completed again.
+    """
+    path = get_chunks_path(user_id, chunked_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # NOTE: Lock a separate file since the partial file is moved to its destination once it's complete
+    with portalocker.Lock(f"{path}{LOCK_SUFFIX}", flags=portalocker.LOCK_EX, timeout=LOCK_TIMEOUT):
+        if not path.exists():
+            if offset > 0 and destination.exists() and destination.stat().st_size == total_size:
+                return total_size, False
+            elif destination.exists() and not override:
+                raise RenkuException("file exists")
+
+        with open(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), "r+b") as part:
+            received_size = part.seek(0, os.SEEK_END)
+            if offset > received_size:
+                raise RenkuException(f"chunk offset {offset} is after the end of the received data: {received_size}")
+
+            part.seek(offset)
+            shutil.copyfileobj(stream, part, CHUNK_BUFFER_SIZE)
+            received_size = max(received_size, part.tell())
+
+        if received_size < total_size:
+            return received_size, False
+        elif received_size > total_size:
+            path.unlink()
+            raise RenkuException(f"received {received_size} bytes for an upload of {total_size}")
+        elif destination.exists() and not override:
+            path.unlink()
+            raise RenkuException("file exists")
+
+        os.replace(path, destination)
+
+        return received_size, True
+
+
+def purge_stale_chunks(ttl: int):
+    """Remove partial files of uploads that didn't receive data in the last ``ttl`` seconds."""
+    now = time.time()
+    for path in CACHE_UPLOADS_PATH.glob(f"*/{CHUNKS_DIRECTORY}/*"):
+        if path.name.endswith(LOCK_SUFFIX):
+            continue
+
+        try:
+            if now - path.stat().st_mtime >= ttl:
+                path.unlink()
+        except FileNotFoundError:
+            continue
+
+    # NOTE: Lock files remain after an upload is complete
+    for path in CACHE_UPLOADS_PATH.glob(f"*/{CHUNKS_DIRECTORY}/*{LOCK_SUFFIX}"):
+        try:
+            if not Path(str(path)[: -len(LOCK_SUFFIX)]).exists() and now - path.stat().st_mtime >= ttl:
+                path.unlink()
+        except FileNotFoundError:
+            continue
+
+
+def unpack_archive(file_path: Path) -> Path:
+    """Extract an uploaded archive next to it and return the extraction directory."""
+    unpack_dir = file_path.parent / f"{file_path.name}.unpacked"
+    if unpack_dir.exists():
+        shutil.rmtree(unpack_dir)
+    unpack_dir.mkdir()
+
+    try:
+        patoolib.extract_archive(str(file_path), outdir=str(unpack_dir))
+    except PatoolError:
+        raise RenkuException("unable to unpack archive")
+
+    return unpack_dir
+
+
+def list_unpacked_files(unpack_dir: Path, user_cache_dir: Path) -> Generator[dict, None, None]:
+    """Yield details of files and directories in an extracted archive sorted by their path."""
+    for root, dirs, _ in os.walk(unpack_dir):
+        dirs.sort()
+
+        with os.scandir(root) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            yield {
+                "file_name": entry.name,
+                "file_size": entry.stat(follow_symlinks=False).st_size,
+                "relative_path": os.path.relpath(entry.path, user_cache_dir),
+                "is_dir": is_dir,
+            }
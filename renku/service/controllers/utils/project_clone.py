@@ -16,7 +16,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Utilities for renku service controllers."""
+from datetime import datetime
+from typing import Optional
+
+from renku.core import errors
 from renku.core.commands.clone import project_clone_command
+from renku.core.management import RENKU_HOME
+from renku.core.management.repository import RepositoryApiMixin
+from renku.core.metadata.database import database_snapshots
+from renku.core.metadata.repository import Repository
+from renku.service.controllers.utils.project_mirror import get_mirror_path, project_mirror, update_mirror
 from renku.service.logger import service_log
 from renku.service.views.decorators import requires_cache
 
@@ -31,7 +40,8 @@ def user_project_clone(cache, user_data, project_data):
     project = cache.make_project(user, project_data)
     project.abs_path.mkdir(parents=True, exist_ok=True)
 
-    with project.write_lock():
+    # NOTE: Clones of the same project share objects of a single mirror
+    with project.write_lock(), project_mirror(project_data["git_url"], project_data["url_with_auth"]) as clone_options:
         repo, project.initialized = (
             project_clone_command()
             .build()
@@ -46,6 +56,7 @@ def user_project_clone(cache, user_data, project_data):
                     "pull.rebase": False,
                 },
                 checkout_revision=project_data["ref"],
+                clone_options=clone_options,
             )
         ).output
         project.save()
@@ -54,3 +65,43 @@ def user_project_clone(cache, user_data, project_data):
     service_log.debug(f"project folder exists: {project.exists()}")
 
     return project
+
+
+def fetch_project(project, unshallow=False) -> Optional[str]:
+    """Fetch remote changes of a cached project and return the remote branch that the project tracks."""
+    repository = Repository(project.abs_path)
+    origin = None
+    tracking_branch = repository.active_branch.remote_branch
+    if tracking_branch:
+        origin = tracking_branch.remote
+    elif len(repository.remotes) == 1:
+        origin = repository.remotes[0]
+
+    if not origin:
+        return
+
+    if get_mirror_path(project.git_url).exists():
+        # NOTE: Refresh the shared mirror first so that this clone only fetches missing references
+        update_mirror(project.git_url, origin.url)
+
+    if unshallow:
+        try:
+            # NOTE: It could happen that repository is already un-shallowed,
+            # in this case we don't want to leak git exception, but still want to fetch.
+            repository.fetch("origin", repository.active_branch, unshallow=True)
+        except errors.GitCommandError:
+            repository.fetch("origin", repository.active_branch)
+    else:
+        repository.fetch("origin", repository.active_branch)
+
+    return f"{origin}/{repository.active_branch}"
+
+
+def reset_project(project, remote_branch: Optional[str]):
+    """Reset a cached project to its fetched remote branch."""
+    if remote_branch:
+        Repository(project.abs_path).reset(remote_branch, hard=True)
+        database_snapshots.invalidate(project.abs_path / RENKU_HOME / RepositoryApiMixin.DATABASE_PATH)
+
+    project.last_fetched_at = datetime.utcnow()
+    project.save()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared mirrors of projects in the service cache.
+
+Each git URL has a single bare mirror. Users' clones of a project use the mirror as an alternate object store (i.e.
+``git clone --reference``), so, objects are stored and fetched from the remote only once for all users. A mirror is
+removed once no cached project uses it.
+"""
+import contextlib
+import hashlib
+import shlex
+import shutil
+import time
+from pathlib import Path
+from typing import Generator, List, Optional
+
+import portalocker
+
+from renku.core import errors
+from renku.core.metadata.repository import Repository
+from renku.service.cache.models.project import LOCK_TIMEOUT, Project
+from renku.service.config import CACHE_MIRRORS_PATH
+from renku.service.logger import service_log
+
+MIRROR_FETCH_TIME = 30
+MIRROR_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+
+def get_mirror_path(git_url: str) -> Path:
+    """Return path of the mirror of a project."""
+    return CACHE_MIRRORS_PATH / hashlib.sha256(git_url.encode("utf-8")).hexdigest()
+
+
+def update_mirror(git_url: str, url_with_auth: str) -> Optional[Path]:
+    """Create or refresh the mirror of a project and return its path.
+
+    A mirror is fetched at most once every ``MIRROR_FETCH_TIME`` seconds for all users. Returns ``None`` if the mirror
+    cannot be updated.
+    """
+    path = get_mirror_path(git_url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with portalocker.Lock(f"{path}.lock", flags=portalocker.LOCK_EX, timeout=LOCK_TIMEOUT):
+            fetch_head = path / "FETCH_HEAD"
+            if fetch_head.exists() and time.time() - fetch_head.stat().st_mtime < MIRROR_FETCH_TIME:
+                return path
+
+            if path.exists():
+                repository = Repository(path)
+            else:
+                repository = Repository.initialize(path, bare=True)
+                with repository.get_configuration(writable=True) as config:
+                    # NOTE: Users' clones use objects of the mirror which must never be pruned
+                    config.set_value("gc", "auto", "0")
+                    config.set_value("renku", "url", git_url)
+
+            # NOTE: Fetch from the URL directly to not store the token in the mirror's config
+            repository.run_git_command("fetch", url_with_auth, *MIRROR_REFSPECS, prune=True)
+    except (errors.GitError, portalocker.LockException, portalocker.AlreadyLocked) as e:
+        service_log.warning(f"cannot update mirror of {git_url}: {e}")
+        return
+
+    return path
+
+
+@contextlib.contextmanager
+def project_mirror(git_url: str, url_with_auth: str) -> Generator[List[str], None, None]:
+    """Update the mirror of a project and yield clone options to use it.
+
+    The mirror cannot be removed while the context is active. Yields no options if the mirror is not available.
+    """
+    path = update_mirror(git_url, url_with_auth)
+    if not path:
+        yield []
+        return
+
+    lock = portalocker.Lock(f"{path}.lock", flags=portalocker.LOCK_SH, timeout=LOCK_TIMEOUT)
+    try:
+        lock.acquire()
+    except (portalocker.LockException, portalocker.AlreadyLocked):
+        yield []
+        return
+
+    try:
+        yield [f"--reference-if-able {shlex.quote(str(path))}"]
+    finally:
+        lock.release()
+
+
+def purge_unused_mirrors():
+    """Remove mirrors that no cached project uses."""
+    if not CACHE_MIRRORS_PATH.exists():
+        return
+
+    for path in CACHE_MIRRORS_PATH.iterdir():
+        if not path.is_dir():
+            continue
+
+        try:
+            with portalocker.Lock(f"{path}.lock", flags=portalocker.LOCK_EX | portalocker.LOCK_NB, timeout=0):
+                try:
+                    git_url = Repository(path).get_configuration().get_value("renku", "url")
+                except errors.GitError:
+                    git_url = None
+
+                if git_url and next(iter(Project.query(Project.git_url == git_url)), None):
+                    continue
+
+                service_log.debug(f"purging mirror of {git_url}")
+                shutil.rmtree(path)
+        except (portalocker.LockException, portalocker.AlreadyLocked):
+            continue
@@ -29,8 +29,16 @@ from sentry_sdk.integrations.flask import FlaskIntegration
 from sentry_sdk.integrations.redis import RedisIntegration
 from sentry_sdk.integrations.rq import RqIntegration
 
+from renku.core.metadata.database import database_snapshots
 from renku.service.cache import cache
-from renku.service.config import CACHE_DIR, HTTP_SERVER_ERROR, SENTRY_ENABLED, SENTRY_SAMPLERATE, SERVICE_PREFIX
+from renku.service.config import (
+    CACHE_DIR,
+    DATABASE_SNAPSHOTS_SIZE_BYTES,
+    HTTP_SERVER_ERROR,
+    SENTRY_ENABLED,
+    SENTRY_SAMPLERATE,
+    SERVICE_PREFIX,
+)
 from renku.service.logger import service_log
 from renku.service.serializers.headers import JWT_TOKEN_SECRET
 from renku.service.utils.json_encoder import SvcJSONEncoder
@@ -69,6 +77,18 @@ def create_app():
 
     app.config["cache"] = cache
 
+    database_snapshots.max_bytes = DATABASE_SNAPSHOTS_SIZE_BYTES
+
+    @app.before_request
+    def defer_database_snapshots_release():
+        """Keep databases out of the snapshot pool while their objects are used to build the response."""
+        database_snapshots.begin_deferred_release()
+
+    @app.teardown_request
+    def release_database_snapshots(exception=None):
+        """Share databases that were used by the request with later requests."""
+        database_snapshots.end_deferred_release()
+
     build_routes(app)
 
     @app.route(SERVICE_PREFIX)
@@ -16,8 +16,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Cleanup jobs."""
+import os
+
 from renku.service.cache import ServiceCache
 from renku.service.cache.models.job import USER_JOB_STATE_ENQUEUED, USER_JOB_STATE_IN_PROGRESS
+from renku.service.controllers.utils.file_upload import purge_stale_chunks
+from renku.service.controllers.utils.project_mirror import purge_unused_mirrors
 from renku.service.logger import worker_log
 
 
@@ -41,6 +45,8 @@ def cache_files_cleanup():
             elif not file.exists():
                 file.delete()
 
+    purge_stale_chunks(int(os.getenv("RENKU_SVC_CLEANUP_TTL_FILES", 1800)))
+
 
 def cache_project_cleanup():
     """Cache project a cleanup job."""
@@ -61,3 +67,5 @@ def cache_project_cleanup():
                 project.purge()
             elif not project.exists():
                 project.delete()
+
+    purge_unused_mirrors()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Project fetch jobs."""
+import portalocker
+
+from renku.core import errors
+from renku.service.cache import ServiceCache
+from renku.service.cache.models.project import Project
+from renku.service.config import PROJECT_FETCH_TIME, PROJECT_KEEP_FRESH_TIME
+from renku.service.controllers.utils.project_clone import fetch_project, reset_project
+from renku.service.jobs.contexts import enqueue_retry
+from renku.service.jobs.queues import FETCH_QUEUE_PROJECTS, WorkerQueues
+from renku.service.logger import worker_log
+
+
+def _get_fetch_key(project_id):
+    """Key that marks a pending fetch of a project."""
+    return f"{FETCH_QUEUE_PROJECTS}.{project_id}"
+
+
+def enqueue_project_fetch(project):
+    """Enqueue a fetch of a project unless one is already pending."""
+    key = _get_fetch_key(project.project_id)
+    if not WorkerQueues.connection.set(key, 1, nx=True, ex=PROJECT_KEEP_FRESH_TIME):
+        return
+
+    try:
+        with enqueue_retry(FETCH_QUEUE_PROJECTS) as queue:
+            queue.enqueue(project_fetch, project.project_id)
+    except Exception:
+        WorkerQueues.connection.delete(key)
+        raise
+
+
+def project_fetch(project_id):
+    """Fetch remote changes of a cached project."""
+    try:
+        try:
+            project = Project.load(project_id)
+        except KeyError:
+            return
+
+        if not project.abs_path.exists() or project.fetch_age < PROJECT_FETCH_TIME:
+            return
+
+        worker_log.debug(f"fetching project {project.project_id}:{project.name}")
+
+        try:
+            # NOTE: Fetching doesn't change the working tree, so, only writers are blocked while it runs
+            with project.read_lock():
+                remote_branch = fetch_project(project)
+            with project.write_lock():
+                reset_project(project, remote_branch)
+        except (errors.GitError, portalocker.LockException, portalocker.AlreadyLocked) as e:
+            worker_log.warning(f"cannot fetch project {project.project_id}:{project.name}: {e}")
+    finally:
+        WorkerQueues.connection.delete(_get_fetch_key(project_id))
+
+
+def cache_project_fetch():
+    """Keep recently used projects up to date with their remotes."""
+    cache = ServiceCache()
+    worker_log.debug("executing cache projects fetch")
+
+    for project in cache.get_recently_used_projects(PROJECT_KEEP_FRESH_TIME):
+        if project.exists() and project.fetch_age >= PROJECT_FETCH_TIME:
+            enqueue_project_fetch(project)
@@ -25,10 +25,12 @@ from renku.service.cache.config import REDIS_NAMESPACE
 
 CLEANUP_QUEUE_FILES = f"{REDIS_NAMESPACE}.cache.cleanup.files"
 CLEANUP_QUEUE_PROJECTS = f"{REDIS_NAMESPACE}.cache.cleanup.projects"
+FETCH_QUEUE_PROJECTS = f"{REDIS_NAMESPACE}.cache.fetch.projects"
 
 DATASETS_JOB_QUEUE = f"{REDIS_NAMESPACE}.datasets.jobs"
 MIGRATIONS_JOB_QUEUE = f"{REDIS_NAMESPACE}.project.migrations"
 GRAPH_JOB_QUEUE = f"{REDIS_NAMESPACE}.graph.jobs"
+UPLOADS_JOB_QUEUE = f"{REDIS_NAMESPACE}.uploads.jobs"
 
 DELAYED_CTRL_DATASETS_CREATE = f"{REDIS_NAMESPACE}.delayed.ctrl.DatasetsCreateCtrl"
 DELAYED_CTRL_DATASETS_ADD = f"{REDIS_NAMESPACE}.delayed.ctrl.DatasetsAddFileCtrl"
@@ -43,9 +45,11 @@ DELAYED_CTRL_CONFIG_SET = f"{REDIS_NAMESPACE}.delayed.ctrl.SetConfigCtrl"
 QUEUES = [
     CLEANUP_QUEUE_FILES,
     CLEANUP_QUEUE_PROJECTS,
+    FETCH_QUEUE_PROJECTS,
     DATASETS_JOB_QUEUE,
     MIGRATIONS_JOB_QUEUE,
     GRAPH_JOB_QUEUE,
+    UPLOADS_JOB_QUEUE,
     DELAYED_CTRL_DATASETS_CREATE,
     DELAYED_CTRL_DATASETS_ADD,
     DELAYED_CTRL_DATASETS_REMOVE,
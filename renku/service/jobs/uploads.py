@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Upload jobs."""
+from renku.core import errors
+from renku.service.config import CACHE_UPLOADS_PATH
+from renku.service.controllers.utils.file_upload import list_unpacked_files, unpack_archive
+from renku.service.logger import worker_log
+from renku.service.serializers.cache import FileUploadResponseRPC
+from renku.service.views.decorators import requires_cache
+
+PROGRESS_UPDATE_INTERVAL = 100
+
+
+@requires_cache
+def unpack_archive_job(cache, user, user_job_id, relative_path):
+    """Unpack an uploaded archive and register its files."""
+    user = cache.ensure_user(user)
+    worker_log.debug(f"executing unpack archive job for {user.user_id}:{user.fullname}")
+
+    user_job = cache.get_job(user, user_job_id)
+    user_job.in_progress()
+
+    try:
+        user_cache_dir = CACHE_UPLOADS_PATH / user.user_id
+        file_path = user_cache_dir / relative_path
+
+        user_job.extras = {"description": f"Unpacking {file_path.name}", "total_size": file_path.stat().st_size}
+        user_job.save()
+
+        unpack_dir = unpack_archive(file_path)
+
+        user_job.extras["description"] = f"Indexing files of {file_path.name}"
+        files = []
+        for file in list_unpacked_files(unpack_dir, user_cache_dir):
+            files.append(file)
+            if len(files) % PROGRESS_UPDATE_INTERVAL == 0:
+                user_job.extras["progress_files"] = len(files)
+                user_job.save()
+
+        files = cache.set_files(user, files)
+
+        user_job.extras["progress_files"] = len(files)
+        user_job.ctrl_result = FileUploadResponseRPC().dump({"result": {"files": files}})
+        user_job.complete()
+        worker_log.debug("job completed")
+    except (OSError, errors.RenkuException) as exp:
+        user_job.fail_job(str(exp))
+
+        # Reraise exception, so we see trace in job metadata
+        # and in metrics as failed job.
+        raise exp
@@ -23,7 +23,8 @@ from datetime import datetime
 from rq_scheduler import Scheduler
 
 from renku.service.jobs.cleanup import cache_files_cleanup, cache_project_cleanup
-from renku.service.jobs.queues import CLEANUP_QUEUE_FILES, CLEANUP_QUEUE_PROJECTS, WorkerQueues
+from renku.service.jobs.project import cache_project_fetch
+from renku.service.jobs.queues import CLEANUP_QUEUE_FILES, CLEANUP_QUEUE_PROJECTS, FETCH_QUEUE_PROJECTS, WorkerQueues
 from renku.service.logger import DEPLOYMENT_LOG_LEVEL, scheduler_log
 
 
@@ -32,6 +33,8 @@ def schedule(connection=None):
     """Creates scheduler object."""
     cleanup_interval = int(os.getenv("RENKU_SVC_CLEANUP_INTERVAL", 60))
     scheduler_log.info(f"cleanup interval set to {cleanup_interval}")
+    fetch_interval = int(os.getenv("RENKU_SVC_FETCH_INTERVAL", 30))
+    scheduler_log.info(f"fetch interval set to {fetch_interval}")
 
     build_scheduler = Scheduler(connection=connection or WorkerQueues.connection, interval=cleanup_interval)
     build_scheduler.log = scheduler_log
@@ -56,6 +59,15 @@ def schedule(connection=None):
         result_ttl=cleanup_interval * 2,
     )
 
+    build_scheduler.schedule(
+        scheduled_time=datetime.utcnow(),
+        queue_name=FETCH_QUEUE_PROJECTS,
+        func=cache_project_fetch,
+        interval=fetch_interval,
+        timeout=fetch_interval - 1,  # NOTE: Ensure job times out before next job starts
+        result_ttl=fetch_interval * 2,
+    )
+
     scheduler_log.info(f"log level set to {DEPLOYMENT_LOG_LEVEL}")
     yield build_scheduler
 
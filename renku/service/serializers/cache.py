@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Renku service cache serializers."""
+import re
 import time
 import uuid
 from urllib.parse import urlparse
@@ -56,7 +57,7 @@ def extract_file(request):
         return file
 
 
-class FileUploadRequest(ArchiveSchema):
+class FileUploadRequest(ArchiveSchema, AsyncSchema):
     """Request schema for file upload."""
 
     override_existing = fields.Boolean(
@@ -64,12 +65,35 @@ class FileUploadRequest(ArchiveSchema):
         description="Overried files. Useful when extracting from archives.",
     )
 
+    chunked_id = fields.String(description="Id of a chunked upload. Chunks of the same file must use the same id.")
+    chunk_offset = fields.Integer(missing=0, description="Offset of the chunk in the file (in bytes).")
+    total_size = fields.Integer(description="Size of the whole file for chunked uploads (in bytes).")
+
+    @post_load
+    def validate_chunks(self, data, **kwargs):
+        """Validate chunked upload parameters."""
+        if "chunked_id" not in data:
+            return data
+
+        if not re.match(r"^[A-Za-z0-9_-]{1,64}$", data["chunked_id"]):
+            raise ValidationError("`chunked_id` must contain only letters, digits, '-' and '_'")
+        if data.get("total_size") is None or data["total_size"] < 0:
+            raise ValidationError("`total_size` is required for chunked uploads")
+        if data["chunk_offset"] < 0:
+            raise ValidationError("`chunk_offset` cannot be negative")
+
+        return data
+
 
 class FileUploadResponse(Schema):
     """Response schema for file upload."""
 
     files = fields.List(fields.Nested(FileDetailsSchema), required=True)
 
+    chunked_id = fields.String(description="Id of the chunked upload.")
+    received_size = fields.Integer(description="Number of bytes of a chunked upload that were received so far.")
+    job_id = fields.String(description="Id of the job that unpacks an uploaded archive.")
+
 
 class FileUploadResponseRPC(JsonRPCResponse):
     """RPC response schema for file upload response."""
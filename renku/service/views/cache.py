@@ -79,7 +79,9 @@ def upload_file_view(user_data, cache):
 
     ---
     post:
-      description: Upload a file or archive of files.
+      description: Upload a file or archive of files. Large files can be uploaded in chunks that share a
+        `chunked_id`; an interrupted upload is resumed from the `received_size` of the last response. Archives
+        are unpacked by a job when `is_delayed` is set.
       parameters:
         - in: query
           schema: FileUploadRequest
@@ -91,11 +91,12 @@ def job_details(user_data, cache, job_id):
     user = cache.ensure_user(user_data)
     job = cache.get_job(user, job_id)
 
-    if not job or not job.project_id:
+    if not job:
         return result_response(JobDetailsResponseRPC(), None)
 
     try:
-        job.project = cache.get_project(user, job.project_id)
+        if job.project_id:
+            job.project = cache.get_project(user, job.project_id)
     except ProjectNotFound:
         pass
 
@@ -612,6 +612,28 @@ def test_dataset_add_with_copy(tmpdir, runner, project, client, load_dataset_wit
         assert inode not in original_inodes
 
 
+def test_dataset_add_with_link(tmpdir, runner, project, client, load_dataset_with_injection):
+    """Test adding data to dataset with hard links."""
+    import os
+
+    new_file = tmpdir.join("file")
+    new_file.write("content")
+
+    result = runner.invoke(cli, ["dataset", "add", "--create", "--link", "my-dataset", str(new_file)])
+    assert 0 == result.exit_code, format_result_exception(result)
+
+    dataset = load_dataset_with_injection("my-dataset", client)
+    path = client.path / dataset.files[0].entity.path
+
+    assert not path.is_symlink()
+    assert os.path.samefile(path, str(new_file))
+    assert "content" == path.read_text()
+
+    result = runner.invoke(cli, ["dataset", "add", "--external", "--link", "my-dataset", str(new_file)])
+    assert 2 == result.exit_code
+    assert "Cannot use '--external' and '--link' together." in result.output
+
+
 @pytest.mark.serial
 def test_dataset_add_many(tmpdir, runner, project, client):
     """Test adding many files to dataset."""
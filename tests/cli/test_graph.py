@@ -112,3 +112,25 @@ def test_graph_export_strict_dataset(tmpdir, runner, project, client, format, su
 
     # check that all datasets are exported
     assert 2 == result.output.count("http://schema.org/Dataset")
+
+
+def test_graph_export_since(runner, client, run):
+    """Test exporting changes since a given commit."""
+    assert 0 == run(["run", "touch", "output1"])
+    since = client.repository.head.commit.hexsha
+    assert 0 == run(["run", "touch", "output2"])
+
+    result = runner.invoke(cli, ["graph", "export", "--since", since])
+
+    assert 0 == result.exit_code, format_result_exception(result)
+    assert "output2" in result.output
+    assert "output1" not in result.output
+
+    result = runner.invoke(cli, ["graph", "export", "--since", since, "--since-last"])
+
+    assert 2 == result.exit_code, format_result_exception(result)
+
+    result = runner.invoke(cli, ["graph", "export", "--since", "0" * 40])
+
+    assert 2 == result.exit_code, format_result_exception(result)
+    assert "isn't an ancestor of HEAD" in result.output
@@ -460,3 +460,31 @@ def test_migrate_sets_correct_creation_date_for_non_mutated_datasets(
     dataset = load_dataset_with_injection("mixed", old_dataset_project)
 
     assert "2020-08-10 23:35:56+02:00" == dataset.date_created.isoformat(" ")
+
+
+@pytest.mark.migration
+def test_interrupted_migration_resumes(isolated_runner, old_project, mocker):
+    """Test an interrupted metadata migration continues after the last processed commit."""
+    from renku.core.management.migrations import m_0009__new_metadata_storage as migration
+
+    process_datasets = migration._process_datasets
+    processed_commits = []
+
+    def interrupt_after_first_commit(commit, **kwargs):
+        if processed_commits:
+            raise KeyboardInterrupt
+        processed_commits.append(commit.hexsha)
+        return process_datasets(commit=commit, **kwargs)
+
+    mocker.patch.object(migration, "_process_datasets", interrupt_after_first_commit)
+
+    result = isolated_runner.invoke(cli, ["migrate", "--strict"])
+    assert 0 != result.exit_code
+
+    mocker.stopall()
+
+    result = isolated_runner.invoke(cli, ["migrate", "--strict", "--skip-template-update"])
+    assert 0 == result.exit_code, format_result_exception(result)
+    assert f"Resuming migration after commit {processed_commits[0]}" in result.output
+    assert not (old_project.path / ".git" / migration.MIGRATION_CHECKPOINT_FILENAME).exists()
+    assert not old_project.is_dirty(untracked_files=True)
@@ -64,3 +64,25 @@ def test_doi_serializer():
 
     with pytest.raises(RenkuImportError):
         DOIProvider._serialize(data)
+
+
+def test_import_settings():
+    """Check import concurrency and rate limit are read from provider's configuration."""
+    from renku.core.commands.providers.dataverse import DataverseProvider
+    from renku.core.errors import ConfigurationError
+
+    class Client:
+        def __init__(self, values):
+            self.values = values
+
+        def get_value(self, section, key):
+            assert "dataverse" == section
+            return self.values.get(key)
+
+    provider = DataverseProvider()
+
+    assert (4, 1.0) == provider.get_import_settings(Client({}))
+    assert (8, None) == provider.get_import_settings(Client({"import_concurrency": "8", "import_rate_limit": "0"}))
+
+    with pytest.raises(ConfigurationError):
+        provider.get_import_settings(Client({"import_concurrency": "many"}))
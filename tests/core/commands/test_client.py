@@ -78,7 +78,6 @@ def test_safe_class_attributes(tmpdir):
         "_CMD_STORAGE_MIGRATE_IMPORT",
         "_CMD_STORAGE_PULL",
         "_CMD_STORAGE_STATUS",
-        "_CMD_STORAGE_TRACK",
         "_CMD_STORAGE_UNTRACK",
         "_LFS_HEADER",
         "_database",
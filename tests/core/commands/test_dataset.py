@@ -235,3 +235,56 @@ def test_uppercase_dataset_name_is_valid():
     """Test dataset name can have uppercase characters."""
     assert is_dataset_name_valid("UPPER-CASE")
     assert is_dataset_name_valid("Pascal-Case")
+
+
+def test_get_remote_checksums(git_repository):
+    """Test checksums of files in a remote repository are read from a single tree listing."""
+    from renku.core.management.datasets import DatasetsApiMixin
+
+    checksums = DatasetsApiMixin._get_remote_checksums(git_repository, ["A", "B", "data/X", "./A"])
+
+    assert git_repository.get_object_hash("A", revision="HEAD") == checksums["A"] == checksums["./A"]
+    assert git_repository.get_object_hash("data/X", revision="HEAD") == checksums["data/X"]
+    assert checksums["B"] is None
+
+
+def test_get_unchanged_files(tmp_path):
+    """Test files of an imported dataset that have the same URL or checksum in the provider's record are found."""
+    import hashlib
+    from types import SimpleNamespace
+
+    from renku.core.commands.dataset import _get_unchanged_files
+    from renku.core.metadata.immutable import DynamicProxy
+    from renku.core.models.dataset import DatasetFile
+    from renku.core.models.entity import Entity
+
+    client = SimpleNamespace(path=tmp_path, data_dir="data")
+    (tmp_path / "data" / "my-data").mkdir(parents=True)
+
+    dataset_files = []
+    for name in ("same-url", "same-checksum", "changed"):
+        (tmp_path / "data" / "my-data" / name).write_text(name)
+        entity = Entity(checksum="0" * 40, path=f"data/my-data/{name}")
+        dataset_files.append(DatasetFile(entity=entity, source=f"https://example.com/v1/{name}"))
+    dataset = Dataset(name="my-data", dataset_files=dataset_files)
+
+    def file_info(name, version, checksum=""):
+        proxy = DynamicProxy(DatasetFile(entity=None, source=f"https://example.com/{version}/{name}"))
+        proxy.filename = name
+        proxy.checksum = checksum
+        return proxy
+
+    files = [
+        file_info("same-url", "v1"),
+        file_info("same-checksum", "v2", f"md5:{hashlib.md5(b'same-checksum').hexdigest()}"),
+        file_info("changed", "v2", f"md5:{hashlib.md5(b'new content').hexdigest()}"),
+        file_info("new", "v2"),
+    ]
+
+    unchanged_files = _get_unchanged_files(client, dataset, files, extract=False)
+
+    assert {"https://example.com/v1/same-url", "https://example.com/v2/same-checksum"} == set(unchanged_files)
+    assert "data/my-data/same-checksum" == unchanged_files["https://example.com/v2/same-checksum"].entity.path
+    assert "https://example.com/v2/same-checksum" == unchanged_files["https://example.com/v2/same-checksum"].source
+    assert dataset_files[1].id != unchanged_files["https://example.com/v2/same-checksum"].id
+    assert dataset_files[0] is unchanged_files["https://example.com/v1/same-url"]
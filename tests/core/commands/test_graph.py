@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017-2021- Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Graph export tests."""
+
+import json
+
+from rdflib import ConjunctiveGraph
+
+from renku.core.commands.format.graph import jsonld, jsonld_stream, nt_stream
+from renku.core.commands.graph import _convert_entities_to_graph, _get_last_exported_commit, _set_last_exported_commit
+from renku.core.management.interface.activity_gateway import IActivityGateway
+from renku.core.management.interface.database_dispatcher import IDatabaseDispatcher
+from renku.core.management.interface.plan_gateway import IPlanGateway
+from renku.core.metadata.database import Database
+from renku.core.metadata.gateway.activity_gateway import ActivityGateway
+from renku.core.metadata.gateway.database_gateway import initialize_database
+from renku.core.metadata.gateway.plan_gateway import PlanGateway
+from renku.core.models.project import Project
+from renku.core.models.provenance.agent import Person
+from tests.core.fixtures.core_database import DummyDatabaseDispatcher
+from tests.utils import create_dummy_activity
+
+
+def _get_entities():
+    project = Project(
+        id="/projects/me/my-project", name="my-project", creator=Person(name="me", email="me@example.com")
+    )
+    plan = "plan"
+    activities = [
+        create_dummy_activity(plan=plan, usages=["a"], generations=["b"]),
+        create_dummy_activity(plan=plan, usages=["b"], generations=["c"]),
+    ]
+
+    return project, [*activities, project]
+
+
+def test_streaming_jsonld_export(capsys):
+    """Test streaming JSON-LD export gives the same graph as non-streaming export."""
+    project, entities = _get_entities()
+
+    graph = list(_convert_entities_to_graph(entities, project))
+    assert 3 == len(graph)
+
+    jsonld([node for nodes in graph for node in nodes])
+    expected = ConjunctiveGraph().parse(data=capsys.readouterr().out, format="json-ld")
+
+    jsonld_stream(iter(graph))
+    output = capsys.readouterr().out
+    nodes = json.loads(output)
+
+    assert len(nodes) == len({json.dumps(n, sort_keys=True) for n in nodes})
+    assert set(expected) == set(ConjunctiveGraph().parse(data=output, format="json-ld"))
+
+
+def test_streaming_nt_export(capsys):
+    """Test streaming N-Triples export in batches."""
+    project, entities = _get_entities()
+
+    graph = list(_convert_entities_to_graph(entities, project))
+
+    jsonld([node for nodes in graph for node in nodes])
+    expected = ConjunctiveGraph().parse(data=capsys.readouterr().out, format="json-ld")
+
+    nt_stream(iter(graph), batch_size=2)
+    output = capsys.readouterr().out
+
+    assert set(expected) == set(ConjunctiveGraph().parse(data=output, format="nt"))
+
+
+def test_streaming_jsonld_export_empty_graph(capsys):
+    """Test streaming an empty graph."""
+    jsonld_stream(iter([]))
+
+    assert [] == json.loads(capsys.readouterr().out)
+
+
+def test_parallel_graph_export(tmp_path, injection_manager):
+    """Test serializing entities in multiple processes gives the same output as serializing them in one process."""
+    project, _ = _get_entities()
+    database = Database.from_path(tmp_path)
+    initialize_database(database)
+    bindings = {
+        "bindings": {IDatabaseDispatcher: DummyDatabaseDispatcher(database)},
+        "constructor_bindings": {IActivityGateway: lambda: ActivityGateway(), IPlanGateway: lambda: PlanGateway()},
+    }
+
+    with injection_manager(bindings):
+        activity_gateway = ActivityGateway()
+        for index in range(20):
+            activity_gateway.add(
+                create_dummy_activity(plan=f"plan-{index % 3}", usages=[f"in-{index}"], generations=[f"out-{index}"])
+            )
+        database.commit()
+
+        # NOTE: Unsaved objects are serialized in the main process
+        entities = [*activity_gateway.get_all_activities(), project]
+
+        assert not any(a._p_changed for a in entities[:-1])
+
+        parallel = list(_convert_entities_to_graph(entities, project, jobs=2))
+        serial = list(_convert_entities_to_graph(entities, project, jobs=1))
+
+    assert 21 == len(serial)
+    assert serial == parallel
+
+
+def test_last_exported_commit(git_repository, tmp_path, mocker):
+    """Test storing the last commit exported with ``since_last``."""
+    client = mocker.MagicMock(renku_path=tmp_path / ".renku", CACHE="cache", repository=git_repository)
+
+    assert _get_last_exported_commit(client) is None
+
+    _set_last_exported_commit(client, "a150977a3d2f454e5964ce7ce41e36f34e978086")
+
+    assert "a150977a3d2f454e5964ce7ce41e36f34e978086" == _get_last_exported_commit(client)
+
+    # NOTE: A commit that is not an ancestor of HEAD is ignored
+    git_repository.checkout("a150977")
+    _set_last_exported_commit(client, "556dc540307a6503e9ecc20ad13c66221c0cbb98")
+
+    assert _get_last_exported_commit(client) is None
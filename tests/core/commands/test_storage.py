@@ -70,6 +70,8 @@ def test_lfs_storage_clean(runner, project, client_with_remote):
     assert 0 == result.exit_code, format_result_exception(result)
 
     assert "version https://git-lfs.github.com/spec/v1" in (client.path / "tracked").read_text()
+    # NOTE: Cleaned file is the same pointer that is committed
+    assert "tracked" not in [c.a_path for c in client.repository.staged_changes]
 
     lfs_objects = []
     for _, _, files in os.walk(str(client.path / ".git" / "lfs" / "objects")):
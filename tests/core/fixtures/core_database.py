@@ -20,7 +20,7 @@
 import copy
 import datetime
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 import pytest
 
@@ -76,7 +76,9 @@ class DummyDatabaseDispatcher:
         """Get the currently active database."""
         return self.database
 
-    def push_database_to_stack(self, path: Union[Path, str], commit: bool = False) -> None:
+    def push_database_to_stack(
+        self, path: Union[Path, str], commit: bool = False, revision: Optional[str] = None
+    ) -> None:
         """Create and push a new database to the stack."""
         pass
 
@@ -24,6 +24,8 @@ from renku.core import errors
 from renku.core.management.client import LocalClient
 from renku.core.management.command_builder.client_dispatcher import ClientDispatcher
 from renku.core.management.command_builder.database_dispatcher import DatabaseDispatcher
+from renku.core.metadata.database import database_snapshots
+from renku.core.utils.contexts import chdir
 
 
 def test_client_dispatcher(tmpdir):
@@ -106,3 +108,64 @@ def test_database_dispatcher(tmpdir):
 
     with pytest.raises(errors.ConfigurationError):
         dispatcher.current_database
+
+
+def test_database_dispatcher_snapshots(tmpdir, monkeypatch):
+    """Test read-only databases of the same revision are reused until the database is written."""
+    monkeypatch.setattr(database_snapshots, "max_bytes", 1024 * 1024)
+    path = Path(tmpdir)
+
+    dispatcher = DatabaseDispatcher()
+    dispatcher.push_database_to_stack(path, commit=True)
+    dispatcher.pop_database()
+
+    dispatcher.push_database_to_stack(path, revision="HEAD-1")
+    database = dispatcher.current_database
+    dispatcher.pop_database()
+
+    dispatcher.push_database_to_stack(path, revision="HEAD-1")
+    assert database is dispatcher.current_database
+
+    # NOTE: A snapshot isn't shared while it's in use
+    dispatcher.push_database_to_stack(path, revision="HEAD-1")
+    assert database is not dispatcher.current_database
+
+    dispatcher.finalize_dispatcher()
+
+    dispatcher.push_database_to_stack(path, revision="HEAD-2")
+    assert database is not dispatcher.current_database
+    dispatcher.pop_database()
+
+    dispatcher.push_database_to_stack(path, commit=True)
+    dispatcher.pop_database()
+
+    assert 0 == len(database_snapshots)
+
+
+def test_database_dispatcher_snapshots_deferred_release(tmpdir, monkeypatch):
+    """Test databases aren't shared while objects loaded from them may still be in use."""
+    monkeypatch.setattr(database_snapshots, "max_bytes", 1024 * 1024)
+    path = Path(tmpdir)
+
+    dispatcher = DatabaseDispatcher()
+    dispatcher.push_database_to_stack(path, commit=True)
+    dispatcher.pop_database()
+
+    with database_snapshots.deferred_release():
+        dispatcher.push_database_to_stack(path, revision="HEAD")
+        database = dispatcher.current_database
+        dispatcher.pop_database()
+
+        assert 0 == len(database_snapshots)
+
+    assert 1 == len(database_snapshots)
+
+    # NOTE: A database that is opened with a relative path is found with its resolved path
+    with chdir(path.parent):
+        dispatcher.push_database_to_stack(path.name, revision="HEAD")
+        assert database is dispatcher.current_database
+        dispatcher.pop_database()
+
+    database_snapshots.invalidate(path)
+
+    assert 0 == len(database_snapshots)
@@ -46,3 +46,23 @@ def test_renku_in_lfs_migrate_exclude_filter(client):
     _, excludes, _ = client.get_lfs_migrate_filters()
 
     assert excludes[1].endswith(".renku")
+
+
+def test_track_paths_in_storage_updates_gitattributes(client, no_lfs_size_limit):
+    """Test tracked paths are added to ``.gitattributes`` the same way as ``git lfs track``."""
+    (client.path / ".gitattributes").write_text("existing filter=lfs diff=lfs merge=lfs -text")
+    (client.path / "directory").mkdir()
+    for path in ["existing", "with space", "#hash", "directory/file"]:
+        (client.path / path).write_text("123")
+
+    client.track_paths_in_storage("existing", "with space", "#hash", "directory", "with space")
+
+    assert [
+        "existing filter=lfs diff=lfs merge=lfs -text",
+        "with[[:space:]]space filter=lfs diff=lfs merge=lfs -text",
+        "\\#hash filter=lfs diff=lfs merge=lfs -text",
+        "directory/** filter=lfs diff=lfs merge=lfs -text",
+    ] == (client.path / ".gitattributes").read_text().splitlines()
+    attributes = client.repository.get_attributes("existing", "with space", "#hash", "directory/file")
+    assert {"lfs"} == {a.get("filter") for a in attributes.values()}
+    assert 4 == len(attributes)
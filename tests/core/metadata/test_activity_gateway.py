@@ -16,10 +16,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Test activity database gateways."""
-
+from datetime import datetime, timedelta
 
 from renku.core.metadata.gateway.activity_gateway import ActivityGateway
 from renku.core.models.workflow.plan import Plan
+from renku.core.utils.metadata import filter_overridden_activities
 from tests.utils import create_dummy_activity
 
 
@@ -117,3 +118,62 @@ def test_activity_gateway_upstream_activity_chains(dummy_database_injection_mana
         assert {(r3.id,), (r2.id,), (r2.id, r1.id)} == {tuple(a.id for a in chain) for chain in downstream_chains}
 
         assert [] == activity_gateway.get_upstream_activity_chains(r7)
+
+
+def test_activity_gateway_related_paths(dummy_database_injection_manager):
+    """Test activities are linked only when their paths are equal or nested."""
+    parent = create_dummy_activity(plan="parent", generations=["data/"])
+    child = create_dummy_activity(plan="child", usages=["data/raw/file"], generations=["results"])
+    sibling = create_dummy_activity(plan="sibling", usages=["data2/file", "dat"])
+    nested = create_dummy_activity(plan="nested", usages=["results/plots/a.png"])
+    everything = create_dummy_activity(plan="everything", usages=["."])
+
+    with dummy_database_injection_manager(None):
+        activity_gateway = ActivityGateway()
+
+        activity_gateway.add(sibling)
+        activity_gateway.add(nested)
+        activity_gateway.add(everything)
+        activity_gateway.add(parent)
+        activity_gateway.add(child)
+
+        downstream = activity_gateway.get_downstream_activities(parent, max_depth=1)
+        assert {child.id, everything.id} == {a.id for a in downstream}
+
+        downstream = activity_gateway.get_downstream_activities(child, max_depth=1)
+        assert {nested.id, everything.id} == {a.id for a in downstream}
+
+
+def test_activity_gateway_latest_activities(dummy_database_injection_manager):
+    """Test latest activities are maintained when adding activities."""
+    now = datetime.utcnow()
+    r1 = create_dummy_activity(plan="r1", generations=["a", "b"], ended_at_time=now - timedelta(hours=5))
+    r2 = create_dummy_activity(plan="r2", generations=["a"], ended_at_time=now - timedelta(hours=4))
+    r3 = create_dummy_activity(plan="r3", generations=["c"], ended_at_time=now - timedelta(hours=3))
+    r4 = create_dummy_activity(plan="r4", generations=["c", "d"], ended_at_time=now - timedelta(hours=2))
+    r5 = create_dummy_activity(plan="r5", generations=["b"], ended_at_time=now - timedelta(hours=1))
+    r6 = create_dummy_activity(plan="r6", generations=["b"], ended_at_time=now)
+
+    with dummy_database_injection_manager(None):
+        activity_gateway = ActivityGateway()
+
+        for activity in (r1, r2, r3, r4, r5, r6):
+            activity_gateway.add(activity)
+
+        latest = activity_gateway.get_latest_activities()
+
+        assert {r1.id, r2.id, r4.id, r6.id} == {a.id for a in latest}
+        assert {a.id for a in filter_overridden_activities([r1, r2, r3, r4, r5, r6])} == {a.id for a in latest}
+
+        database = activity_gateway.database_dispatcher.current_database
+        database.remove_root_object("latest-activities")
+        database.commit()
+
+        # NOTE: Latest activities are computed without modifying a database that doesn't have the index
+        assert {r1.id, r2.id, r4.id, r6.id} == {a.id for a in activity_gateway.get_latest_activities()}
+        assert not database.is_modified
+
+        activity_gateway.add_latest_activities_index()
+
+        assert database.is_modified
+        assert {r1.id, r2.id, r4.id, r6.id} == {a.id for a in database["latest-activities"].values()}
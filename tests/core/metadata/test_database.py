@@ -18,11 +18,13 @@
 """Test metadata Database."""
 
 import pytest
-from persistent import GHOST, UPTODATE
+from persistent import CHANGED, GHOST, UPTODATE
 from persistent.list import PersistentList
 from persistent.mapping import PersistentMapping
 
-from renku.core.metadata.database import PERSISTED, Database
+from renku.core.metadata.database import PERSISTED, Database, Storage
+from renku.core.metadata.gateway.database_gateway import initialize_database
+from renku.core.models.dataset import Dataset, DatasetFile
 from renku.core.models.entity import Entity
 from renku.core.models.provenance.activity import Activity, Association, Usage
 from renku.core.models.workflow.plan import Plan
@@ -416,3 +418,186 @@ def test_database_immutable_object(database):
 
     assert isinstance(usage_1, Usage)
     assert usage_1 is usage_2
+
+
+def test_database_packed_storage(tmp_path):
+    """Test objects can be loaded after moving them into a pack."""
+    storage = Storage(tmp_path)
+    database = Database(storage=storage)
+    initialize_database(database)
+
+    ids = [f"/activities/{i}" for i in range(10)]
+    for id in ids:
+        database["activities"].add(Activity(id=id))
+    database.commit()
+
+    assert storage.repack() >= 10
+    assert storage.is_packed
+    assert not list(tmp_path.glob("??/??/*"))
+
+    database = Database(storage=Storage(tmp_path))
+
+    assert set(ids) == {a.id for a in database["activities"].values()}
+
+
+def test_database_packed_storage_loose_objects_precedence(tmp_path):
+    """Test objects stored after packing are loaded from loose files and are added to the pack on repack."""
+    storage = Storage(tmp_path)
+    database = Database(storage=storage)
+    initialize_database(database)
+
+    database["activities"].add(Activity(id="/activities/1"))
+    database.commit()
+    storage.repack()
+
+    database = Database(storage=storage)
+    database["activities"].add(Activity(id="/activities/2"))
+    database.commit()
+
+    oid = Database.hash_id("/activities/2")
+    assert (tmp_path / oid[0:2] / oid[2:4] / oid).exists()
+    assert {"/activities/1", "/activities/2"} == {a.id for a in Database(storage=storage)["activities"].values()}
+
+    storage.repack()
+    assert not list(tmp_path.glob("??/??/*"))
+    assert not (tmp_path / oid[0:2] / oid[2:4] / oid).exists()
+    assert storage.exists(oid)
+
+
+def test_database_unpack_storage(tmp_path):
+    """Test converting a packed storage back to loose files."""
+    storage = Storage(tmp_path)
+    database = Database(storage=storage)
+    initialize_database(database)
+
+    database["activities"].add(Activity(id="/activities/1"))
+    database.commit()
+    storage.repack()
+
+    storage.unpack()
+    assert not storage.is_packed
+    assert not storage.pack_path.exists()
+
+    oid = Database.hash_id("/activities/1")
+    assert (tmp_path / oid[0:2] / oid[2:4] / oid).exists()
+    assert "/activities/1" == Database(storage=Storage(tmp_path))["activities"]["/activities/1"].id
+
+
+def test_database_cache_evicts_objects(database):
+    """Test least recently used objects become ghosts when the cache is full."""
+    database, storage = database
+
+    ids = [f"/activities/{i}" for i in range(10)]
+    for id in ids:
+        database["activities"].add(Activity(id=id))
+    database.commit()
+
+    database = Database(storage=storage, cache_size=3)
+    activities = [database["activities"][id] for id in ids]
+    for activity in activities:
+        assert activity.id  # NOTE: Load objects' state
+
+    assert database.cache_statistics["evictions"] > 0
+    assert GHOST == activities[0]._p_state
+    assert UPTODATE == activities[-1]._p_state
+
+    # NOTE: Ghosts are reloaded when accessed and keep their identity
+    assert ids[0] == activities[0].id
+    assert UPTODATE == activities[0]._p_state
+    assert activities[0] is database["activities"][ids[0]]
+
+
+def test_database_cache_does_not_evict_modified_objects(database):
+    """Test modified objects are not turned into ghosts."""
+    database, storage = database
+    database.add_index(name="collections", object_type=PersistentList)
+    database["collections"].add(PersistentList(["a"]), key="list")
+    for i in range(5):
+        database["activities"].add(Activity(id=f"/activities/{i}"))
+    database.commit()
+
+    database = Database(storage=storage, cache_size=0)
+    p_list = database["collections"]["list"]
+    p_list.append("b")
+
+    for i in range(5):
+        assert database["activities"][f"/activities/{i}"].id
+
+    assert database.cache_statistics["evictions"] > 0
+    assert CHANGED == p_list._p_state
+    assert ["a", "b"] == list(p_list)
+
+
+def test_database_cache_statistics(database):
+    """Test database cache hit and miss counters."""
+    database, storage = database
+
+    database["activities"].add(Activity(id="/activities/0"))
+    database.commit()
+
+    database = Database(storage=storage)
+    oid = Database.hash_id("/activities/0")
+
+    database.get(oid)
+    misses = database.cache_statistics["misses"]
+    database.get(oid)
+
+    assert misses == database.cache_statistics["misses"]
+    assert database.cache_statistics["hits"] > 0
+
+
+def test_database_dataset_files_are_shared(database):
+    """Test a new version of a dataset stores only the changed parts of its files."""
+    database, storage = database
+
+    files = [DatasetFile(entity=Entity(checksum="42", path=f"data/my-data/{i:04}")) for i in range(2000)]
+    dataset = Dataset(name="my-data", dataset_files=[])
+    dataset.add_or_update_files(files)
+    database["datasets"].add(dataset)
+    database.commit()
+
+    database = Database(storage=storage)
+    dataset = database["datasets"]["my-data"]
+    new_dataset = dataset.copy()
+    new_dataset.add_or_update_files(DatasetFile(entity=Entity(checksum="43", path="data/my-data/0100")))
+    new_dataset.unlink_file("data/my-data/1500")
+    new_dataset.update_files_from(dataset)
+    new_dataset.derive_from(dataset, creator=None)
+    database["datasets"].add(new_dataset)
+
+    stored_before = set(storage._files)
+    database.commit()
+    stored_objects = set(storage._files) - stored_before
+
+    # NOTE: Only the new dataset, its tree's root, and the two changed leaves are stored
+    assert 4 == len(stored_objects)
+    assert "43" == new_dataset.find_file("data/my-data/0100").entity.checksum
+    assert new_dataset.find_file("data/my-data/1500") is None
+    assert "data/my-data/1500" in {f.entity.path for f in new_dataset.dataset_files if f.is_removed()}
+    assert 1999 == len(new_dataset.files)
+    assert 2000 == len(dataset.files)
+    assert dataset.find_file("data/my-data/0300") is new_dataset.find_file("data/my-data/0300")
+
+    database = Database(storage=storage)
+    new_dataset = database["datasets"]["my-data"]
+
+    assert 1999 == len(new_dataset.files)
+    assert "43" == new_dataset.find_file("data/my-data/0100").entity.checksum
+
+
+def test_database_dataset_files_from_list(database):
+    """Test datasets that store files as a list are loaded."""
+    database, storage = database
+
+    file = DatasetFile(entity=Entity(checksum="42", path="data/my-data/file"))
+    dataset = Dataset(name="my-data", dataset_files=[file])
+    database["datasets"].add(dataset)
+    database.commit()
+
+    data = storage._files[dataset._p_oid]
+    data["dataset_files"] = [database._writer._serialize_helper(file)]
+    del data["_dataset_files"]
+
+    dataset = Database(storage=storage)["datasets"]["my-data"]
+
+    assert "data/my-data/file" == dataset.find_file("data/my-data/file").entity.path
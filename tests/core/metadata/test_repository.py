@@ -147,6 +147,23 @@ def test_repository_iterate_commits_with_path(git_repository):
     assert [f"{LAST_COMMIT_SHA[:7]}", "556dc54", f"{FIRST_COMMIT_SHA[:7]}"] == [c.hexsha[:7] for c in commits]
 
 
+def test_repository_get_changed_paths(git_repository):
+    """Test getting added and modified paths in a range of commits with a single diff."""
+    assert {"A", "D", "E", "F", "G", "data/X"} == set(git_repository.get_changed_paths(f"{FIRST_COMMIT_SHA}..HEAD"))
+    assert {"D"} == set(git_repository.get_changed_paths(f"{FIRST_COMMIT_SHA}..a150977", "D", "E"))
+    # NOTE: Only changes in commits that are reachable from the end of the range are included
+    assert {"E", "F"} == set(git_repository.get_changed_paths("a150977..556dc54"))
+    assert [] == git_repository.get_changed_paths("HEAD..HEAD")
+
+
+def test_repository_is_ancestor(git_repository):
+    """Test checking if a commit is an ancestor of another."""
+    assert git_repository.is_ancestor(FIRST_COMMIT_SHA)
+    assert git_repository.is_ancestor("HEAD", "HEAD")
+    assert not git_repository.is_ancestor("a150977", "556dc54")
+    assert not git_repository.is_ancestor("0" * 40)
+
+
 def test_repository_no_active_branch_when_detached(git_repository):
     """Test getting active branch when a repository is in detached HEAD state."""
     git_repository.run_git_command("checkout", "HEAD~")
@@ -229,6 +246,29 @@ def test_hash_directories(git_repository):
         Repository.hash_object("X")
 
 
+@pytest.mark.parametrize("cat_file_batch", ["1", "0"])
+def test_object_lookups(git_repository, monkeypatch, cat_file_batch):
+    """Test object lookups return the same result with and without ``cat-file`` co-processes."""
+    monkeypatch.setenv("RENKU_GIT_CAT_FILE_BATCH", cat_file_batch)
+    committed_object_hash = "e2466bab1aeb2df4e21c9b594c3249a75db2c263"
+
+    assert {"A": committed_object_hash, "B": None} == git_repository.get_object_hashes(["A", "B"], revision="HEAD")
+    assert {"A", "data"} <= set(git_repository.get_existing_paths_in_revision(["A", "B", "data"], revision="HEAD"))
+    assert "B" not in git_repository.get_existing_paths_in_revision(["A", "B", "data"], revision="HEAD")
+    assert git_repository.get_object_hash("B", revision=FIRST_COMMIT_SHA) is not None
+
+    content = (git_repository.path / "A").read_text()
+    (git_repository.path / "A").write_text("modified")
+
+    assert content == git_repository.get_raw_content(path="A", revision="HEAD")
+    assert content == git_repository.get_raw_content(path="A", checksum=committed_object_hash)
+    modified_object_hash = "d84012fbd8415354de6b29158b6e5e17c4fda70b"
+    assert [modified_object_hash, modified_object_hash] == Repository.hash_objects(["A", git_repository.path / "A"])
+
+    with pytest.raises(errors.ExportError):
+        git_repository.get_raw_content(path="B", revision="HEAD")
+
+
 def test_get_user_with_quotation_mark(git_repository):
     """Test quotation marks wrapping user/email are ignored."""
     config = git_repository.get_configuration(writable=True)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2018-2021- Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test checksum cache."""
+
+import os
+import time
+
+from renku.core.utils.checksum_cache import ChecksumCache
+
+
+def _make_old(path):
+    """Set modification time of a file to the past so that it is not racily cached."""
+    old_time = time.time() - 60
+    os.utime(path, (old_time, old_time))
+
+
+def test_checksum_cache_hashes_only_changed_files(data_repository, tmp_path, mocker):
+    """Test files are hashed again only if their stat data changes."""
+    _make_old(data_repository.path / "file1")
+    _make_old(data_repository.path / "dir1" / "file2")
+    expected = data_repository.get_object_hashes(paths=["file1", "dir1/file2"], revision="HEAD")
+
+    cache = ChecksumCache(tmp_path / "checksums.json")
+    assert expected == cache.get_object_hashes(data_repository, ["file1", "dir1/file2"])
+    cache.save()
+
+    get_object_hashes = mocker.spy(data_repository, "get_object_hashes")
+    cache = ChecksumCache(tmp_path / "checksums.json")
+
+    assert expected == cache.get_object_hashes(data_repository, ["file1", "dir1/file2"])
+    get_object_hashes.assert_not_called()
+
+    (data_repository.path / "file1").write_text("modified")
+    _make_old(data_repository.path / "file1")
+    cache.get_object_hashes(data_repository, ["file1", "dir1/file2"])
+
+    get_object_hashes.assert_called_once_with(paths=["file1"], revision="HEAD")
+
+
+def test_checksum_cache_does_not_cache_directories_and_recent_files(data_repository, tmp_path, monkeypatch):
+    """Test directories and recently modified files are not cached."""
+    monkeypatch.chdir(data_repository.path)
+    cache = ChecksumCache(tmp_path / "checksums.json")
+
+    hashes = cache.get_object_hashes(data_repository, ["dir1", "file1", "missing"])
+
+    assert hashes["dir1"] is not None
+    assert hashes["missing"] is None
+    assert {} == cache.entries
@@ -21,7 +21,8 @@ from typing import Optional
 
 import pytest
 
-from renku.core.utils.git import get_remote, push_changes
+from renku.core.models.entity import Collection
+from renku.core.utils.git import _split_joined_paths, get_entity_from_revision, get_remote, push_changes
 from tests.fixtures.config import IT_PROTECTED_REMOTE_REPO_URL, IT_REMOTE_NON_RENKU_REPO_URL
 from tests.utils import write_and_commit_file
 
@@ -48,6 +49,57 @@ def test_get_non_existing_remote(git_repository_with_multiple_remotes):
     assert get_remote(git_repository_with_multiple_remotes, url="non-existing") is None
 
 
+@pytest.mark.parametrize("revision", [None, "HEAD"])
+def test_get_entity_from_revision_for_directory(git_repository, revision):
+    """Test directory members get the same checksums as when resolved one at a time."""
+    write_and_commit_file(git_repository, "directory/file", "file")
+    write_and_commit_file(git_repository, "directory/sub-directory/.gitkeep", "")
+    write_and_commit_file(git_repository, "directory/sub-directory/another-file", "another-file")
+    (git_repository.path / "directory" / "file").write_text("modified")
+
+    collection = get_entity_from_revision(git_repository, "directory", revision=revision)
+
+    def assert_checksums(entity):
+        assert git_repository.get_object_hash(entity.path, revision=revision) == entity.checksum
+        if isinstance(entity, Collection):
+            for member in entity.members:
+                assert_checksums(member)
+
+    assert isinstance(collection, Collection)
+    assert {"directory/file", "directory/sub-directory"} == {str(m.path) for m in collection.members}
+    sub_directory = next(m for m in collection.members if isinstance(m, Collection))
+    assert ["directory/sub-directory/another-file"] == [str(m.path) for m in sub_directory.members]
+    assert_checksums(collection)
+
+
+def test_get_entity_from_revision_cache(git_repository):
+    """Test entities are cached only for a specific commit."""
+    write_and_commit_file(git_repository, "directory/file", "file")
+
+    assert get_entity_from_revision(git_repository, "directory", "HEAD") is get_entity_from_revision(
+        git_repository, "directory", "HEAD"
+    )
+    assert get_entity_from_revision(git_repository, "directory", None) is not get_entity_from_revision(
+        git_repository, "directory", None
+    )
+
+    write_and_commit_file(git_repository, "directory/file", "modified")
+
+    entity = get_entity_from_revision(git_repository, "directory/file", "HEAD")
+
+    assert git_repository.get_object_hash("directory/file", revision="HEAD") == entity.checksum
+
+
+def test_split_joined_paths(monkeypatch):
+    """Test paths are batched by the length of their joined argument."""
+    monkeypatch.setattr("renku.core.utils.git.MAX_JOINED_ARGUMENT_LENGTH", 10)
+
+    assert [["aaaa", "bbbb"], ["cccccccccccc"], ["d"]] == list(
+        _split_joined_paths(["aaaa", "bbbb", "cccccccccccc", "d"], ",")
+    )
+    assert [[]] == list(_split_joined_paths([], ","))
+
+
 @pytest.mark.integration
 def test_push_to_protected_branch(protected_git_repository):
     """Test pushing to a protected branch creates a new branch and resets the protected branch."""
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017-2021- Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test HTTP requests utilities."""
+
+import concurrent.futures
+import os
+
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from renku.core import errors
+from renku.core.utils import requests
+from renku.core.utils.requests import _AdapterPool, _get_session
+
+
+def test_sessions_share_connection_pools():
+    """Test all sessions use the same adapter and its connection pools."""
+    first = _get_session()
+    second = _get_session()
+
+    assert first is not second
+    assert first.get_adapter("https://example.com") is second.get_adapter("http://example.com")
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        adapters = set(executor.map(lambda _: id(_get_session().get_adapter("https://example.com")), range(8)))
+
+    assert {id(first.get_adapter("https://example.com"))} == adapters
+
+
+def test_adapter_pool_per_process(monkeypatch):
+    """Test adapters are not shared with forked processes and are separate for each retry configuration."""
+    pool = _AdapterPool()
+
+    adapter = pool.get_adapter(5, 0.2, (500,))
+
+    assert adapter is pool.get_adapter(5, 0.2, (500,))
+    assert adapter is not pool.get_adapter(3, 0.2, (500,))
+
+    pid = os.getpid()
+    monkeypatch.setattr(os, "getpid", lambda: pid + 1)
+
+    assert adapter is not pool.get_adapter(5, 0.2, (500,))
+
+
+@pytest.fixture
+def ranged_download_responses(monkeypatch):
+    """A server that supports HTTP Range requests; fails the requests that ``fail`` returns True for.
+
+    The server sends the whole file instead of a range if ``ignore_ranges`` returns True for a request.
+    """
+    import responses
+
+    monkeypatch.setattr(requests, "_RENKU_DOWNLOAD_RANGED_MIN_SIZE", 1024)
+    monkeypatch.setattr(requests._RangedDownload, "INITIAL_RANGE_SIZE", 1000)
+    monkeypatch.setattr(requests._RangedDownload, "MIN_RANGE_SIZE", 1000)
+    monkeypatch.setattr(requests._RangedDownload, "MAX_RANGE_SIZE", 1000)
+
+    content = os.urandom(10000)
+    server = {
+        "content": content,
+        "ranges": [],
+        "fail": lambda start: False,
+        "etag": '"v1"',
+        "ignore_ranges": lambda request: False,
+    }
+
+    def request_callback(request):
+        headers = {"Accept-Ranges": "bytes", "ETag": server["etag"], "Content-Type": "application/octet-stream"}
+        range_header = request.headers.get("Range")
+        if not range_header or server["ignore_ranges"](request):
+            return 200, {**headers, "Content-Length": str(len(content))}, content
+
+        start, end = (int(v) for v in range_header.split("=")[1].split("-"))
+        if server["fail"](start):
+            raise RequestsConnectionError("Connection reset")
+
+        server["ranges"].append((start, end))
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return 206, headers, content[start : end + 1]
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add_callback(responses.GET, "https://example.com/data.bin", callback=request_callback)
+        mock.add_callback(responses.GET, "https://cdn.example.com/data.bin", callback=request_callback)
+        yield server, mock
+
+
+def test_ranged_download(ranged_download_responses, tmp_path):
+    """Test large files are downloaded in byte ranges."""
+    ranged_download_responses, _ = ranged_download_responses
+    directory, paths = requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    assert [directory / "data.bin"] == paths
+    assert ranged_download_responses["content"] == paths[0].read_bytes()
+    assert 10 == len(ranged_download_responses["ranges"])
+    assert not list((tmp_path / requests._RangedDownload.DIRECTORY).iterdir())
+
+
+def test_resume_ranged_download(ranged_download_responses, tmp_path):
+    """Test an interrupted download resumes from its finished ranges."""
+    ranged_download_responses, _ = ranged_download_responses
+    ranged_download_responses["fail"] = lambda start: start >= 5000
+
+    with pytest.raises(errors.RequestError):
+        requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    downloaded = {start for start, _ in ranged_download_responses["ranges"]}
+    assert {0, 1000, 2000, 3000, 4000} == downloaded
+
+    ranged_download_responses["fail"] = lambda start: False
+    ranged_download_responses["ranges"] = []
+
+    _, paths = requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    assert ranged_download_responses["content"] == paths[0].read_bytes()
+    assert not downloaded & {start for start, _ in ranged_download_responses["ranges"]}
+
+
+def test_resume_redirected_ranged_download(ranged_download_responses, tmp_path):
+    """Test an interrupted download resumes if it's redirected to a different URL."""
+    import responses
+
+    server, mock = ranged_download_responses
+    signature = iter(range(10))
+
+    def redirect_callback(request):
+        return 302, {"Location": f"https://cdn.example.com/data.bin?signature={next(signature)}"}, ""
+
+    mock.remove(responses.GET, "https://example.com/data.bin")
+    mock.add_callback(responses.GET, "https://example.com/data.bin", callback=redirect_callback)
+    server["fail"] = lambda start: start >= 5000
+
+    with pytest.raises(errors.RequestError):
+        requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    downloaded = {start for start, _ in server["ranges"]}
+    server["fail"] = lambda start: False
+    server["ranges"] = []
+
+    _, paths = requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    assert server["content"] == paths[0].read_bytes()
+    assert {0, 1000, 2000, 3000, 4000} == downloaded
+    assert not downloaded & {start for start, _ in server["ranges"]}
+
+
+def test_ranged_download_weak_etag(ranged_download_responses, tmp_path):
+    """Test files without a strong ETag are downloaded in one stream."""
+    server, _ = ranged_download_responses
+    server["etag"] = 'W/"v1"'
+    hashers = {}
+
+    _, paths = requests.download_file(
+        tmp_path, "https://example.com/data.bin", filename=None, extract=False, hashers=hashers
+    )
+
+    assert server["content"] == paths[0].read_bytes()
+    assert [] == server["ranges"]
+    assert paths[0] in hashers
+
+
+def test_ranged_download_ignored_ranges(ranged_download_responses, tmp_path):
+    """Test a download falls back to one stream if the server responds to a range request with the whole file."""
+    server, _ = ranged_download_responses
+    server["fail"] = lambda start: start >= 5000
+
+    with pytest.raises(errors.RequestError):
+        requests.download_file(tmp_path, "https://example.com/data.bin", filename=None, extract=False)
+
+    # NOTE: Servers send the whole file instead of a range if the file changed
+    server["fail"] = lambda start: False
+    server["ignore_ranges"] = lambda request: True
+    hashers = {}
+
+    _, paths = requests.download_file(
+        tmp_path, "https://example.com/data.bin", filename=None, extract=False, hashers=hashers
+    )
+
+    assert server["content"] == paths[0].read_bytes()
+    assert paths[0] in hashers
+    assert not list((tmp_path / requests._RangedDownload.DIRECTORY).iterdir())
+
+
+def test_remove_stale_ranged_downloads(tmp_path):
+    """Test interrupted downloads that aren't resumed for a while are removed."""
+    import time
+
+    downloads = tmp_path / requests._RangedDownload.DIRECTORY
+    stale = downloads / "stale"
+    stale.mkdir(parents=True)
+    (stale / "data").write_bytes(b"0" * 1000)
+    stale_time = time.time() - requests._RangedDownload.STALE_SECONDS - 1
+    os.utime(stale, (stale_time, stale_time))
+    recent = downloads / "recent"
+    recent.mkdir(parents=True)
+
+    requests._RangedDownload.remove_stale(directory=tmp_path)
+
+    assert [recent] == list(downloads.iterdir())
+
+
+def test_download_file_hashes_content(tmp_path):
+    """Test content of a streamed download is hashed while it's written."""
+    import responses
+
+    from renku.core.metadata.repository import Repository
+
+    content = os.urandom(1000)
+
+    with responses.RequestsMock() as mock:
+        mock.add(responses.GET, "https://example.com/data.bin", body=content, headers={"Content-Length": "1000"})
+        hashers = {}
+        _, paths = requests.download_file(
+            tmp_path, "https://example.com/data.bin", filename=None, extract=False, hashers=hashers
+        )
+
+    assert Repository.hash_object(paths[0]) == hashers[paths[0]].get_git_hash()
+
+
+def test_token_bucket():
+    """Test token bucket allows a burst of requests and then limits their rate."""
+    import time
+
+    bucket = requests.TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - start >= 0.19
+
+
+@pytest.fixture
+def rate_limited_server():
+    """A local HTTP server that responds with 429 if requests for a file arrive faster than 5 per second."""
+    import http.server
+    import threading
+    import time
+
+    state = {"requests": 0, "rejected": 0, "last_request": 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                now = time.monotonic()
+                state["requests"] += 1
+                is_rate_limited = now - state["last_request"] < 0.2
+                if not is_rate_limited:
+                    state["last_request"] = now
+                else:
+                    state["rejected"] += 1
+
+            if is_rate_limited:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            content = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_rate_limited_files(rate_limited_server, tmp_path):
+    """Test rate-limited downloads are retried and a token bucket avoids hitting the rate limit."""
+    import time
+
+    base_url, state = rate_limited_server
+    urls = [f"{base_url}/file-{i}" for i in range(4)]
+
+    def download(url, rate_limiter=None):
+        if rate_limiter:
+            rate_limiter.acquire()
+        _, paths = requests.download_file(tmp_path, url, filename=None, extract=False)
+        return paths[0].read_text()
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        assert {f"/file-{i}" for i in range(4)} == set(executor.map(download, urls))
+
+    assert 0 < state["rejected"]
+
+    time.sleep(0.2)
+    state["rejected"] = 0
+    rate_limiter = requests.TokenBucket(rate=3, capacity=1)
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        assert {f"/file-{i}" for i in range(4)} == set(executor.map(lambda u: download(u, rate_limiter), urls))
+
+    assert 0 == state["rejected"]
@@ -19,7 +19,10 @@
 
 import os
 
+import pytest
+
 from renku.core.errors import ParameterError
+from renku.core.utils.os import ContentHasher, copy_file, hash_git_blob
 from renku.core.utils.scm import shorten_message
 from renku.core.utils.urls import get_host
 from tests.utils import raises
@@ -85,3 +88,65 @@ def test_shorten_message():
         shorten_message(short_message, -1)
     with raises(ParameterError):
         shorten_message(short_message, max_line, -1)
+
+
+@pytest.mark.parametrize("link", [False, True])
+def test_copy_file(tmp_path, link):
+    """Test copying a file keeps its content and permissions."""
+    source = tmp_path / "source"
+    source.write_text("content" * 1000)
+    source.chmod(0o750)
+    destination = tmp_path / "destination"
+
+    method = copy_file(source, destination, link=link)
+
+    assert "content" * 1000 == destination.read_text()
+    assert 0o750 == destination.stat().st_mode & 0o777
+    assert link == (method == "link")
+    assert link == os.path.samefile(source, destination)
+
+
+def test_copy_file_incomplete_copy_file_range(tmp_path, monkeypatch):
+    """Test a file is copied again if ``copy_file_range`` stops before the end of the file."""
+    real_copy_file_range = getattr(os, "copy_file_range", None)
+    copied = []
+
+    def copy_file_range(source_fd, destination_fd, count, *args):
+        if copied:
+            return 0
+        copied.append(count)
+        return real_copy_file_range(source_fd, destination_fd, 3) if real_copy_file_range else 0
+
+    monkeypatch.setattr(os, "copy_file_range", copy_file_range, raising=False)
+
+    source = tmp_path / "source"
+    source.write_text("content" * 1000)
+    destination = tmp_path / "destination"
+
+    method = copy_file(source, destination)
+
+    assert "content" * 1000 == destination.read_text()
+    assert method in ("reflink", "copy")
+
+
+def test_copy_file_hashes_content(tmp_path):
+    """Test content is hashed while copying a file."""
+    import hashlib
+
+    from renku.core.metadata.repository import Repository
+
+    content = os.urandom(3 * 1024 * 1024 + 1)
+    source = tmp_path / "source"
+    source.write_bytes(content)
+    hasher = ContentHasher(size=len(content))
+
+    method = copy_file(source, tmp_path / "destination", hasher=hasher)
+
+    if method == "reflink":
+        assert hasher.get_git_hash() is None
+    else:
+        pointer = f"version https://git-lfs.github.com/spec/v1\noid sha256:{hashlib.sha256(content).hexdigest()}\n"
+        pointer += f"size {len(content)}\n"
+
+        assert Repository.hash_object(tmp_path / "destination") == hasher.get_git_hash()
+        assert hash_git_blob(pointer.encode()) == hasher.get_lfs_pointer_git_hash()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Renku service file upload utilities tests."""
+import io
+import os
+import time
+
+import pytest
+
+from renku.core.errors import RenkuException
+from renku.service.controllers.utils import file_upload
+
+
+def test_write_chunk_completes_upload_once(tmp_path, monkeypatch):
+    """Test an upload is moved to its destination under the lock and a repeated final chunk doesn't restart it."""
+    monkeypatch.setattr(file_upload, "CACHE_UPLOADS_PATH", tmp_path)
+    destination = tmp_path / "user" / "file"
+
+    assert (4, False) == file_upload.write_chunk("user", "42", io.BytesIO(b"1234"), 0, 8, destination)
+    assert (8, True) == file_upload.write_chunk("user", "42", io.BytesIO(b"5678"), 4, 8, destination)
+    assert b"12345678" == destination.read_bytes()
+    assert not file_upload.get_chunks_path("user", "42").exists()
+
+    assert (8, False) == file_upload.write_chunk("user", "42", io.BytesIO(b"5678"), 4, 8, destination)
+    assert not file_upload.get_chunks_path("user", "42").exists()
+
+    with pytest.raises(RenkuException):
+        file_upload.write_chunk("user", "43", io.BytesIO(b"123456789"), 0, 8, tmp_path / "user" / "other")
+
+    assert not file_upload.get_chunks_path("user", "43").exists()
+
+    lock_path = f"{file_upload.get_chunks_path('user', '42')}{file_upload.LOCK_SUFFIX}"
+    os.utime(lock_path, (time.time() - 100, time.time() - 100))
+    file_upload.purge_stale_chunks(ttl=10)
+
+    assert not os.path.exists(lock_path)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2021 - Swiss Data Science Center (SDSC)
+# A partnership between École Polytechnique Fédérale de Lausanne (EPFL) and
+# Eidgenössische Technische Hochschule Zürich (ETHZ).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Renku service project mirror tests."""
+
+from renku.core.metadata.repository import Repository
+from renku.service.cache.models.project import Project
+from renku.service.controllers.utils import project_mirror
+
+
+def test_project_clones_share_mirror(mock_redis, git_repository, tmp_path, monkeypatch):
+    """Test clones of a project use objects of a shared mirror which is removed when no project uses it."""
+    monkeypatch.setattr(project_mirror, "CACHE_MIRRORS_PATH", tmp_path / "mirrors")
+    url = str(git_repository.path)
+    mirror_path = project_mirror.get_mirror_path(url)
+
+    for user in ["user-1", "user-2"]:
+        with project_mirror.project_mirror(url, url) as clone_options:
+            repository = Repository.clone_from(url, tmp_path / user, clone_options=clone_options)
+
+        alternates = repository.path / ".git" / "objects" / "info" / "alternates"
+        assert str(mirror_path / "objects") == alternates.read_text().strip()
+        assert git_repository.head.commit.hexsha == repository.head.commit.hexsha
+
+    project = Project(project_id="42", user_id="user-1", git_url=url)
+    project.save()
+
+    project_mirror.purge_unused_mirrors()
+
+    assert mirror_path.exists()
+
+    project.delete()
+    project_mirror.purge_unused_mirrors()
+
+    assert not mirror_path.exists()
@@ -65,7 +65,9 @@ def svc_cache_dir(mocker, tmpdir):
     import renku.service.controllers.cache_files_upload
     import renku.service.controllers.datasets_create
     import renku.service.controllers.datasets_edit
+    import renku.service.controllers.utils.file_upload
     import renku.service.entrypoint
+    import renku.service.jobs.uploads
     import renku.service.utils
 
     project_dir = Path(tmpdir.mkdir("projects"))
@@ -81,6 +83,8 @@ def svc_cache_dir(mocker, tmpdir):
     mocker.patch.object(renku.service.controllers.cache_files_upload, "CACHE_UPLOADS_PATH", upload_dir)
     mocker.patch.object(renku.service.controllers.datasets_create, "CACHE_UPLOADS_PATH", upload_dir)
     mocker.patch.object(renku.service.controllers.datasets_edit, "CACHE_UPLOADS_PATH", upload_dir)
+    mocker.patch.object(renku.service.controllers.utils.file_upload, "CACHE_UPLOADS_PATH", upload_dir)
+    mocker.patch.object(renku.service.jobs.uploads, "CACHE_UPLOADS_PATH", upload_dir)
 
     yield
 
@@ -18,7 +18,10 @@
 """Renku service project related job tests."""
 import pytest
 
+from renku.service.cache.models.project import Project
 from renku.service.jobs.delayed_ctrl import delayed_ctrl_job
+from renku.service.jobs.project import enqueue_project_fetch, project_fetch
+from renku.service.jobs.queues import FETCH_QUEUE_PROJECTS, WorkerQueues
 from renku.service.serializers.cache import ProjectMigrateRequest
 from tests.utils import retry_failed
 
@@ -48,3 +51,21 @@ def test_delay_migration_job(svc_client_cache, it_remote_repo_url_temp_branch, v
         updated_job.ctrl_result["result"].keys()
     )
     assert updated_job.ctrl_result["result"]["was_migrated"]
+
+
+@pytest.mark.service
+def test_project_fetch_is_coalesced(mock_redis):
+    """Verify that only one fetch of a project is pending at a time."""
+    project = Project(project_id="42", user_id="user", owner="owner", slug="slug")
+    project.save()
+    queue = WorkerQueues.get(FETCH_QUEUE_PROJECTS)
+
+    enqueue_project_fetch(project)
+    enqueue_project_fetch(project)
+
+    assert 1 == queue.count
+
+    project_fetch(project.project_id)
+    enqueue_project_fetch(project)
+
+    assert 2 == queue.count
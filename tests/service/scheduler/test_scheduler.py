@@ -24,6 +24,6 @@ def test_enqueue_jobs(with_scheduler):
     queues = Queue.all()
     assert queues
 
-    assert 2 == len(queues)
+    assert 3 == len(queues)
     for q in queues:
         assert 1 == q.count
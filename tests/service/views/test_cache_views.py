@@ -27,6 +27,7 @@ import pytest
 from renku.core.metadata.repository import Repository
 from renku.core.models.git import GitURL
 from renku.service.config import INVALID_HEADERS_ERROR_CODE, RENKU_EXCEPTION_ERROR_CODE
+from renku.service.jobs.queues import UPLOADS_JOB_QUEUE, WorkerQueues
 from renku.service.serializers.headers import JWT_TOKEN_SECRET
 from tests.utils import retry_failed
 
@@ -131,6 +132,87 @@ def test_file_upload_override(svc_client, identity_headers):
     assert old_file_id != response.json["result"]["files"][0]["file_id"]
 
 
+@pytest.mark.service
+def test_file_upload_chunked(svc_client, identity_headers):
+    """Check a file uploaded in chunks can be resumed and is registered when complete."""
+    headers = copy.deepcopy(identity_headers)
+    headers.pop("Content-Type")
+
+    filename = uuid.uuid4().hex
+    content = b"this is a chunked test"
+    query = {"chunked_id": uuid.uuid4().hex, "total_size": len(content)}
+
+    def upload_chunk(offset, size):
+        return svc_client.post(
+            "/cache.files_upload",
+            data=dict(file=(io.BytesIO(content[offset : offset + size]), filename)),
+            query_string={**query, "chunk_offset": offset},
+            headers=headers,
+        )
+
+    response = upload_chunk(0, 10)
+
+    assert 200 == response.status_code
+    assert [] == response.json["result"]["files"]
+    assert 10 == response.json["result"]["received_size"]
+
+    response = upload_chunk(15, 10)
+
+    assert {"error"} == set(response.json.keys())
+    assert RENKU_EXCEPTION_ERROR_CODE == response.json["error"]["code"]
+
+    # NOTE: Resend the last chunk as if its response was lost
+    response = upload_chunk(5, 5)
+
+    assert 10 == response.json["result"]["received_size"]
+
+    response = upload_chunk(10, len(content))
+
+    assert 200 == response.status_code
+    assert 1 == len(response.json["result"]["files"])
+    assert filename == response.json["result"]["files"][0]["file_name"]
+    assert len(content) == response.json["result"]["files"][0]["file_size"]
+    file_id = response.json["result"]["files"][0]["file_id"]
+
+    # NOTE: Resend the final chunk as if its response was lost
+    response = upload_chunk(10, len(content))
+
+    assert 200 == response.status_code
+    assert len(content) == response.json["result"]["received_size"]
+    assert [file_id] == [f["file_id"] for f in response.json["result"]["files"]]
+
+
+@pytest.mark.service
+def test_file_upload_unpack_archive_delayed(svc_client, identity_headers, datapack_zip):
+    """Check an uploaded archive is unpacked by a job."""
+    headers = copy.deepcopy(identity_headers)
+    headers.pop("Content-Type")
+
+    response = svc_client.post(
+        "/cache.files_upload",
+        data=dict(file=(io.BytesIO(datapack_zip.read_bytes()), datapack_zip.name)),
+        query_string={"unpack_archive": True, "override_existing": True, "is_delayed": True},
+        headers=headers,
+    )
+
+    assert 200 == response.status_code
+    assert [] == response.json["result"]["files"]
+    job_id = response.json["result"]["job_id"]
+
+    rq_job = WorkerQueues.get(UPLOADS_JOB_QUEUE).jobs[0]
+    rq_job.perform()
+
+    response = svc_client.get(f"/jobs/{job_id}", headers=identity_headers)
+
+    assert "COMPLETED" == response.json["result"]["state"]
+
+    response = svc_client.get("/cache.files_list", headers=identity_headers)
+    files = response.json["result"]["files"]
+
+    assert any(f["is_dir"] for f in files)
+    assert all(f["relative_path"].startswith("datapack.zip.unpacked/") for f in files)
+
+
 @pytest.mark.service
 def test_file_upload_same_file(svc_client, identity_headers):
     """Check successful file upload with same file uploaded twice."""